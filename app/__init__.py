@@ -17,9 +17,12 @@ def init_db_command():
     from app.models.user import User
     from app.models.employees import Employee, Role
     from app.models.department import Department
+    from app.utils.counters import reconcile_counters
     from datetime import date
 
     db.create_all()
+    reconcile_counters()
+    db.session.commit()
     if not User.query.filter_by(username='admin').first():
         # create admin user same as before
         click.echo("Creating default admin user...")
@@ -54,9 +57,11 @@ def init_db_command():
         click.echo("Admin already exists. Skipping creation.")
 
 
-def create_app():
+def create_app(test_config=None):
     app = Flask(__name__)
     app.config.from_object(Config)
+    if test_config:
+        app.config.update(test_config)
     csrf = CSRFProtect(app)
 
     db.init_app(app)
@@ -67,10 +72,43 @@ def create_app():
     login_manager.login_message = 'Please log in to access this page.'
 
     app.cli.add_command(init_db_command)
+
+    from app.seeds.bulk import seed_command
+    app.cli.add_command(seed_command)
     migrate.init_app(app, db)
 
+    from app.utils import identity
+    identity.init_app(app, db)
+
+    from app.utils.passwords import password_hasher
+    password_hasher.init_app(app)
+
+    from app.utils import query_stats
+    query_stats.init_app(app, db)
+
+    from app.utils import task_stats
+    task_stats.init_app(app)
+
+    from app.utils import counters
+    counters.init_app(app, db)
+
+    from app.utils import partitions
+    partitions.init_app(app)
+
+    from app.utils import timesheets
+    timesheets.init_app(app)
+
+    from app.utils import payroll_summary
+    payroll_summary.init_app(app, db)
+
+    from app.utils import report_jobs
+    report_jobs.init_app(app)
+
+    from app.utils import employee_import
+    employee_import.init_app(app)
+
     # Import your models so Alembic can detect them
-    from app.models import user, team, message, address, task, employees, timeoff, attendance, department, paystub, time_entry
+    from app.models import user, team, message, address, task, employees, timeoff, attendance, department, paystub, time_entry, counter, daily_hours, payroll_run, payroll_summary, report
 
     from app.routes.main_route import main_bp
     app.register_blueprint(main_bp)
@@ -111,13 +149,16 @@ def create_app():
     from app.routes.time_tracking import time_tracking_bp
     app.register_blueprint(time_tracking_bp)
 
+    from app.routes.reports import reports_bp
+    app.register_blueprint(reports_bp)
+
     @app.context_processor
-    def inject_active_time_entry():
-        from app.models.time_entry import TimeEntry
+    def inject_navbar_state():
+        from app.utils.navbar import get_navbar_state
         if not current_user.is_authenticated:
             return {}
-        active_entry = TimeEntry.query.filter_by(user_id=current_user.id, clock_out=None).order_by(TimeEntry.clock_in.desc()).first()
-        return {"active_time_entry": active_entry}
+        state = get_navbar_state(current_user)
+        return {"navbar": state, "active_time_entry": state.active_time_entry}
 
     @app.errorhandler(404)
     def not_found_error(error):
@@ -130,7 +171,7 @@ def create_app():
 
     @login_manager.user_loader
     def load_user(user_id):
-        from app.models.user import User
-        return User.query.get(int(user_id))
+        from app.utils.identity import load_identity
+        return load_identity(int(user_id))
 
     return app
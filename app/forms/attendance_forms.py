@@ -3,6 +3,9 @@ from wtforms import SelectField, StringField, SubmitField
 from wtforms.validators import DataRequired, Optional, Length
 from app.models.attendance import AttendanceStatus
 
+# Longest note the attendance forms accept (single and bulk marking)
+NOTE_MAX_LENGTH = 255
+
 
 class AttendanceForm(FlaskForm):
     status = SelectField(
@@ -10,5 +13,5 @@ class AttendanceForm(FlaskForm):
         choices=[(s.value, s.name.title()) for s in AttendanceStatus],
         validators=[DataRequired()]
     )
-    note = StringField("Note", validators=[Optional(), Length(max=255)])
+    note = StringField("Note", validators=[Optional(), Length(max=NOTE_MAX_LENGTH)])
     submit = SubmitField("Save")
@@ -13,3 +13,11 @@ class PaystubForm(FlaskForm):
     issued_at = DateField("Issued At", validators=[Optional()])
     notes = TextAreaField("Notes", validators=[Optional()])
     submit = SubmitField("Create")
+
+
+class PayrollRunForm(FlaskForm):
+    period_start = DateField("Pay Period Start", validators=[DataRequired()])
+    period_end = DateField("Pay Period End", validators=[DataRequired()])
+    department_id = SelectField("Department", coerce=int)  # 0 = everyone
+    basis = SelectField("Gross Pay From", choices=[("salary", "Salary (prorated)"), ("hours", "Hours worked")])
+    submit = SubmitField("Run Payroll")
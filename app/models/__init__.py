@@ -8,3 +8,8 @@ from .address import Address
 from .timeoff import TimeOff
 from .attendance import Attendance
 from .time_entry import TimeEntry
+from .counter import Counter
+from .daily_hours import DailyHours
+from .payroll_run import PayrollRun
+from .payroll_summary import PayrollSummary
+from .report import Report
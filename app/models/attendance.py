@@ -1,5 +1,6 @@
 from datetime import datetime, date, timezone
 from enum import Enum as PyEnum
+from typing import Iterable
 from app import db
 
 class TimestampMixin:
@@ -14,6 +15,10 @@ class AttendanceStatus(PyEnum):
     EXCUSED = "EXCUSED"
 
 
+# Rows per INSERT in bulk_upsert; keeps bind parameters well under SQLite's limit.
+BULK_CHUNK_SIZE = 1000
+
+
 class Attendance(db.Model, TimestampMixin):
     """
     Attendance record for a user on a particular date.
@@ -29,12 +34,13 @@ class Attendance(db.Model, TimestampMixin):
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
-    date = db.Column(db.Date, nullable=False, default=date.today)
+    date = db.Column(db.Date, nullable=False, default=date.today, index=True)
     status = db.Column(db.Enum(AttendanceStatus, name="attendance_status"), nullable=False, default=AttendanceStatus.PRESENT)
     note = db.Column(db.Text, nullable=True)
 
-    # relationship: expects User model to define back_populates="attendances" or similar
-    user = db.relationship("User", back_populates="attendances", lazy="joined")
+    # relationship: expects User model to define back_populates="attendances" or similar.
+    # Lazy by default; list views eager-load it through app.utils.loaders.
+    user = db.relationship("User", back_populates="attendances")
 
     def __repr__(self):
         return f"<Attendance id={self.id} user_id={self.user_id} date={self.date} status={self.status.value}>"
@@ -71,3 +77,48 @@ class Attendance(db.Model, TimestampMixin):
         if record is None and create_if_missing:
             record = cls(user_id=user_id, date=target_date)
         return record
+
+    @classmethod
+    def bulk_upsert(cls, rows: Iterable[dict]) -> int:
+        """
+        Write many records with INSERT ... ON CONFLICT (user_id, date) DO UPDATE,
+        one statement per BULK_CHUNK_SIZE rows.
+
+        ``rows`` are dicts with user_id, date, status (AttendanceStatus) and an optional note;
+        an existing record gets the new status and note. When the same user/date appears
+        more than once the last row wins. Returns the number of distinct records written.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        from app.utils.sql import upsert_insert
+        now = datetime.now(timezone.utc)
+        values = {}
+        for row in rows:
+            if not isinstance(row['status'], AttendanceStatus):
+                raise ValueError("status must be an AttendanceStatus enum value")
+            # ON CONFLICT cannot touch the same row twice in one statement
+            values[(row['user_id'], row['date'])] = {
+                'user_id': row['user_id'], 'date': row['date'], 'status': row['status'],
+                'note': row.get('note'), 'created_at': now, 'updated_at': now,
+            }
+        values = list(values.values())
+
+        insert = upsert_insert(cls)
+        if insert is None:
+            for row in values:
+                record = cls.for_user_on_date(row['user_id'], row['date'], create_if_missing=True)
+                record.status, record.note, record.updated_at = row['status'], row['note'], now
+                db.session.add(record)
+            db.session.flush()
+            return len(values)
+
+        for start in range(0, len(values), BULK_CHUNK_SIZE):
+            statement = insert.values(values[start:start + BULK_CHUNK_SIZE])
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=[cls.user_id, cls.date],
+                set_={
+                    'status': statement.excluded.status,
+                    'note': statement.excluded.note,
+                    'updated_at': statement.excluded.updated_at,
+                },
+            ))
+        return len(values)
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from app import db
+
+
+class Counter(db.Model):
+    """
+    Denormalized row count for a table, keyed by table name.
+    Maintained by app.utils.counters; repair drift with `flask counters reconcile`.
+    """
+    __tablename__ = "counters"
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<Counter {self.name}={self.value}>"
@@ -0,0 +1,62 @@
+from datetime import date, datetime, time, timedelta, timezone
+from app import db
+
+
+class DailyHours(db.Model):
+    """
+    Seconds worked per user per calendar day (UTC, like the time entry timestamps), summed
+    over closed time entries. Maintained by TimeEntry.clock_out_user; rebuild with
+    `flask timesheets backfill`.
+    """
+    __tablename__ = "daily_hours"
+
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    seconds = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    @property
+    def hours(self) -> float:
+        return self.seconds / 3600
+
+    def __repr__(self):
+        return f"<DailyHours user_id={self.user_id} day={self.day} seconds={self.seconds}>"
+
+    @staticmethod
+    def split_by_day(start: datetime, end: datetime) -> list[tuple[date, int]]:
+        """(day, seconds) for each calendar day the interval touches; an entry past midnight counts on both days."""
+        pieces = []
+        while start < end:
+            midnight = datetime.combine(start.date() + timedelta(days=1), time(), start.tzinfo)
+            stop = min(end, midnight)
+            pieces.append((start.date(), round((stop - start).total_seconds())))
+            start = stop
+        return pieces
+
+    @classmethod
+    def add_entry(cls, user_id: int, clock_in: datetime, clock_out: datetime) -> None:
+        """
+        Add a closed entry's time to its days in one INSERT ... ON CONFLICT DO UPDATE.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        from app.utils.sql import upsert_insert
+        now = datetime.now(timezone.utc)
+        rows = [{'user_id': user_id, 'day': day, 'seconds': seconds, 'updated_at': now}
+                for day, seconds in cls.split_by_day(clock_in, clock_out)]
+        if not rows:
+            return
+
+        insert = upsert_insert(cls)
+        if insert is None:
+            for row in rows:
+                record = db.session.get(cls, (user_id, row['day'])) or cls(user_id=user_id, day=row['day'], seconds=0)
+                record.seconds += row['seconds']
+                db.session.add(record)
+            return
+
+        statement = insert.values(rows)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[cls.user_id, cls.day],
+            set_={'seconds': cls.seconds + statement.excluded.seconds, 'updated_at': statement.excluded.updated_at},
+        ))
@@ -22,7 +22,7 @@ class Employee(db.Model):
     emergency_contact = db.Column(db.String(100))
     emergency_phone = db.Column(db.String(20))
     department_id = db.Column(db.Integer, db.ForeignKey('departments.id'))
-    manager_id = db.Column(db.Integer, db.ForeignKey('employees.id'), nullable=True)
+    manager_id = db.Column(db.Integer, db.ForeignKey('employees.id'), nullable=True, index=True)
     created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     
@@ -53,3 +53,7 @@ class Employee(db.Model):
             "manager_id": self.manager_id,
             "addresses": [addr.to_dict() for addr in self.addresses],
         }
+
+
+# case-insensitive email lookups (employee import matches emails regardless of case)
+db.Index('ix_employees_email_lower', db.func.lower(Employee.email))
@@ -3,6 +3,9 @@ from app import db
 
 class Message(db.Model):
     __tablename__ = "messages"
+    __table_args__ = (
+        db.Index("ix_messages_recipient_unread_created", "recipient_id", "is_read", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     subject = db.Column(db.String(200), nullable=False)
@@ -16,4 +19,21 @@ class Message(db.Model):
     recipient = db.relationship('User', foreign_keys=[recipient_id], back_populates='received_messages')
 
     def __repr__(self):
-        return f"<Message {self.id} from {self.sender_id} to {self.recipient_id}>"
\ No newline at end of file
+        return f"<Message {self.id} from {self.sender_id} to {self.recipient_id}>"
+
+    def mark_read(self) -> bool:
+        """
+        Flip is_read and decrement the recipient's unread counter.
+        The conditional UPDATE keeps concurrent views from decrementing twice.
+        Returns False if the message was already read. Call session.commit() externally.
+        """
+        from app.models.user import User
+        result = db.session.execute(
+            db.update(Message)
+            .where(Message.id == self.id, Message.is_read.is_(False))
+            .values(is_read=True)
+        )
+        if result.rowcount != 1:
+            return False
+        User.adjust_unread_count(self.recipient_id, -1)
+        return True
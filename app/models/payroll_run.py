@@ -0,0 +1,43 @@
+from datetime import datetime, timezone
+from app import db
+
+
+class PayrollRun(db.Model):
+    """
+    One batch of paystubs for a pay period, for a department or everyone.
+
+    - basis: 'salary' (annual salary prorated over the period) or 'hours'
+      (daily_hours rollup times the hourly equivalent of the salary)
+    - status: 'running', 'completed' or 'failed' (error holds the reason)
+    - employee_count / paystub_count / skipped_count, money totals and timing
+      are filled in when the run finishes
+    """
+    __tablename__ = "payroll_runs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    department_id = db.Column(db.Integer, db.ForeignKey("departments.id", ondelete="SET NULL"), nullable=True)
+    basis = db.Column(db.String(16), nullable=False, default="salary")
+    status = db.Column(db.String(16), nullable=False, default="running")
+    error = db.Column(db.Text, nullable=True)
+
+    employee_count = db.Column(db.Integer, nullable=False, default=0)
+    paystub_count = db.Column(db.Integer, nullable=False, default=0)
+    skipped_count = db.Column(db.Integer, nullable=False, default=0)  # no pay due, or already paid for the period
+    batch_count = db.Column(db.Integer, nullable=False, default=0)
+    total_gross = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    total_taxes = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    total_deductions = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    total_net = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    created_by_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True)
+    started_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+
+    department = db.relationship("Department")
+    created_by = db.relationship("User")
+
+    def __repr__(self):
+        return f"<PayrollRun id={self.id} period={self.period_start}-{self.period_end} status={self.status}>"
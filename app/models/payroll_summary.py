@@ -0,0 +1,106 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from app import db
+
+# Summed columns, in the order deltas carry them
+AMOUNTS = ('gross', 'taxes', 'deductions', 'net')
+
+
+class PayrollSummary(db.Model):
+    """
+    Paystub totals per employee per year (the year of pay_period_end). Maintained on every
+    paystub insert/update/delete (app.utils.payroll_summary) and by payroll runs; rebuild
+    with `flask paystubs rebuild-summary`.
+    """
+    __tablename__ = "payroll_summaries"
+
+    employee_id = db.Column(db.Integer, db.ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True, index=True)
+    gross = db.Column(db.Numeric(14, 2), nullable=False, default=0, server_default="0")
+    taxes = db.Column(db.Numeric(14, 2), nullable=False, default=0, server_default="0")
+    deductions = db.Column(db.Numeric(14, 2), nullable=False, default=0, server_default="0")
+    net = db.Column(db.Numeric(14, 2), nullable=False, default=0, server_default="0")
+    stub_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<PayrollSummary employee_id={self.employee_id} year={self.year} net={self.net} stubs={self.stub_count}>"
+
+    @staticmethod
+    def add_delta(deltas: dict, employee_id: int, year: int, amounts, count: int) -> None:
+        """Accumulate one paystub's amounts (gross, taxes, deductions, net) into ``deltas`` with sign ``count`` (+1/-1)."""
+        current = deltas.setdefault((employee_id, year), [Decimal('0.00')] * len(AMOUNTS) + [0])
+        for i, amount in enumerate(amounts):
+            current[i] += Decimal(str(amount or 0)) * count
+        current[-1] += count
+
+    @classmethod
+    def apply(cls, connection, deltas: dict) -> None:
+        """
+        Add ``deltas`` ({(employee_id, year): [gross, taxes, deductions, net, stub_count]})
+        to the stored totals: one INSERT ... ON CONFLICT DO UPDATE where the dialect has it,
+        else an UPDATE per key with an INSERT for keys not there yet; rows left with no stubs
+        are removed. Uses ``connection`` directly, so it is safe inside flush events.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        now = datetime.now(timezone.utc)
+        rows = [
+            {'employee_id': employee_id, 'year': year, **dict(zip(AMOUNTS, values)),
+             'stub_count': values[-1], 'updated_at': now}
+            for (employee_id, year), values in deltas.items() if any(values)
+        ]
+        if not rows:
+            return
+
+        from app.utils.sql import upsert_insert
+        table = cls.__table__
+        insert = upsert_insert(table, connection)
+        if insert is not None:
+            # executemany of one statement (batched by insertmanyvalues) rather than a VALUES
+            # list, whose SQL differs with every row count and defeats the compiled cache
+            added = {name: table.c[name] + insert.excluded[name] for name in AMOUNTS + ('stub_count',)}
+            connection.execute(insert.on_conflict_do_update(
+                index_elements=[table.c.employee_id, table.c.year],
+                set_={**added, 'updated_at': insert.excluded.updated_at},
+            ), rows)
+        else:
+            for row in rows:
+                updated = connection.execute(
+                    table.update()
+                    .where(table.c.employee_id == row['employee_id'], table.c.year == row['year'])
+                    .values({**{name: table.c[name] + row[name] for name in AMOUNTS + ('stub_count',)},
+                             'updated_at': now})
+                )
+                if not updated.rowcount:
+                    connection.execute(table.insert().values(row))
+
+        # an employee/year whose last stub went away has no summary, as after a rebuild
+        emptied = [(row['employee_id'], row['year']) for row in rows if row['stub_count'] < 0]
+        if emptied:
+            connection.execute(table.delete().where(
+                db.tuple_(table.c.employee_id, table.c.year).in_(emptied), table.c.stub_count <= 0
+            ))
+
+    @classmethod
+    def apply_select(cls, connection, totals) -> None:
+        """
+        Like apply(), for deltas produced by a query: ``totals`` selects (employee_id, year,
+        gross, taxes, deductions, net, stub_count), one row per key. A single
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE where the dialect has it.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        from app.utils.sql import upsert_insert
+        table = cls.__table__
+        insert = upsert_insert(table, connection)
+        if insert is None:
+            cls.apply(connection, {(row[0], row[1]): list(row[2:]) for row in connection.execute(totals)})
+            return
+
+        columns = ['employee_id', 'year', *AMOUNTS, 'stub_count', 'updated_at']
+        statement = insert.from_select(columns, totals.add_columns(db.func.current_timestamp()))
+        added = {name: table.c[name] + statement.excluded[name] for name in AMOUNTS + ('stub_count',)}
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.employee_id, table.c.year],
+            set_={**added, 'updated_at': statement.excluded.updated_at},
+        ))
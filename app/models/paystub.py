@@ -2,7 +2,7 @@ from datetime import datetime, date, timezone
 from decimal import Decimal, InvalidOperation
 from typing import Any
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey, DateTime, Index, text
 
 # Paystub SQLAlchemy model compatible with Flask-SQLAlchemy when `db` is available,
 # and falls back to plain SQLAlchemy declarative base otherwise.
@@ -24,9 +24,17 @@ except Exception:
 
 class Paystub(ModelBase):
     __tablename__ = "paystubs"
+    __table_args__ = (
+        # a payroll run pays each employee at most once per period, even when runs overlap;
+        # hand-made stubs (payroll_run_id NULL) may still add corrections for a paid period
+        Index("uix_paystubs_run_period", "employee_id", "pay_period_start", "pay_period_end", unique=True,
+              postgresql_where=text("payroll_run_id IS NOT NULL"), sqlite_where=text("payroll_run_id IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False, index=True)
+    # set for paystubs issued by a payroll run (app.utils.payroll)
+    payroll_run_id = Column(Integer, ForeignKey("payroll_runs.id", ondelete="SET NULL"), nullable=True, index=True)
 
     pay_period_start = Column(Date, nullable=False)
     pay_period_end = Column(Date, nullable=False)
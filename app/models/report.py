@@ -0,0 +1,66 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from app import db
+
+STATUSES = ('queued', 'running', 'completed', 'failed')
+
+
+class Report(db.Model):
+    """
+    A requested report and, once `flask reports worker` has run it, where its result lives.
+
+    - kind: one of app.utils.report_jobs.KINDS; params: its JSON parameters
+    - params_key: hash of kind + params, so identical requests can share one result
+    - status: 'queued' -> 'running' -> 'completed' or 'failed' (error holds the reason)
+    - file_path: result file name inside the report store, set when completed
+    """
+    __tablename__ = "reports"
+    __table_args__ = (
+        # the worker's queue scan and the freshness lookup
+        db.Index("ix_reports_status_created_at", "status", "created_at"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(32), nullable=False)
+    params = db.Column(db.JSON, nullable=False, default=dict)
+    params_key = db.Column(db.String(64), nullable=False, index=True)
+    status = db.Column(db.String(16), nullable=False, default="queued")
+    error = db.Column(db.Text, nullable=True)
+    row_count = db.Column(db.Integer, nullable=True)
+    file_path = db.Column(db.String(255), nullable=True)
+    requested_by_id = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="SET NULL"), nullable=True, index=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime, nullable=True)
+    # refreshed by the worker while it runs the report; a stale one means the worker died
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    duration_ms = db.Column(db.Integer, nullable=True)
+
+    requested_by = db.relationship("User")
+
+    def __repr__(self):
+        return f"<Report id={self.id} kind={self.kind} status={self.status}>"
+
+    @property
+    def is_done(self) -> bool:
+        return self.status in ('completed', 'failed')
+
+    @staticmethod
+    def make_key(kind: str, params: dict) -> str:
+        payload = json.dumps([kind, params], sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "error": self.error,
+            "row_count": self.row_count,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "duration_ms": self.duration_ms,
+        }
@@ -9,6 +9,10 @@ class TimestampMixin:
                            onupdate=lambda: datetime.now(timezone.utc))  
 class Task(db.Model, TimestampMixin):
     __tablename__ = "tasks"
+    __table_args__ = (
+        db.Index("ix_tasks_assignee_status_due", "assigned_to_id", "status", "due_date"),
+        db.Index("ix_tasks_creator_created", "created_by_id", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
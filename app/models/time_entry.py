@@ -1,9 +1,18 @@
 from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
 from app import db
+from app.models.daily_hours import DailyHours
 
 
 class TimeEntry(db.Model):
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # at most one open entry (clock_out IS NULL) per user; also serves the navbar timer lookup.
+        # When the table is partitioned (app.utils.partitions) this exists once per partition instead.
+        db.Index("uix_time_entries_open_user", "user_id", unique=True,
+                 postgresql_where=db.text("clock_out IS NULL"), sqlite_where=db.text("clock_out IS NULL")),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
@@ -18,8 +27,60 @@ class TimeEntry(db.Model):
     def is_active(self) -> bool:
         return self.clock_out is None
 
-    def clock_out_now(self):
-        self.clock_out = datetime.now(timezone.utc)
+    @classmethod
+    def clock_in_user(cls, user_id: int, at: Optional[datetime] = None):
+        """
+        Open an entry for ``user_id`` in one statement (INSERT ... SELECT WHERE NOT EXISTS
+        ... ON CONFLICT DO NOTHING RETURNING). Returns the new (id, clock_in) row, or None if
+        the user already has an open entry. The unique open-entry index settles concurrent
+        clock-ins; NOT EXISTS covers entries left open in earlier partitions, which a
+        partitioned table's per-partition index cannot see.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        from app.utils.sql import upsert_insert
+        values = {'user_id': user_id, 'clock_in': at or datetime.now(timezone.utc)}
+        insert = upsert_insert(cls)
+        if insert is None:
+            # no ON CONFLICT: let the partial unique index reject the duplicate
+            try:
+                with db.session.begin_nested():
+                    return db.session.execute(
+                        db.insert(cls).values(**values).returning(cls.id, cls.clock_in)
+                    ).first()
+            except IntegrityError:
+                return None
+
+        already_open = db.exists().where(cls.user_id == user_id, cls.clock_out.is_(None))
+        statement = (
+            insert.from_select(
+                ['user_id', 'clock_in'],
+                db.select(db.literal(user_id, db.Integer), db.literal(values['clock_in'], db.DateTime))
+                .where(~already_open),
+            )
+            .on_conflict_do_nothing()
+            .returning(cls.id, cls.clock_in)
+        )
+        return db.session.execute(statement).first()
+
+    @classmethod
+    def clock_out_user(cls, user_id: int, at: Optional[datetime] = None):
+        """
+        Close the open entry for ``user_id`` in one statement (UPDATE ... RETURNING) and add
+        its time to the daily_hours rollup. Returns the closed (id, clock_in, clock_out) row,
+        or None if nothing was open.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        statement = (
+            db.update(cls)
+            .where(cls.user_id == user_id, cls.clock_out.is_(None))
+            .values(clock_out=at or datetime.now(timezone.utc))
+            .returning(cls.id, cls.clock_in, cls.clock_out)
+            .execution_options(synchronize_session=False)
+        )
+        row = db.session.execute(statement).first()
+        if row is not None:
+            DailyHours.add_entry(user_id, row.clock_in, row.clock_out)
+        return row
 
     def __repr__(self):
         return f"<TimeEntry id={self.id} user_id={self.user_id} active={self.is_active}>"
@@ -28,6 +28,10 @@ class TimestampMixin:
 
 class TimeOff(db.Model, TimestampMixin):
     __tablename__ = "timeoffs"
+    __table_args__ = (
+        db.Index("ix_timeoffs_user_created", "user_id", "created_at"),
+        db.Index("ix_timeoffs_status_created", "status", "created_at"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
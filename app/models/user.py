@@ -1,9 +1,9 @@
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from app import db
 from app.models.employees import Role
+from app.utils.passwords import password_hasher
 
 class TimestampMixin:
     """Reusable timestamp fields."""
@@ -32,6 +32,9 @@ class User(UserMixin, db.Model, TimestampMixin):
     user_metadata = db.Column(db.JSON, nullable=False, default=dict)  # free-form user metadata
     last_login = db.Column(db.DateTime, nullable=True)
 
+    # denormalized count of unread received messages (see adjust_unread_count)
+    unread_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     employee = db.relationship('Employee', back_populates='user')
     sent_messages = db.relationship('Message', foreign_keys='Message.sender_id', back_populates='sender', lazy='dynamic')
     received_messages = db.relationship('Message', foreign_keys='Message.recipient_id', back_populates='recipient', lazy='dynamic')
@@ -54,19 +57,33 @@ class User(UserMixin, db.Model, TimestampMixin):
         self.set_password(raw)
 
     def set_password(self, raw: str) -> None:
-        """Hash and set the user's password."""
-        self._password_hash = generate_password_hash(raw)
+        """Hash and set the user's password (hashing runs in the password pool)."""
+        self._password_hash = password_hasher.hash(raw)
 
     def check_password(self, raw: str) -> bool:
         """Check a plaintext password against the stored hash."""
         if not self._password_hash:
             return False
-        return check_password_hash(self._password_hash, raw)
+        return password_hasher.verify(self._password_hash, raw)
+
+    def password_needs_rehash(self) -> bool:
+        """True if the stored hash uses an outdated method or work factor."""
+        return bool(self._password_hash) and password_hasher.needs_rehash(self._password_hash)
 
     def touch_last_login(self) -> None:
         """Set last_login to now (useful after successful auth)."""
         self.last_login = datetime.now(datetime.timezone.utc)
 
+    @classmethod
+    def adjust_unread_count(cls, user_id: int, delta: int) -> None:
+        """
+        Atomically add ``delta`` to a user's unread counter.
+        Runs in the caller's transaction; call session.commit() externally.
+        """
+        db.session.execute(
+            db.update(cls).where(cls.id == user_id).values(unread_count=cls.unread_count + delta)
+        )
+
     @property
     def role(self) -> Optional[Role]:
         """Return the employee role, if linked."""
@@ -1,3 +1,5 @@
+import csv
+import io
 from datetime import datetime, timezone
 from flask import Blueprint, render_template, flash, redirect, url_for, request
 from flask_login import login_required
@@ -11,6 +13,13 @@ from app.models.employees import Employee, Role
 from app.models.team import Team
 from app.models.user import User
 from app.utils.decorators import role_required
+from app.utils.counters import get_counts
+from app.utils.employee_import import COLUMNS as EMPLOYEE_COLUMNS, check_columns, import_employees as run_employee_import
+from app.utils.headcount import get_headcounts
+from app.utils.hierarchy import reassign_reports, would_create_cycle
+from app.utils.identity import evict_identity
+from app.utils.loaders import with_profile
+from app.utils.pagination import asc, paginate
 
 admin_admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -31,18 +40,15 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 @login_required
 @role_required(Role.ADMIN)
 def admin_dashboard():
-    total_employees = Employee.query.count()
-    total_users = User.query.count()
-    total_departments = Department.query.count()
-    total_teams = Team.query.count()
+    counts = get_counts()
     
-    recent_employees = Employee.query.order_by(Employee.created_at.desc()).limit(5).all()
+    recent_employees = with_profile(Employee.query, 'employee.list').order_by(Employee.created_at.desc()).limit(5).all()
     
     return render_template('admin/dashboard.html',
-                         total_employees=total_employees,
-                         total_users=total_users,
-                         total_departments=total_departments,
-                         total_teams=total_teams,
+                         total_employees=counts['employees'],
+                         total_users=counts['user'],
+                         total_departments=counts['departments'],
+                         total_teams=counts['team'],
                          recent_employees=recent_employees)
 
 
@@ -50,8 +56,8 @@ def admin_dashboard():
 @login_required
 @role_required(Role.ADMIN)
 def list_employees():
-    employees = Employee.query.all()
-    return render_template('admin/employees.html', employees=employees)
+    page = paginate(with_profile(Employee.query, 'employee.list'), asc(Employee.last_name), asc(Employee.first_name), asc(Employee.id))
+    return render_template('admin/employees.html', employees=page.items, page=page)
 
 
 @admin_bp.route('/employees/create', methods=['GET', 'POST'])
@@ -61,7 +67,7 @@ def create_employee():
     if request.method == 'POST':
         role_value = request.form.get('role')
         manager_id_raw = request.form.get('manager_id')
-        managers_exist = Employee.query.count() > 0
+        managers_exist = db.session.scalar(db.select(Employee.id).limit(1)) is not None
 
         # Enforce manager assignment when managers already exist
         if managers_exist and not manager_id_raw:
@@ -84,22 +90,17 @@ def create_employee():
         )
 
         try:
+            # one transaction: the address is inserted with the employee's new id on flush
+            employee.addresses.append(Address(
+                type=request.form.get('type'),
+                street=request.form.get('street'),
+                city=request.form.get('city'),
+                state=request.form.get('state'),
+                postal_code=request.form.get('postal_code'),
+                country=request.form.get('country')
+            ))
             db.session.add(employee)
             db.session.commit()
-
-            address = Address(
-            employee_id=employee.id,  
-            type=request.form.get('type'),
-            street=request.form.get('street'),
-            city=request.form.get('city'),
-            state=request.form.get('state'),
-            postal_code=request.form.get('postal_code'),
-            country=request.form.get('country')
-        )
-
-            # Add and commit the address
-            db.session.add(address)
-            db.session.commit()
             flash(f'Employee {employee.full_name} {employee.last_name} created successfully!', 'success')
             return redirect(url_for('admin.list_employees'))
         except Exception as e:
@@ -111,6 +112,38 @@ def create_employee():
     return render_template('admin/create_employee.html', departments=departments, managers=managers)
 
 
+@admin_bp.route('/employees/import', methods=['GET', 'POST'])
+@login_required
+@role_required(Role.ADMIN)
+def import_employees():
+    """Upload a CSV of employees; the whole file is validated before anything is inserted."""
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash('Choose a CSV file to import.', 'danger')
+            return redirect(url_for('admin.import_employees'))
+        reader = csv.DictReader(io.TextIOWrapper(upload.stream, encoding='utf-8-sig'))
+        dry_run = bool(request.form.get('dry_run'))
+        try:
+            check_columns(reader.fieldnames)
+            report = run_employee_import(reader, dry_run=dry_run)
+        except (ValueError, UnicodeDecodeError, csv.Error) as e:
+            db.session.rollback()
+            flash(f'Could not read the file: {e}', 'danger')
+            return redirect(url_for('admin.import_employees'))
+        if not report.ok:
+            db.session.rollback()
+            flash(f'{len(report.errors)} of {report.rows} rows have errors; nothing was imported.', 'danger')
+        elif dry_run:
+            flash(f'All {report.rows} rows are valid. Uncheck "Validate only" to import them.', 'info')
+        else:
+            db.session.commit()
+            flash(f'Imported {report.created} employees and {report.addresses} addresses.', 'success')
+            return redirect(url_for('admin.list_employees'))
+    return render_template('admin/import_employees.html', report=report, columns=EMPLOYEE_COLUMNS)
+
+
 @admin_bp.route('/employees/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 @role_required(Role.ADMIN)
@@ -118,11 +151,14 @@ def edit_employee(id):
     employee = Employee.query.get_or_404(id)
     
     if request.method == 'POST':
-        manager_id_raw = request.form.get('manager_id')
+        manager_id = request.form.get('manager_id', type=int)  # None if missing or not a number
         managers_exist = Employee.query.filter(Employee.id != id).count() > 0
-        if managers_exist and not manager_id_raw:
+        if manager_id is None and (managers_exist or request.form.get('manager_id')):
             flash('Please assign a manager for this employee.', 'danger')
             return redirect(url_for('admin.edit_employee', id=id))
+        if would_create_cycle(employee.id, manager_id):
+            flash('An employee cannot report to themselves or to one of their own reports.', 'danger')
+            return redirect(url_for('admin.edit_employee', id=id))
 
         employee.first_name = request.form.get('first_name')
         employee.last_name = request.form.get('last_name')
@@ -135,11 +171,13 @@ def edit_employee(id):
         employee.emergency_contact = request.form.get('emergency_contact')
         employee.emergency_phone = request.form.get('emergency_phone')
         employee.department_id = int(request.form.get('department_id')) if request.form.get('department_id') else None
-        employee.manager_id = int(manager_id_raw) if manager_id_raw else None
+        employee.manager_id = manager_id
         employee.role = Role[request.form.get('role').upper()] if request.form.get('role') else employee.role
         
         try:
             db.session.commit()
+            if employee.user:
+                evict_identity(employee.user.id)
             flash(f'Employee {employee.full_name} updated successfully!', 'success')
             return redirect(url_for('admin.list_employees'))
         except Exception as e:
@@ -157,11 +195,14 @@ def edit_employee(id):
 def delete_employee(id):
     employee = Employee.query.get_or_404(id)
     
+    user_id = employee.user.id if employee.user else None
     try:
         if employee.user:
             db.session.delete(employee.user)
+        reassign_reports(employee)
         db.session.delete(employee)
         db.session.commit()
+        evict_identity(user_id)
         flash(f'Employee {employee.full_name} deleted successfully!', 'success')
     except Exception as e:
         db.session.rollback()
@@ -174,8 +215,8 @@ def delete_employee(id):
 @login_required
 @role_required(Role.ADMIN)
 def list_users():
-    users = User.query.all()
-    return render_template('admin/users.html', users=users)
+    page = paginate(with_profile(User.query, 'user.list'), asc(User.username))
+    return render_template('admin/users.html', users=page.items, page=page)
 
 
 @admin_bp.route('/users/<int:id>/edit', methods=['GET', 'POST'])
@@ -195,6 +236,7 @@ def edit_user(id):
         
         try:
             db.session.commit()
+            evict_identity(user.id)
             flash(f'User {user.username} updated successfully!', 'success')
             return redirect(url_for('admin.list_users'))
         except Exception as e:
@@ -208,8 +250,8 @@ def edit_user(id):
 @login_required
 @role_required(Role.ADMIN)
 def list_departments():
-    departments = Department.query.all()
-    return render_template('admin/departments.html', departments=departments)
+    page = paginate(Department.query, asc(Department.name))
+    return render_template('admin/departments.html', departments=page.items, page=page, headcounts=get_headcounts())
 
 
 @admin_bp.route('/departments/create', methods=['GET', 'POST'])
@@ -238,8 +280,8 @@ def create_department():
 @login_required
 @role_required(Role.ADMIN)
 def list_teams():
-    teams = Team.query.all()
-    return render_template('admin/teams.html', teams=teams)
+    teams = with_profile(Team.query, 'team.list').order_by(Team.name).all()
+    return render_template('admin/teams.html', teams=teams, headcounts=get_headcounts())
 
 
 @admin_bp.route('/teams/create', methods=['GET', 'POST'])
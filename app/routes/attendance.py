@@ -1,22 +1,23 @@
-from datetime import date
-from flask import Blueprint, render_template, redirect, url_for, flash
+import csv
+from datetime import date, timedelta
+from itertools import islice
+import click
+from flask import Blueprint, Response, render_template, redirect, request, session, url_for, flash, make_response
 from flask_login import login_required, current_user
 from app import db
-from app.models.attendance import Attendance
-from app.models.employees import Employee, Role
+from app.models.attendance import Attendance, AttendanceStatus, BULK_CHUNK_SIZE
+from app.models.employees import Role
+from app.models.user import User
+from app.utils.attendance_matrix import CODES, STATUSES, build_matrix, matrix_etag, parse_month
 from app.utils.decorators import role_required
-from app.forms.attendance_forms import AttendanceForm
+from app.utils.hierarchy import report_user_ids_query, visible_user_ids_query
+from app.utils.navbar import get_navbar_state
+from app.utils.pagination import asc, paginate
+from app.forms.attendance_forms import NOTE_MAX_LENGTH, AttendanceForm
 
 attendance_bp = Blueprint('attendance', __name__, url_prefix='/attendance')
 
 
-def _get_subordinate_user_ids(manager_employee_id: int) -> list[int]:
-    """Return user IDs for employees managed by the given manager employee."""
-    return [
-        emp.user.id for emp in Employee.query.filter_by(manager_id=manager_employee_id).all() if emp.user
-    ]
-
-
 @attendance_bp.route('/', methods=['GET', 'POST'])
 @login_required
 def view_or_mark_attendance():
@@ -37,15 +38,198 @@ def view_or_mark_attendance():
     return render_template('attendance/index.html', records=records, target_user=target_user, form=form)
 
 
+def _team_scope():
+    """(users query, user id SELECT) for everyone the current manager/admin can see."""
+    user_ids = visible_user_ids_query(current_user)
+    return db.session.query(User.id, User.username).filter(User.id.in_(user_ids)), user_ids
+
+
+def _not_modified(etag: str):
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+        response.set_etag(etag)
+        return response
+    return None
+
+
+def _revalidate(response, etag: str):
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 @attendance_bp.route('/team')
 @login_required
 @role_required(Role.ADMIN, Role.MANAGER)
 def team_attendance():
-    """Managers/Admins can review team attendance."""
-    if current_user.is_admin:
-        records = Attendance.query.order_by(Attendance.date.desc()).limit(200).all()
-    else:
-        subordinate_ids = _get_subordinate_user_ids(current_user.employee.id)
-        records = Attendance.query.filter(Attendance.user_id.in_(subordinate_ids)).order_by(Attendance.date.desc()).all()
+    """Managers/Admins review a month of team attendance as a user-by-day grid."""
+    month = parse_month(request.args.get('month')) or date.today().replace(day=1)
+    users_query, _ = _team_scope()
+    page = paginate(users_query, asc(User.username), asc(User.id))
+    users = [(row.id, row.username) for row in page]
+    user_ids = [user_id for user_id, _ in users]
+
+    # the navbar and pager links are part of the page too
+    etag = matrix_etag(month, users, user_ids, current_user.id, tuple(get_navbar_state(current_user)),
+                       page.next_cursor, page.prev_cursor)
+    # pending flashes are only shown (and cleared) by rendering, so never answer 304 over them
+    not_modified = None if session.get('_flashes') else _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    matrix = build_matrix(month, users, user_ids)
+    previous_month = (month - timedelta(days=1)).replace(day=1)
+    next_month = (month + timedelta(days=31)).replace(day=1)
+    response = make_response(render_template(
+        'attendance/team.html', matrix=matrix, page=page, month=month,
+        previous_month=previous_month, next_month=next_month, statuses=STATUSES, codes=CODES,
+    ))
+    return _revalidate(response, etag)
+
+
+@attendance_bp.route('/team/matrix.csv')
+@login_required
+@role_required(Role.ADMIN, Role.MANAGER)
+def team_attendance_csv():
+    """The whole team's month grid as CSV."""
+    month = parse_month(request.args.get('month')) or date.today().replace(day=1)
+    users_query, user_ids = _team_scope()
+    users = [tuple(row) for row in users_query.order_by(User.username, User.id)]
+
+    etag = matrix_etag(month, users, user_ids)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    matrix = build_matrix(month, users, user_ids)
+    response = Response(matrix.iter_csv(), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename=attendance-{month:%Y-%m}.csv'
+    return _revalidate(response, etag)
 
-    return render_template('attendance/team.html', records=records)
+def _parse_status(value: str):
+    """AttendanceStatus for a form/CSV value (case-insensitive), or None if unknown."""
+    try:
+        return AttendanceStatus((value or '').strip().upper())
+    except ValueError:
+        return None
+
+
+def _parse_date(value: str):
+    try:
+        return date.fromisoformat((value or '').strip())
+    except ValueError:
+        return None
+
+
+@attendance_bp.route('/team/mark', methods=['GET', 'POST'])
+@login_required
+@role_required(Role.ADMIN, Role.MANAGER)
+def bulk_mark_attendance():
+    """Mark a day's attendance for every report in one statement."""
+    target_date = _parse_date(request.values.get('date')) or date.today()
+    if current_user.employee is None:
+        flash('You need an employee record to mark team attendance.', 'warning')
+        return redirect(url_for('attendance.team_attendance'))
+
+    team = (
+        db.session.execute(
+            db.select(User, Attendance)
+            .outerjoin(Attendance, db.and_(Attendance.user_id == User.id, Attendance.date == target_date))
+            .where(User.id.in_(report_user_ids_query(current_user.employee.id)))
+            .order_by(User.username)
+        ).all()
+    )
+
+    if request.method == 'POST':
+        rows, invalid, too_long = [], [], []
+        for user, _ in team:
+            value = request.form.get(f'status-{user.id}')
+            if not value:
+                continue
+            status = _parse_status(value)
+            if status is None:
+                invalid.append(user.username)
+                continue
+            note = (request.form.get(f'note-{user.id}') or '').strip() or None
+            if note and len(note) > NOTE_MAX_LENGTH:
+                too_long.append(user.username)
+                continue
+            rows.append({'user_id': user.id, 'date': target_date, 'status': status, 'note': note})
+
+        if invalid:
+            flash(f"Unknown status for: {', '.join(invalid)}", 'danger')
+        elif too_long:
+            flash(f"Notes are limited to {NOTE_MAX_LENGTH} characters; shorten the note for: {', '.join(too_long)}", 'danger')
+        elif rows:
+            try:
+                count = Attendance.bulk_upsert(rows)
+                db.session.commit()
+                flash(f'Attendance saved for {count} team members.', 'success')
+                return redirect(url_for('attendance.team_attendance'))
+            except Exception as e:
+                db.session.rollback()
+                flash(f'Error saving attendance: {str(e)}', 'danger')
+        else:
+            flash('No statuses selected.', 'warning')
+
+    return render_template('attendance/bulk_mark.html', team=team, target_date=target_date,
+                           statuses=list(AttendanceStatus), note_max=NOTE_MAX_LENGTH)
+
+
+@attendance_bp.cli.command('import')
+@click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--dry-run', is_flag=True, help='Validate the file without writing anything.')
+def import_command(csv_file, dry_run):
+    """
+    Upsert attendance from a CSV with columns date, status, note (optional)
+    and either user_id or username.
+    """
+    reader = csv.DictReader(csv_file)
+    columns = set(reader.fieldnames or ())
+    if not {'date', 'status'} <= columns or not columns & {'user_id', 'username'}:
+        raise click.UsageError('CSV needs date, status and a user_id or username column.')
+
+    written = errors = 0
+    line = 1
+    while True:
+        chunk = list(islice(reader, BULK_CHUNK_SIZE))
+        if not chunk:
+            break
+        # resolve the chunk's usernames and user ids in one query
+        usernames = {r.get('username', '').strip() for r in chunk} - {''}
+        user_ids = {int(r['user_id']) for r in chunk if (r.get('user_id') or '').strip().isdigit()}
+        known = db.session.execute(
+            db.select(User.username, User.id).where(db.or_(User.username.in_(usernames), User.id.in_(user_ids)))
+        ).all()
+        by_name = dict(known)
+        known_ids = set(by_name.values())
+
+        rows = []
+        for record in chunk:
+            line += 1
+            raw_id = (record.get('user_id') or '').strip()
+            user_id = int(raw_id) if raw_id.isdigit() else by_name.get((record.get('username') or '').strip())
+            target_date = _parse_date(record['date'])
+            status = _parse_status(record['status'])
+            note = (record.get('note') or '').strip() or None
+            problem = (
+                'unknown user' if user_id not in known_ids else
+                f"bad date {record['date']!r}" if target_date is None else
+                f"bad status {record['status']!r}" if status is None else
+                f'note longer than {NOTE_MAX_LENGTH} characters' if note and len(note) > NOTE_MAX_LENGTH else None
+            )
+            if problem:
+                errors += 1
+                click.echo(f'line {line}: {problem}', err=True)
+                continue
+            rows.append({'user_id': user_id, 'date': target_date, 'status': status, 'note': note})
+        if not dry_run:
+            written += Attendance.bulk_upsert(rows)
+
+    if dry_run:
+        db.session.rollback()
+        click.echo(f'Dry run: {line - 1 - errors} valid rows, {errors} errors.')
+    else:
+        db.session.commit()
+        click.echo(f'Imported {written} attendance records ({errors} rows skipped).')
@@ -5,6 +5,7 @@ from app.forms.register_form import RegisterForm
 from app.models.employees import Employee
 from app.models.user import User
 from app import db
+from app.utils.identity import evict_identity
 
 # Create the blueprint
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
@@ -21,6 +22,11 @@ def login():
         
         if user and user.check_password(password):
             if user.is_active:
+                if user.password_needs_rehash():
+                    # upgrade hashes made with an older method/work factor
+                    user.set_password(password)
+                    db.session.commit()
+                    evict_identity(user.id)  # the cached snapshot still holds the old hash
                 login_user(user)
                 flash(f'Welcome back, {user.username}!', 'success')
                 next_page = request.args.get('next')
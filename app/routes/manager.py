@@ -1,8 +1,10 @@
 from flask import Blueprint, render_template, flash, redirect, url_for, request
 from flask_login import login_required, current_user    
 from app.models.employees import Employee, Role
-from app.models.task import Task
 from app.utils.decorators import role_required
+from app.utils.identity import evict_identity
+from app.utils.loaders import with_profile
+from app.utils.task_stats import get_team_task_stats
 from app import db
 
 manager_bp = Blueprint('manager', __name__, url_prefix='/manager')
@@ -16,17 +18,17 @@ def manager_dashboard():
         flash('Manager account not linked to employee record.', 'danger')
         return redirect(url_for('dashboard'))
     
-    subordinates = Employee.query.filter_by(manager_id=current_user.employee.id).all()
+    subordinates = (
+        with_profile(Employee.query, 'employee.list', 'employee.with_user')
+        .filter_by(manager_id=current_user.employee.id).all()
+    )
     
-    subordinate_user_ids = [sub.user.id for sub in subordinates if sub.user]
-    pending_tasks = Task.query.filter(
-        Task.assigned_to_id.in_(subordinate_user_ids),
-        Task.status.in_(['pending', 'in_progress'])
-    ).count() if subordinate_user_ids else 0
+    team_stats = get_team_task_stats(current_user.employee.id)
     
     return render_template('manager/dashboard.html',
                          subordinates=subordinates,
-                         pending_tasks=pending_tasks)
+                         pending_tasks=team_stats.total.open,
+                         overdue_tasks=team_stats.total.overdue)
 
 @manager_bp.route('/team')
 @login_required
@@ -36,7 +38,10 @@ def view_team():
         flash('Manager account not linked to employee record.', 'danger')
         return redirect(url_for('dashboard'))
     
-    subordinates = Employee.query.filter_by(manager_id=current_user.employee.id).all()
+    subordinates = (
+        with_profile(Employee.query, 'employee.list', 'employee.with_user')
+        .filter_by(manager_id=current_user.employee.id).all()
+    )
     return render_template('manager/team.html', subordinates=subordinates)
 
 
@@ -63,6 +68,7 @@ def edit_subordinate(id):
         
         try:
             db.session.commit()
+            evict_identity(employee.user.id)
             flash(f'User account for {employee.full_name} updated successfully!', 'success')
             return redirect(url_for('manager.view_team'))
         except Exception as e:
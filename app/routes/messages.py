@@ -1,8 +1,12 @@
+import click
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 from app import db
 from app.models.user import User
 from app.models.message import Message
+from app.utils.loaders import with_profile
+from app.utils.navbar import get_navbar_state
+from app.utils.pagination import desc, paginate
 from datetime import datetime
 
 message_bp = Blueprint('messages', __name__, url_prefix='/messages')
@@ -11,16 +15,16 @@ message_bp = Blueprint('messages', __name__, url_prefix='/messages')
 @message_bp.route('/')
 @login_required
 def inbox():
-    messages = Message.query.filter_by(recipient_id=current_user.id).order_by(Message.created_at.desc()).all()
-    unread_count = Message.query.filter_by(recipient_id=current_user.id, is_read=False).count()
-    return render_template('messages/inbox.html', messages=messages, unread_count=unread_count)
+    page = paginate(with_profile(Message.query, 'message.inbox').filter_by(recipient_id=current_user.id), desc(Message.created_at), desc(Message.id))
+    unread_count = get_navbar_state(current_user).unread_count
+    return render_template('messages/inbox.html', messages=page.items, page=page, unread_count=unread_count)
 
 
 @message_bp.route('/sent')
 @login_required
 def sent():
-    messages = Message.query.filter_by(sender_id=current_user.id).order_by(Message.created_at.desc()).all()
-    return render_template('messages/sent.html', messages=messages)
+    page = paginate(with_profile(Message.query, 'message.sent').filter_by(sender_id=current_user.id), desc(Message.created_at), desc(Message.id))
+    return render_template('messages/sent.html', messages=page.items, page=page)
 
 
 @message_bp.route('/compose', methods=['GET', 'POST'])
@@ -40,6 +44,7 @@ def compose():
         
         try:
             db.session.add(message)
+            User.adjust_unread_count(message.recipient_id, 1)
             db.session.commit()
             flash('Message sent successfully!', 'success')
             return redirect(url_for('messages.sent'))
@@ -61,7 +66,7 @@ def view_message(id):
         return redirect(url_for('messages.inbox'))
     
     if message.recipient_id == current_user.id and not message.is_read:
-        message.is_read = True
+        message.mark_read()
         db.session.commit()
     
     return render_template('messages/view.html', message=message)
@@ -89,6 +94,7 @@ def reply(id):
         
         try:
             db.session.add(message)
+            User.adjust_unread_count(message.recipient_id, 1)
             db.session.commit()
             flash('Reply sent successfully!', 'success')
             return redirect(url_for('messages.inbox'))
@@ -97,3 +103,21 @@ def reply(id):
             flash(f'Error sending reply: {str(e)}', 'danger')
     
     return render_template('messages/reply.html', original_message=original_message)
+
+
+@message_bp.cli.command('reconcile-unread')
+def reconcile_unread_command():
+    """Recompute every user's unread counter from the messages table."""
+    actual = (
+        db.select(db.func.count(Message.id))
+        .where(Message.recipient_id == User.id, Message.is_read.is_(False))
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        db.update(User)
+        .where(User.unread_count != actual)
+        .values(unread_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    click.echo(f"Reconciled unread counters for {result.rowcount} users.")
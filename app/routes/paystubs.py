@@ -1,10 +1,21 @@
-from flask import Blueprint, render_template, redirect, url_for, flash
+import calendar
+from datetime import date
+import click
+from flask import Blueprint, current_app, render_template, redirect, request, send_file, url_for, flash
 from flask_login import login_required, current_user
 from app import db
+from app.models.department import Department
 from app.models.paystub import Paystub
+from app.models.payroll_run import PayrollRun
 from app.models.employees import Employee, Role
+from app.models.user import User
 from app.utils.decorators import role_required
-from app.forms.paystub_forms import PaystubForm
+from app.utils.pagination import asc, desc, paginate
+from app.utils.payroll import BASES, run_payroll
+from app.utils.payroll_summary import (department_register, employee_register_query, get_summaries,
+                                       rebuild_summaries, register_totals)
+from app.utils.pdf_generator import get_store, render_paystubs, stored_path
+from app.forms.paystub_forms import PaystubForm, PayrollRunForm
 
 paystub_bp = Blueprint('paystubs', __name__, url_prefix='/paystubs')
 
@@ -13,19 +24,67 @@ paystub_bp = Blueprint('paystubs', __name__, url_prefix='/paystubs')
 @login_required
 def my_paystubs():
     """Employees view their own paystubs."""
-    paystubs = Paystub.query.filter_by(employee_id=current_user.id).order_by(Paystub.pay_period_end.desc()).all()
-    return render_template('paystubs/index.html', paystubs=paystubs)
+    paystubs = Paystub.query.filter_by(employee_id=current_user.employee_id).order_by(Paystub.pay_period_end.desc()).all()
+    summaries = get_summaries(current_user.employee_id)
+    this_year = date.today().year
+    ytd = next((summary for summary in summaries if summary.year == this_year), None)
+    return render_template('paystubs/index.html', paystubs=paystubs, summaries=summaries, ytd=ytd, this_year=this_year)
+
+
+@paystub_bp.route('/register')
+@login_required
+@role_required(Role.ADMIN)
+def payroll_register():
+    """Payroll totals for a year by department; ?department= lists that department's employees."""
+    year = request.args.get('year', date.today().year, type=int)
+    departments = department_register(year)
+    totals = register_totals(year)
+
+    page = department = None
+    if 'department' in request.args:
+        department_id = request.args.get('department', type=int)  # empty: employees without a department
+        department = next((row for row in departments if row.id == department_id), None)
+        page = paginate(employee_register_query(year, department_id),
+                        asc(Employee.last_name), asc(Employee.first_name), asc(Employee.id))
+    return render_template('paystubs/register.html', year=year, departments=departments, totals=totals,
+                           department=department, page=page)
+
+
+@paystub_bp.route('/<int:paystub_id>/pdf')
+@login_required
+def download_paystub(paystub_id):
+    """Serve a rendered stub from the store; never renders on request."""
+    paystub = db.get_or_404(Paystub, paystub_id)
+    if paystub.employee_id != current_user.employee_id and not current_user.is_admin:
+        flash('You do not have permission to view this paystub.', 'danger')
+        return redirect(url_for('paystubs.my_paystubs'))
+
+    path = stored_path(current_app, paystub.file_path)
+    if path is None:
+        flash('This paystub has not been rendered yet. Please try again later.', 'warning')
+        return redirect(url_for('paystubs.my_paystubs'))
+
+    # the key is a hash of the stub's contents, so it doubles as a strong ETag; send_file
+    # streams from disk and answers If-None-Match / Range itself
+    response = send_file(path, mimetype='application/pdf', download_name=f'paystub-{paystub.pay_period_end}.pdf',
+                         conditional=True, etag=paystub.file_path, max_age=3600)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    return response
 
 
 @paystub_bp.route('/create', methods=['GET', 'POST'])
 @login_required
 @role_required(Role.ADMIN)
 def create_paystub():
-    """Admins can generate paystubs for any user."""
+    """Admins can generate paystubs for any employee with a user account."""
     form = PaystubForm()
-    form.employee_id.choices = [
-        (emp.user.id, f"{emp.full_name} ({emp.user.username})") for emp in Employee.query.all() if emp.user
-    ]
+    rows = db.session.execute(
+        db.select(Employee.id, Employee.first_name, Employee.last_name, User.username)
+        .join(User, User.employee_id == Employee.id)
+        .order_by(Employee.last_name, Employee.first_name)
+    )
+    form.employee_id.choices = [(emp_id, f"{first} {last} ({username})") for emp_id, first, last, username in rows]
 
     if form.validate_on_submit():
         paystub = Paystub(
@@ -46,3 +105,73 @@ def create_paystub():
         return redirect(url_for('paystubs.my_paystubs'))
 
     return render_template('paystubs/create.html', form=form)
+
+
+@paystub_bp.route('/runs', methods=['GET', 'POST'])
+@login_required
+@role_required(Role.ADMIN)
+def payroll_runs():
+    """Admins run payroll for a period and review past runs."""
+    form = PayrollRunForm()
+    form.department_id.choices = [(0, 'All departments')] + [
+        (dept_id, name) for dept_id, name in db.session.execute(db.select(Department.id, Department.name).order_by(Department.name))
+    ]
+
+    if form.validate_on_submit():
+        try:
+            run = run_payroll(form.period_start.data, form.period_end.data,
+                              department_id=form.department_id.data or None, basis=form.basis.data,
+                              created_by_id=current_user.id)
+            flash(f'Payroll run {run.id}: {run.paystub_count} paystubs issued, {run.skipped_count} skipped '
+                  f'in {run.duration_ms} ms.', 'success')
+        except Exception as e:
+            flash(f'Payroll run failed: {str(e)}', 'danger')
+        return redirect(url_for('paystubs.payroll_runs'))
+
+    page = paginate(PayrollRun.query, desc(PayrollRun.started_at), desc(PayrollRun.id))
+    departments = dict(form.department_id.choices)
+    return render_template('paystubs/runs.html', form=form, runs=page.items, page=page, departments=departments)
+
+
+@paystub_bp.cli.command('run')
+@click.option('--start', 'period_start', required=True, type=click.DateTime(formats=['%Y-%m-%d']), help='First day of the pay period.')
+@click.option('--end', 'period_end', required=True, type=click.DateTime(formats=['%Y-%m-%d']), help='Last day of the pay period.')
+@click.option('--department', 'department_id', type=int, default=None, help='Department id (default: everyone).')
+@click.option('--basis', type=click.Choice(BASES), default='salary', show_default=True)
+@click.option('--chunk-size', type=int, default=None, help='Employees per batch (default: PAYROLL_CHUNK_SIZE).')
+def run_command(period_start, period_end, department_id, basis, chunk_size):
+    """Issue paystubs for a pay period."""
+    run = run_payroll(period_start.date(), period_end.date(), department_id=department_id, basis=basis,
+                      chunk_size=chunk_size)
+    click.echo(f"Run {run.id}: {run.paystub_count} paystubs for {run.employee_count} employees "
+               f"({run.skipped_count} skipped) in {run.batch_count} batches, {run.duration_ms} ms.")
+    click.echo(f"Gross {run.total_gross}  taxes {run.total_taxes}  deductions {run.total_deductions}  net {run.total_net}")
+
+
+@paystub_bp.cli.command('rebuild-summary')
+@click.option('--year', type=int, default=None, help='Only rebuild this year (default: all years).')
+def rebuild_summary_command(year):
+    """Recompute per-employee yearly payroll totals from paystubs."""
+    written = rebuild_summaries(year)
+    db.session.commit()
+    click.echo(f"Wrote {written} payroll summary rows.")
+
+
+@paystub_bp.cli.command('render')
+@click.option('--period', required=True, type=click.DateTime(formats=['%Y-%m']),
+              help='Month (YYYY-MM): render stubs whose pay period ends in it.')
+@click.option('--workers', type=int, default=None, help='Render processes (default: PAYSTUB_RENDER_WORKERS, 0 = inline).')
+@click.option('--force', is_flag=True, help='Re-render even if the stored PDF is current.')
+def render_command(period, workers, force):
+    """Render paystub PDFs for a month into the paystub store."""
+    config = current_app.config
+    start = period.date()
+    end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+    counts = render_paystubs(
+        get_store(current_app), start, end, company=config.get('PAYSTUB_COMPANY_NAME', 'Team Manager'),
+        workers=config.get('PAYSTUB_RENDER_WORKERS', 0) if workers is None else workers,
+        chunk_size=config.get('PAYROLL_CHUNK_SIZE', 1000), force=force,
+    )
+    db.session.commit()
+    click.echo(f"{counts['checked']} paystubs for {start:%Y-%m}: {counts['rendered']} rendered, "
+               f"{counts['unchanged']} already current.")
@@ -4,6 +4,7 @@ from app import db
 from app.models.user import User
 from app.models.employees import Role
 from app.utils.decorators import role_required
+from app.utils.identity import evict_identity
 
 profile_bp = Blueprint('profile', __name__, url_prefix='/profile')
 
@@ -62,6 +63,7 @@ def handle_edit_profile(target_user):
         # Save user and employee fields according to permissions
         form.apply_changes(target_user)
         db.session.commit()
+        evict_identity(target_user.id)
         flash("Profile updated successfully!", "success")
         return redirect(url_for('profile.view_profile'))
     
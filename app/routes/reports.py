@@ -0,0 +1,146 @@
+from datetime import date
+from flask import (Blueprint, Response, abort, current_app, flash, jsonify, redirect, render_template, request,
+                   send_file, stream_with_context, url_for)
+from flask_login import login_required, current_user
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.models.report import Report
+from app.utils.decorators import role_required
+from app.utils.exports import EXPORTS, FORMATS, ExportFilters, stream_export
+from app.utils.hierarchy import report_employee_ids_query
+from app.utils.pagination import desc, paginate
+from app.utils.report_jobs import KINDS, normalize_params, request_report, result_path
+
+reports_bp = Blueprint('reports', __name__, url_prefix='/reports')
+
+
+def _date_arg(name: str):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400)
+
+
+def _filters() -> ExportFilters:
+    return ExportFilters(
+        start=_date_arg('start'),
+        end=_date_arg('end'),
+        department_id=request.args.get('department', type=int),
+        manager_id=request.args.get('manager', type=int),
+    )
+
+
+def _scope_manager_id():
+    """Managers only ever export their own reports; admins everything."""
+    return None if current_user.is_admin else current_user.employee.id
+
+
+def _departments():
+    return db.session.execute(db.select(Department.id, Department.name).order_by(Department.name)).all()
+
+
+@reports_bp.route('/')
+@login_required
+@role_required(Role.ADMIN, Role.MANAGER)
+def index():
+    """Pick filters, then download any dataset with them."""
+    departments = _departments()
+    managers = db.select(Employee.id, Employee.first_name, Employee.last_name).where(
+        Employee.role.in_([Role.ADMIN, Role.MANAGER])).order_by(Employee.last_name, Employee.first_name)
+    scope = _scope_manager_id()
+    if scope is not None:
+        managers = managers.where(db.or_(Employee.id == scope, Employee.id.in_(report_employee_ids_query(scope))))
+    exports = {name: spec for name, spec in EXPORTS.items() if current_user.employee.role in spec.roles}
+    args = {key: value for key, value in request.args.items() if value and key in ('start', 'end', 'department', 'manager')}
+    return render_template('reports/index.html', exports=exports, formats=FORMATS, args=args,
+                           departments=departments, managers=db.session.execute(managers).all())
+
+
+@reports_bp.route('/<dataset>.<fmt>')
+@login_required
+@role_required(Role.ADMIN, Role.MANAGER)
+def export(dataset, fmt):
+    """Stream a dataset as CSV or NDJSON while it is being read."""
+    spec = EXPORTS.get(dataset)
+    if spec is None or fmt not in FORMATS:
+        abort(404)
+    if current_user.employee.role not in spec.roles:
+        flash(f'Access denied. The {spec.title.lower()} export is for: '
+              f'{", ".join(role.value.capitalize() for role in spec.roles)}.', 'danger')
+        return redirect(url_for('reports.index'))
+
+    # the generator runs after this view returns; stream_with_context keeps the request
+    # (and with it the database session) alive until the last row is sent
+    rows = stream_with_context(stream_export(spec, fmt, _filters(), _scope_manager_id()))
+    response = Response(rows, mimetype=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={dataset}-{date.today()}.{fmt}'
+    response.headers['X-Accel-Buffering'] = 'no'  # let nginx pass chunks through as they come
+    return response
+
+
+def _job_status(report: Report) -> dict:
+    status = report.to_dict()
+    status['download_url'] = (url_for('reports.download_job', id=report.id)
+                              if result_path(current_app, report) else None)
+    return status
+
+
+@reports_bp.route('/jobs', methods=['GET', 'POST'])
+@login_required
+@role_required(Role.ADMIN)
+def jobs():
+    """Queue a report for the worker (or reuse an identical recent one) and list past reports."""
+    if request.method == 'POST':
+        try:
+            start, end = (date.fromisoformat(request.form[name]) if request.form.get(name) else None
+                          for name in ('start', 'end'))
+            params = normalize_params(request.form.get('kind', ''), start, end,
+                                      request.form.get('department', type=int))
+        except ValueError as e:
+            flash(f'Could not queue the report: {e}.', 'danger')
+            return redirect(url_for('reports.jobs'))
+        report, reused = request_report(request.form['kind'], params, current_user.id)
+        db.session.commit()
+        if reused:
+            flash('An identical report was requested recently; showing that one.', 'info')
+        else:
+            flash('Report queued.', 'success')
+        return redirect(url_for('reports.job', id=report.id))
+
+    page = paginate(Report.query.options(db.joinedload(Report.requested_by)), desc(Report.id))
+    return render_template('reports/jobs.html', reports=page.items, page=page, kinds=KINDS,
+                           departments=_departments(), today=date.today())
+
+
+@reports_bp.route('/jobs/<int:id>')
+@login_required
+@role_required(Role.ADMIN)
+def job(id):
+    report = db.get_or_404(Report, id)
+    department = db.session.get(Department, report.params['department_id']) if report.params.get('department_id') else None
+    return render_template('reports/job.html', report=report, kind=KINDS.get(report.kind), department=department,
+                           status=_job_status(report))
+
+
+@reports_bp.route('/jobs/<int:id>/status')
+@login_required
+@role_required(Role.ADMIN)
+def job_status(id):
+    """Polled by the report page until the report is done."""
+    return jsonify(_job_status(db.get_or_404(Report, id)))
+
+
+@reports_bp.route('/jobs/<int:id>/download')
+@login_required
+@role_required(Role.ADMIN)
+def download_job(id):
+    report = db.get_or_404(Report, id)
+    path = result_path(current_app, report)
+    if path is None:
+        abort(404)
+    name = f"{report.kind}-{report.params['start']}-{report.params['end']}.csv"
+    return send_file(path, mimetype='text/csv', as_attachment=True, download_name=name, conditional=True)
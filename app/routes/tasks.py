@@ -7,6 +7,9 @@ from app.models.employees import Role
 from datetime import datetime
 
 from app.utils.decorators import role_required
+from app.utils.loaders import with_profile
+from app.utils.pagination import desc, paginate
+from app.utils.task_stats import invalidate_task_stats
 
 task_bp = Blueprint('tasks', __name__, url_prefix='/tasks')
 
@@ -44,13 +47,14 @@ def create_task():
         try:
             db.session.add(task)
             db.session.commit()
+            invalidate_task_stats(task.assigned_to_id)
             flash('Task created successfully!', 'success')
             return redirect(url_for('tasks.my_tasks'))
         except Exception as e:
             db.session.rollback()
             flash(f'Error creating task: {str(e)}', 'danger')
     
-    users = User.query.filter_by(is_active=True).all()
+    users = with_profile(User.query, 'user.list').filter_by(is_active=True).all()
     return render_template('tasks/create.html', users=users)
 
 
@@ -83,6 +87,7 @@ def update_status(id):
     
     try:
         db.session.commit()
+        invalidate_task_stats(task.assigned_to_id)
         flash('Task status updated successfully!', 'success')
     except Exception as e:
         db.session.rollback()
@@ -95,5 +100,5 @@ def update_status(id):
 @login_required
 @role_required(Role.ADMIN, Role.MANAGER)
 def assigned_tasks():
-    tasks = Task.query.filter_by(created_by_id=current_user.id).order_by(Task.created_at.desc()).all()
-    return render_template('tasks/assigned.html', tasks=tasks)
+    page = paginate(with_profile(Task.query, 'task.assigned').filter_by(created_by_id=current_user.id), desc(Task.created_at), desc(Task.id))
+    return render_template('tasks/assigned.html', tasks=page.items, page=page)
@@ -1,26 +1,26 @@
-from datetime import datetime, timezone
-from flask import Blueprint, redirect, url_for, flash, render_template
+from datetime import date, timedelta
+from flask import Blueprint, redirect, request, url_for, flash, render_template
 from flask_login import login_required, current_user
 from app import db
+from app.models.employees import Role
 from app.models.time_entry import TimeEntry
+from app.models.user import User
+from app.utils.decorators import role_required
+from app.utils.hierarchy import visible_user_ids_query
+from app.utils.pagination import asc, paginate
+from app.utils.timesheets import get_team_totals, get_timesheet, get_timesheets, week_start
 
 time_tracking_bp = Blueprint('time_tracking', __name__, url_prefix='/time-tracker')
 
 
-def _get_active_entry(user_id: int):
-    return TimeEntry.query.filter_by(user_id=user_id, clock_out=None).order_by(TimeEntry.clock_in.desc()).first()
-
-
 @time_tracking_bp.route('/clock-in', methods=['POST'])
 @login_required
 def clock_in():
-    existing = _get_active_entry(current_user.id)
-    if existing:
+    entry = TimeEntry.clock_in_user(current_user.id)
+    db.session.commit()
+    if entry is None:
         flash("Already clocked in.", "info")
         return redirect(url_for('main.dashboard'))
-    entry = TimeEntry(user_id=current_user.id, clock_in=datetime.now(timezone.utc))
-    db.session.add(entry)
-    db.session.commit()
     flash("Clocked in.", "success")
     return redirect(url_for('main.dashboard'))
 
@@ -28,12 +28,11 @@ def clock_in():
 @time_tracking_bp.route('/clock-out', methods=['POST'])
 @login_required
 def clock_out():
-    entry = _get_active_entry(current_user.id)
-    if not entry:
+    entry = TimeEntry.clock_out_user(current_user.id)
+    db.session.commit()
+    if entry is None:
         flash("No active session to clock out.", "warning")
         return redirect(url_for('main.dashboard'))
-    entry.clock_out_now()
-    db.session.commit()
     flash("Clocked out.", "success")
     return redirect(url_for('main.dashboard'))
 
@@ -43,3 +42,35 @@ def clock_out():
 def log():
     entries = TimeEntry.query.filter_by(user_id=current_user.id).order_by(TimeEntry.clock_in.desc()).limit(50).all()
     return render_template('time_tracking/log.html', entries=entries)
+
+
+def _requested_week() -> date:
+    try:
+        day = date.fromisoformat(request.args.get('week', ''))
+    except ValueError:
+        day = date.today()
+    return week_start(day)
+
+
+@time_tracking_bp.route('/timesheet')
+@login_required
+def timesheet():
+    """Hours per day for one week, from the daily rollup."""
+    start = _requested_week()
+    return render_template('time_tracking/timesheet.html', sheet=get_timesheet(current_user.id, start),
+                           previous_week=start - timedelta(days=7), next_week=start + timedelta(days=7))
+
+
+@time_tracking_bp.route('/team')
+@login_required
+@role_required(Role.ADMIN, Role.MANAGER)
+def team_timesheet():
+    """Weekly hours for each report plus per-day totals for the whole team."""
+    start = _requested_week()
+    user_ids = visible_user_ids_query(current_user)
+    page = paginate(db.session.query(User.id, User.username).filter(User.id.in_(user_ids)),
+                    asc(User.username), asc(User.id))
+    sheets = get_timesheets([row.id for row in page], start)
+    rows = [(row.username, sheets[row.id]) for row in page]
+    return render_template('time_tracking/team.html', rows=rows, page=page, totals=get_team_totals(user_ids, start),
+                           start=start, previous_week=start - timedelta(days=7), next_week=start + timedelta(days=7))
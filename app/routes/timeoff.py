@@ -3,19 +3,18 @@ from flask import Blueprint, render_template, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
 from app.models.timeoff import TimeOff, TimeOffStatus, TimeOffType
-from app.models.employees import Employee, Role
+from app.models.employees import Role
 from app.utils.decorators import role_required
+from app.utils.hierarchy import is_report_of, report_user_ids_query
+from app.utils.loaders import with_profile
+from app.utils.pagination import desc, paginate
 from app.forms.timeoff_forms import TimeOffRequestForm
 from app.models.message import Message
+from app.models.user import User
 
 timeoff_bp = Blueprint('timeoff', __name__, url_prefix='/timeoff')
 
 
-def _get_subordinate_user_ids(manager_employee_id: int) -> list[int]:
-    return [
-        emp.user.id for emp in Employee.query.filter_by(manager_id=manager_employee_id).all() if emp.user
-    ]
-
 def _is_hr(user) -> bool:
     if not user.employee:
         return False
@@ -32,6 +31,7 @@ def _notify(user_from, user_to_id: int, subject: str, body: str):
         recipient_id=user_to_id
     )
     db.session.add(msg)
+    User.adjust_unread_count(user_to_id, 1)
 
 
 @timeoff_bp.route('/', methods=['GET', 'POST'])
@@ -66,11 +66,12 @@ def my_timeoff():
 def review_team_requests():
     """Managers review subordinate requests; HR/admin can also view."""
     if current_user.is_admin or _is_hr(current_user):
-        requests = TimeOff.query.order_by(TimeOff.created_at.desc()).all()
+        query = with_profile(TimeOff.query, 'timeoff.review')
     else:
-        subordinate_ids = _get_subordinate_user_ids(current_user.employee.id)
-        requests = TimeOff.query.filter(TimeOff.user_id.in_(subordinate_ids)).order_by(TimeOff.created_at.desc()).all()
-    return render_template('timeoff/review.html', requests=requests, is_hr=False)
+        subordinate_ids = report_user_ids_query(current_user.employee.id)
+        query = with_profile(TimeOff.query, 'timeoff.review').filter(TimeOff.user_id.in_(subordinate_ids))
+    page = paginate(query, desc(TimeOff.created_at), desc(TimeOff.id))
+    return render_template('timeoff/review.html', requests=page.items, page=page, is_hr=False)
 
 
 @timeoff_bp.route('/hr')
@@ -80,8 +81,9 @@ def hr_queue():
     if not (_is_hr(current_user) or current_user.is_admin):
         flash("Access denied. HR only.", "danger")
         return redirect(url_for('main.dashboard'))
-    requests = TimeOff.query.filter_by(status=TimeOffStatus.MANAGER_APPROVED).order_by(TimeOff.created_at.desc()).all()
-    return render_template('timeoff/review.html', requests=requests, is_hr=True)
+    query = with_profile(TimeOff.query, 'timeoff.review').filter_by(status=TimeOffStatus.MANAGER_APPROVED)
+    page = paginate(query, desc(TimeOff.created_at), desc(TimeOff.id))
+    return render_template('timeoff/review.html', requests=page.items, page=page, is_hr=True)
 
 
 @timeoff_bp.route('/<int:request_id>/<action>', methods=['POST'])
@@ -92,9 +94,9 @@ def act_on_request(request_id, action):
 
     is_hr_user = _is_hr(current_user) or current_user.is_admin
 
-    # Managers can only act on their subordinates
+    # Managers can only act on people in their reporting line (direct or skip-level)
     if current_user.is_manager and not is_hr_user:
-        if not timeoff.user.employee or timeoff.user.employee.manager_id != current_user.employee.id:
+        if not timeoff.user.employee or not is_report_of(timeoff.user.employee.id, current_user.employee.id):
             flash('You cannot act on requests outside your team.', 'danger')
             return redirect(url_for('timeoff.review_team_requests'))
 
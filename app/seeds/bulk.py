@@ -0,0 +1,301 @@
+import csv
+import io
+import json
+import random
+import time as timer
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from enum import Enum
+from itertools import islice
+import click
+from flask.cli import with_appcontext
+from app import db
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.models.message import Message
+from app.models.paystub import Paystub
+from app.models.task import Task
+from app.models.team import Team
+from app.models.time_entry import TimeEntry
+from app.models.timeoff import TimeOff, TimeOffStatus, TimeOffType
+from app.models.user import User
+from app.utils.counters import reconcile_counters
+from app.utils.passwords import password_hasher
+from app.utils.payroll_summary import rebuild_summaries
+from app.utils.timesheets import backfill_hours
+
+DEFAULT_PASSWORD = 'password123'
+
+
+@dataclass
+class SeedSize:
+    """How much data `flask seed` generates."""
+    employees: int = 1000
+    departments: int = 8
+    teams_per_department: int = 3
+    branching: int = 5          # direct reports per manager; depth ~= log_branching(employees)
+    history_days: int = 30      # attendance + time entries per user per day
+    messages_per_user: int = 10
+    tasks_per_user: int = 3
+    timeoffs_per_user: int = 1
+    paystubs_per_employee: int = 3
+
+
+class BulkWriter:
+    """
+    Writes row dicts in batches: COPY FROM STDIN on PostgreSQL, executemany elsewhere.
+    Rows bypass ORM events and Python-side column defaults, so they must be complete.
+    """
+
+    def __init__(self, batch_size: int = 5000, use_copy: bool | None = None):
+        self.batch_size = batch_size
+        self.use_copy = db.engine.dialect.name == 'postgresql' if use_copy is None else use_copy
+        self.counts = {}
+
+    def write(self, model, rows) -> int:
+        table = model.__table__
+        rows = iter(rows)
+        written = 0
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            if self.use_copy:
+                self._copy(table, batch)
+            else:
+                self._executemany(table, batch)
+            written += len(batch)
+        self.counts[table.name] = self.counts.get(table.name, 0) + written
+        return written
+
+    def _executemany(self, table, batch):
+        # Compile once and run the column bind processors ourselves: generated data repeats
+        # a handful of dates/enums/timestamps, so memoizing the processed values per column
+        # removes most of the per-row conversion cost of a plain session.execute(insert, rows).
+        connection = db.session.connection()
+        dialect = connection.dialect
+        compiled = table.insert().compile(dialect=dialect, column_keys=list(batch[0]))
+        keys = compiled.positiontup if compiled.positional else list(batch[0])
+        converters = []
+        for key in keys:
+            process = table.c[key].type.dialect_impl(dialect).bind_processor(dialect)
+            converters.append((key, _memoized(process) if process else None))
+        if compiled.positional:
+            params = [tuple(row[k] if c is None else c(row[k]) for k, c in converters) for row in batch]
+        else:
+            params = [{k: row[k] if c is None else c(row[k]) for k, c in converters} for row in batch]
+        connection.exec_driver_sql(str(compiled), params)
+
+    @staticmethod
+    def _copy_value(value):
+        if value is None:
+            return ''
+        if isinstance(value, Enum):
+            return value.name
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        if isinstance(value, (dict, list)):
+            return json.dumps(value)
+        if isinstance(value, (date, datetime)):
+            return value.isoformat()
+        return value
+
+    def _copy(self, table, batch):
+        columns = list(batch[0])
+        converters = [(c, _memoized(self._copy_value)) for c in columns]
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([convert(row[c]) for c, convert in converters] for row in batch)
+        buffer.seek(0)
+        column_list = ', '.join(f'"{c}"' for c in columns)
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+        finally:
+            cursor.close()
+
+
+def _memoized(process):
+    cache = {}
+
+    def convert(value):
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = process(value)
+            return result
+        except TypeError:  # unhashable, e.g. JSON dicts
+            return process(value)
+    return convert
+
+
+def _next_id(model) -> int:
+    return (db.session.scalar(db.select(db.func.max(model.id))) or 0) + 1
+
+
+def _reset_sequences(*models):
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for model in models:
+        name = model.__tablename__
+        db.session.execute(db.text(
+            f"SELECT setval(pg_get_serial_sequence('\"{name}\"', 'id'), (SELECT MAX(id) FROM \"{name}\"))"
+        ))
+
+
+def seed(size: SeedSize, seed: int = 42, batch_size: int = 5000, password: str = DEFAULT_PASSWORD) -> dict:
+    """
+    Generate a deterministic synthetic organisation in one transaction.
+
+    Appends to existing data: primary keys continue from the current maximum.
+    Returns usernames of a representative admin, manager and employee.
+    """
+    rng = random.Random(seed)
+    writer = BulkWriter(batch_size)
+    now = datetime.utcnow()
+    today = date.today()
+    password_hash = password_hasher.hash(password)
+
+    first_department = _next_id(Department)
+    department_ids = list(range(first_department, first_department + size.departments))
+    has_hr = db.session.scalar(db.select(Department.id).filter_by(name='Human Resources')) is not None
+    writer.write(Department, (
+        {'id': dept_id, 'name': 'Human Resources' if dept_id == first_department and not has_hr else f'Department {dept_id}',
+         'description': 'Generated by flask seed', 'created_at': now}
+        for dept_id in department_ids
+    ))
+
+    # heap layout: the k-th generated employee reports to employee (k - 2) // branching + 1
+    first = _next_id(Employee)
+    first_user = _next_id(User)
+    last = first + size.employees - 1
+
+    def manager_of(n):
+        k = n - first + 1
+        return first + (k - 2) // size.branching if k > 1 else None
+
+    def role_of(n):
+        k = n - first + 1
+        if k == 1:
+            return Role.ADMIN
+        return Role.MANAGER if (k - 1) * size.branching + 2 <= size.employees else Role.EMPLOYEE
+
+    def user_of(n):
+        return first_user + (n - first)
+
+    writer.write(Employee, (
+        {'id': n, 'first_name': f'First{n}', 'last_name': f'Last{n}', 'email': f'employee{n}@example.com',
+         'phone': None, 'position': role_of(n).value.capitalize(), 'role': role_of(n),
+         'hire_date': today - timedelta(days=rng.randint(30, 3000)), 'salary': float(rng.randint(40, 180) * 1000),
+         'department_id': rng.choice(department_ids), 'manager_id': manager_of(n), 'created_at': now, 'updated_at': now}
+        for n in range(first, last + 1)
+    ))
+    writer.write(User, (
+        {'id': user_of(n), 'username': f'user{n}', 'email': f'employee{n}@example.com', 'employee_id': n,
+         'password_hash': password_hash, 'is_active': True, 'user_metadata': {}, 'unread_count': 0,
+         'created_at': now, 'updated_at': now}
+        for n in range(first, last + 1)
+    ))
+    writer.write(Team, (
+        {'name': f'Team {d}.{t}', 'description': None, 'department_id': d,
+         'lead_id': rng.randint(first, last), 'created_at': now}
+        for d in department_ids for t in range(size.teams_per_department)
+    ))
+
+    user_ids = range(user_of(first), user_of(last) + 1)
+    statuses = list(AttendanceStatus)
+    days = [today - timedelta(days=offset) for offset in range(size.history_days, 0, -1)]
+    writer.write(Attendance, (
+        {'user_id': u, 'date': day, 'status': rng.choice(statuses), 'note': None, 'created_at': now, 'updated_at': now}
+        for day in days for u in user_ids
+    ))
+
+    def entries():
+        for day in days:
+            start = datetime.combine(day, time(9))
+            for u in user_ids:
+                clock_in = start + timedelta(minutes=rng.randint(0, 60))
+                yield {'user_id': u, 'clock_in': clock_in, 'clock_out': clock_in + timedelta(hours=8, minutes=rng.randint(0, 90)),
+                       'created_at': now, 'updated_at': now}
+    writer.write(TimeEntry, entries())
+
+    # bulk rows bypass the ORM, so track the denormalized unread counters while generating
+    unread = dict.fromkeys(user_ids, 0)
+
+    def messages():
+        for u in user_ids:
+            for _ in range(size.messages_per_user):
+                is_read = rng.random() < 0.8
+                unread[u] += not is_read
+                yield {'subject': 'Generated message', 'body': 'Lorem ipsum dolor sit amet.', 'sender_id': rng.choice(user_ids),
+                       'recipient_id': u, 'is_read': is_read, 'created_at': now - timedelta(minutes=rng.randint(0, 500000))}
+    writer.write(Message, messages())
+    unread_rows = [{'uid': u, 'n': n} for u, n in unread.items() if n]
+    if unread_rows:
+        db.session.execute(
+            User.__table__.update().where(User.__table__.c.id == db.bindparam('uid')).values(unread_count=db.bindparam('n')),
+            unread_rows,
+        )
+    writer.write(Task, (
+        {'title': 'Generated task', 'description': None, 'status': rng.choice(['pending', 'in_progress', 'completed']),
+         'priority': rng.choice(['low', 'medium', 'high']), 'assigned_to_id': user_of(n),
+         'created_by_id': user_of(manager_of(n) or n), 'due_date': now + timedelta(days=rng.randint(-30, 30)),
+         'completed_at': None, 'created_at': now, 'updated_at': now}
+        for n in range(first, last + 1) for _ in range(size.tasks_per_user)
+    ))
+
+    def timeoffs():
+        for n in range(first, last + 1):
+            for _ in range(size.timeoffs_per_user):
+                start_date = today + timedelta(days=rng.randint(-200, 60))
+                yield {'user_id': user_of(n), 'manager_id': user_of(manager_of(n) or n), 'hr_id': None,
+                       'manager_decision_at': None, 'hr_decision_at': None, 'type': rng.choice(list(TimeOffType)),
+                       'status': rng.choice(list(TimeOffStatus)), 'start_date': start_date,
+                       'end_date': start_date + timedelta(days=rng.randint(0, 5)), 'reason': None,
+                       'created_at': now, 'updated_at': now}
+    writer.write(TimeOff, timeoffs())
+
+    writer.write(Paystub, (
+        {'employee_id': n, 'pay_period_start': today - timedelta(days=14 * p + 13), 'pay_period_end': today - timedelta(days=14 * p),
+         'gross_pay': 3000, 'taxes': 600, 'deductions': 100, 'net_pay': 2300, 'file_path': None, 'notes': None,
+         'issued_at': now, 'created_at': now, 'updated_at': now}
+        for n in range(first, last + 1) for p in range(size.paystubs_per_employee)
+    ))
+
+    _reset_sequences(Department, Employee, User)
+    reconcile_counters()  # bulk rows bypass the ORM events that maintain the counters
+    backfill_hours()  # ... and TimeEntry.clock_out_user, which maintains the daily hours
+    rebuild_summaries()  # ... and the paystub flush events behind the payroll summaries
+    db.session.commit()
+
+    return {
+        'admin': f'user{first}',
+        'manager': f'user{first + 1}' if size.employees > 1 else f'user{first}',
+        'employee': f'user{last}',
+        'counts': writer.counts,
+    }
+
+
+@click.command(name='seed')
+@click.option('--employees', default=SeedSize.employees, show_default=True)
+@click.option('--departments', default=SeedSize.departments, show_default=True)
+@click.option('--teams-per-department', default=SeedSize.teams_per_department, show_default=True)
+@click.option('--branching', default=SeedSize.branching, show_default=True, help='Direct reports per manager.')
+@click.option('--history-days', default=SeedSize.history_days, show_default=True)
+@click.option('--messages-per-user', default=SeedSize.messages_per_user, show_default=True)
+@click.option('--seed', 'rng_seed', default=42, show_default=True, help='RNG seed for deterministic data.')
+@click.option('--batch-size', default=5000, show_default=True)
+@with_appcontext
+def seed_command(employees, departments, teams_per_department, branching, history_days, messages_per_user,
+                 rng_seed, batch_size):
+    """Bulk-generate a synthetic organisation for development and load testing."""
+    size = SeedSize(employees=employees, departments=departments, teams_per_department=teams_per_department,
+                    branching=branching, history_days=history_days, messages_per_user=messages_per_user)
+    started = timer.perf_counter()
+    result = seed(size, seed=rng_seed, batch_size=batch_size)
+    elapsed = timer.perf_counter() - started
+    total = sum(result['counts'].values())
+    for table, count in result['counts'].items():
+        click.echo(f"  {table:15} {count:>10}")
+    click.echo(f"Seeded {total} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s). "
+               f"Log in as {result['admin']}, {result['manager']} or {result['employee']} / {DEFAULT_PASSWORD}.")
@@ -15,9 +15,8 @@ from app.models.employees import Employee, Role
 from app.models.timeoff import TimeOff, TimeOffType, TimeOffStatus
 from app.models.attendance import Attendance, AttendanceStatus
 
-app = create_app()
-
-with app.app_context():
+def seed_sample_data():
+	"""Small hand-written demo dataset; for volume use `flask seed` (app.seeds.bulk)."""
 	from datetime import date, datetime, timezone
 
 	### --- Departments ---
@@ -27,7 +26,7 @@ with app.app_context():
 	finance_dept = Department(name='Finance', description='Finance & Accounting')
 
 	db.session.add_all([hr_dept, it_dept, sales_dept, finance_dept])
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -90,7 +89,7 @@ with app.app_context():
 	))
 
 	db.session.add_all(teams)
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -111,7 +110,7 @@ with app.app_context():
 		department_id=hr_dept.id
 	)
 	db.session.add(hr_manager)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=hr_manager.id,
@@ -122,11 +121,11 @@ with app.app_context():
 		postal_code='60504',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 	# Assign as lead of Recruitment Team
 	teams[0].lead_id = hr_manager.id
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -142,7 +141,7 @@ with app.app_context():
 		department_id=it_dept.id
 	)
 	db.session.add(it_manager)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=it_manager.id,
@@ -153,11 +152,11 @@ with app.app_context():
 		postal_code='60540',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 	# Assign as lead of Infrastructure Team
 	teams[3].lead_id = it_manager.id
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -173,7 +172,7 @@ with app.app_context():
 		department_id=hr_dept.id
 	)
 	db.session.add(hr_emp)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=hr_emp.id,
@@ -184,7 +183,7 @@ with app.app_context():
 		postal_code='60440',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -200,7 +199,7 @@ with app.app_context():
 		department_id=it_dept.id
 	)
 	db.session.add(it_emp)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=it_emp.id,
@@ -211,7 +210,7 @@ with app.app_context():
 		postal_code='60616',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -227,7 +226,7 @@ with app.app_context():
 		department_id=sales_dept.id
 	)
 	db.session.add(sales_emp)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=sales_emp.id,
@@ -238,7 +237,7 @@ with app.app_context():
 		postal_code='60173',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -254,7 +253,7 @@ with app.app_context():
 		department_id=finance_dept.id
 	)
 	db.session.add(finance_emp)
-	db.session.commit()
+	db.session.flush()
 
 	db.session.add(Address(
 		employee_id=finance_emp.id,
@@ -265,7 +264,7 @@ with app.app_context():
 		postal_code='60187',
 		country='USA'
 	))
-	db.session.commit()
+	db.session.flush()
 
 
 
@@ -288,7 +287,7 @@ with app.app_context():
 	]
 
 	db.session.add_all(users)
-	db.session.commit()
+	db.session.flush()
 
 	print("All sample departments, teams, employees, addresses, and users created successfully!")
 
@@ -422,3 +421,8 @@ with app.app_context():
 
 	print("Sample tasks have been created successfully!")
 
+
+if __name__ == '__main__':
+	app = create_app()
+	with app.app_context():
+		seed_sample_data()
@@ -0,0 +1,39 @@
+document.addEventListener('DOMContentLoaded', () => {
+  const panel = document.getElementById('report-status');
+  if (!panel || panel.getAttribute('data-done') === 'true') return;
+  const url = panel.getAttribute('data-status-url');
+  const badges = { queued: 'secondary', running: 'info', completed: 'success', failed: 'danger' };
+  const field = (name) => panel.querySelector(`[data-field="${name}"]`);
+
+  const render = (report) => {
+    const status = field('status');
+    status.textContent = report.status;
+    status.className = `badge bg-${badges[report.status] || 'secondary'}`;
+    if (report.row_count !== null) field('row_count').textContent = report.row_count;
+    if (report.duration_ms !== null) field('duration_ms').textContent = `${report.duration_ms} ms`;
+    if (report.error) {
+      field('error').textContent = report.error;
+      field('error').classList.remove('d-none');
+    }
+    if (report.download_url) {
+      field('download_url').href = report.download_url;
+      field('download_url').classList.remove('d-none');
+    }
+  };
+
+  const poll = () => {
+    fetch(url, { headers: { Accept: 'application/json' } })
+      .then((response) => response.json())
+      .then((report) => {
+        render(report);
+        if (report.status === 'completed' || report.status === 'failed') {
+          field('spinner').classList.add('d-none');
+        } else {
+          setTimeout(poll, 2000);
+        }
+      })
+      .catch(() => setTimeout(poll, 5000));
+  };
+
+  setTimeout(poll, 2000);
+});
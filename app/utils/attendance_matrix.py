@@ -0,0 +1,110 @@
+import calendar
+import csv
+import hashlib
+import io
+from datetime import date
+from typing import Iterator, Optional
+from app import db
+from app.models.attendance import Attendance, AttendanceStatus
+
+# Cell byte -> status; 0 means no record for that day.
+STATUSES = list(AttendanceStatus)
+STATUS_BYTES = {status: i + 1 for i, status in enumerate(STATUSES)}
+CODES = ('',) + tuple(status.value[0] for status in STATUSES)  # '', P, A, L, E
+
+
+def parse_month(value: Optional[str]) -> Optional[date]:
+    """First day of a 'YYYY-MM' month, or None if ``value`` is missing or malformed."""
+    try:
+        year, month = (int(part) for part in (value or '').split('-'))
+        return date(year, month, 1)
+    except ValueError:
+        return None
+
+
+class AttendanceMatrix:
+    """
+    One month of attendance for a list of users: users as rows, days as columns.
+
+    Cells live in a single row-major ``bytearray`` (one byte per user/day, see
+    STATUS_BYTES) rather than in ORM objects, so a month for thousands of users
+    costs a few hundred kilobytes.
+    """
+
+    def __init__(self, month: date, users):
+        self.month = month.replace(day=1)
+        self.days = calendar.monthrange(self.month.year, self.month.month)[1]
+        self.users = list(users)  # (user_id, username) in display order
+        self._rows = {user_id: i for i, (user_id, _) in enumerate(self.users)}
+        self.cells = bytearray(len(self.users) * self.days)
+
+    def set(self, user_id: int, day: date, status: AttendanceStatus) -> None:
+        index = self._rows.get(user_id)
+        if index is not None:
+            self.cells[index * self.days + day.day - 1] = STATUS_BYTES[status]
+
+    def row(self, index: int) -> bytes:
+        start = index * self.days
+        return bytes(self.cells[start:start + self.days])
+
+    def rows(self) -> Iterator[tuple]:
+        """(username, codes) per user, where codes holds one status letter ('' if unmarked) per day."""
+        for i, (_, username) in enumerate(self.users):
+            yield username, [CODES[b] for b in self.row(i)]
+
+    def totals(self, index: int) -> dict:
+        """Days per status for one row."""
+        row = self.row(index)
+        return {status: row.count(STATUS_BYTES[status]) for status in STATUSES}
+
+    def iter_csv(self) -> Iterator[str]:
+        """The grid as CSV lines: username then one column per day."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush():
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return line
+
+        writer.writerow(['username'] + [self.month.replace(day=d).isoformat() for d in range(1, self.days + 1)])
+        yield flush()
+        for username, codes in self.rows():
+            writer.writerow([username] + codes)
+            yield flush()
+
+
+def _month_filter(month: date, user_ids):
+    last = month.replace(day=calendar.monthrange(month.year, month.month)[1])
+    return db.and_(Attendance.date.between(month, last), Attendance.user_id.in_(user_ids))
+
+
+def matrix_etag(month: date, users, user_ids, *extra) -> str:
+    """
+    Validator for a month grid: changes when any record in range is written or removed,
+    when the user list changes, or when anything in ``extra`` (other state the response
+    depends on) does. One aggregate query.
+    """
+    count, last_update = db.session.execute(
+        db.select(db.func.count(Attendance.id), db.func.max(Attendance.updated_at))
+        .where(_month_filter(month, user_ids))
+    ).one()
+    digest = hashlib.sha1(repr((month.isoformat(), list(users), count, str(last_update), extra)).encode())
+    return digest.hexdigest()
+
+
+def build_matrix(month: date, users, user_ids) -> AttendanceMatrix:
+    """
+    Fill a grid for ``users`` ((user_id, username) pairs) from one date-range query.
+    ``user_ids`` restricts that query: a list of ids or a SELECT usable inside ``.in_()``.
+    """
+    matrix = AttendanceMatrix(month, users)
+    rows = db.session.execute(
+        db.select(Attendance.user_id, Attendance.date, Attendance.status)
+        .where(_month_filter(matrix.month, user_ids))
+        .execution_options(yield_per=5000)
+    )
+    for user_id, day, status in rows:
+        matrix.set(user_id, day, status)
+    return matrix
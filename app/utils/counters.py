@@ -0,0 +1,120 @@
+from collections import Counter as Tally
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import event
+from app import db
+from app.models.counter import Counter
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.team import Team
+from app.models.user import User
+
+# Tables whose row counts are kept in the counters table, keyed by table name.
+TRACKED = {model.__tablename__: model for model in (Employee, User, Department, Team)}
+
+counters_cli = AppGroup('counters', help='Maintain cached table row counts.')
+
+
+def init_app(app, db):
+    """Keep counters in step with ORM inserts/deletes and register `flask counters`."""
+    if not event.contains(db.session, 'after_flush', _apply_flush_deltas):
+        event.listen(db.session, 'after_flush', _apply_flush_deltas)
+    app.cli.add_command(counters_cli)
+
+
+def _apply_flush_deltas(session, flush_context):
+    # new/deleted still hold the pre-flush state here; one UPDATE per touched counter
+    deltas = Tally()
+    for objects, sign in ((session.new, 1), (session.deleted, -1)):
+        for obj in objects:
+            name = getattr(obj, '__tablename__', None)
+            if TRACKED.get(name) is type(obj):
+                deltas[name] += sign
+
+    table = Counter.__table__
+    connection = session.connection()
+    for name, delta in deltas.items():
+        if delta:
+            connection.execute(
+                table.update().where(table.c.name == name).values(value=table.c.value + delta)
+            )
+
+
+def adjust_counter(name: str, delta: int) -> None:
+    """
+    Add ``delta`` to a tracked table's counter, for bulk writes that bypass the ORM events.
+    Runs in the caller's transaction; call session.commit() externally.
+    """
+    table = Counter.__table__
+    if delta:
+        db.session.execute(table.update().where(table.c.name == name).values(value=table.c.value + delta))
+
+
+def _exact_counts(names) -> dict:
+    statement = db.union_all(*(
+        db.select(db.literal(name).label('name'), db.func.count().label('n')).select_from(TRACKED[name])
+        for name in names
+    ))
+    return dict(db.session.execute(statement).all())
+
+
+def _estimated_counts(names) -> dict:
+    """Planner row estimates from pg_class; tables never analyzed (reltuples < 0) are left out."""
+    rows = db.session.execute(
+        db.text("SELECT name, reltuples::bigint FROM unnest(CAST(:names AS text[])) AS name "
+                "JOIN pg_class ON pg_class.oid = to_regclass(quote_ident(name))"),
+        {'names': list(names)},
+    )
+    return {name: n for name, n in rows if n >= 0}
+
+
+def get_counts(*names: str, estimate: bool | None = None) -> dict:
+    """
+    Row counts for tracked tables (all of them by default).
+
+    Reads the counters table; with ``estimate`` (default: COUNTERS_ESTIMATE) on PostgreSQL,
+    planner statistics are used instead. Missing counters fall back to an exact COUNT.
+    """
+    names = list(names or TRACKED)
+    if estimate is None:
+        estimate = current_app.config.get('COUNTERS_ESTIMATE', False)
+
+    counts = {}
+    if estimate and db.engine.dialect.name == 'postgresql':
+        counts = _estimated_counts(names)
+    missing = [n for n in names if n not in counts]
+    if missing:
+        rows = db.session.execute(db.select(Counter.name, Counter.value).where(Counter.name.in_(missing)))
+        counts.update(rows.all())
+    missing = [n for n in names if n not in counts]
+    if missing:
+        counts.update(_exact_counts(missing))
+    return counts
+
+
+def reconcile_counters(*names: str) -> dict:
+    """
+    Reset counters to exact counts, creating missing rows.
+    Runs in the caller's transaction; returns {name: (stored, exact)} for every counter checked.
+    """
+    names = list(names or TRACKED)
+    stored = dict(db.session.execute(db.select(Counter.name, Counter.value).where(Counter.name.in_(names))).all())
+    exact = _exact_counts(names)
+    table = Counter.__table__
+    for name in names:
+        if name not in stored:
+            db.session.execute(table.insert().values(name=name, value=exact[name]))
+        elif stored[name] != exact[name]:
+            db.session.execute(table.update().where(table.c.name == name).values(value=exact[name]))
+    return {name: (stored.get(name), exact[name]) for name in names}
+
+
+@counters_cli.command('reconcile')
+def reconcile_command():
+    """Recount tracked tables and fix any drifted counters."""
+    result = reconcile_counters()
+    db.session.commit()
+    for name, (stored, exact) in result.items():
+        note = '' if stored == exact else f"  (was {stored if stored is not None else 'missing'})"
+        click.echo(f"{name:15} {exact:>12}{note}")
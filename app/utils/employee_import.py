@@ -0,0 +1,274 @@
+import csv
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Iterable, Optional
+import click
+from flask.cli import AppGroup
+from app import db
+from app.models.address import Address
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.utils.counters import adjust_counter
+
+employees_cli = AppGroup('employees', help='Bulk employee maintenance.')
+
+# Rows per INSERT batch (and per email lookup)
+BATCH_SIZE = 1000
+
+REQUIRED_COLUMNS = ('first_name', 'last_name', 'email')
+# Copied as-is (stripped, empty -> NULL) onto the employee
+TEXT_COLUMNS = ('phone', 'position', 'emergency_contact', 'emergency_phone')
+# address_type, street, city, ... -> Address.type, .street, .city, ...
+ADDRESS_COLUMNS = {'address_type': 'type', 'street': 'street', 'city': 'city', 'state': 'state',
+                   'postal_code': 'postal_code', 'country': 'country'}
+COLUMNS = (*REQUIRED_COLUMNS, *TEXT_COLUMNS, 'role', 'hire_date', 'salary', 'department', 'manager_email',
+           *ADDRESS_COLUMNS)
+
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+def init_app(app):
+    app.cli.add_command(employees_cli)
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import: ``errors`` holds (line, message) for every rejected row."""
+    rows: int = 0
+    created: int = 0
+    addresses: int = 0
+    errors: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class _Row:
+    line: int
+    values: dict
+    address: Optional[dict]
+    manager_email: Optional[str]
+
+
+def check_columns(fieldnames) -> None:
+    """Raise ValueError unless the header has the required columns (unknown ones are ignored)."""
+    missing = [name for name in REQUIRED_COLUMNS if name not in (fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+
+
+def _clean(record: dict, name: str) -> Optional[str]:
+    return (record.get(name) or '').strip() or None
+
+
+def _too_long(model, name: str, value: Optional[str]) -> bool:
+    length = getattr(model.__table__.c[name].type, 'length', None)
+    return bool(value and length and len(value) > length)
+
+
+def _parse_row(line: int, record: dict, departments: dict) -> tuple:
+    """A _Row for one CSV record, plus what is wrong with it on its own (references come later)."""
+    problems = []
+    values = {name: _clean(record, name) for name in (*REQUIRED_COLUMNS, *TEXT_COLUMNS)}
+    for name in REQUIRED_COLUMNS:
+        if values[name] is None:
+            problems.append(f'{name} is required')
+    if values['email'] and not _EMAIL.match(values['email']):
+        problems.append(f"invalid email {values['email']!r}")
+    problems += [f'{name} is too long' for name, value in values.items() if _too_long(Employee, name, value)]
+
+    role = _clean(record, 'role')
+    try:
+        values['role'] = Role(role.lower()) if role else Role.EMPLOYEE
+    except ValueError:
+        problems.append(f'unknown role {role!r}')
+    hire_date = _clean(record, 'hire_date')
+    try:
+        values['hire_date'] = date.fromisoformat(hire_date) if hire_date else None
+    except ValueError:
+        problems.append(f'bad hire_date {hire_date!r} (expected YYYY-MM-DD)')
+    salary = _clean(record, 'salary')
+    try:
+        values['salary'] = float(salary) if salary else None
+        if values['salary'] is not None and values['salary'] < 0:
+            problems.append('salary cannot be negative')
+    except ValueError:
+        problems.append(f'bad salary {salary!r}')
+    department = _clean(record, 'department')
+    values['department_id'] = departments.get(department.lower()) if department else None
+    if department and values['department_id'] is None:
+        problems.append(f'unknown department {department!r}')
+
+    address = {column: _clean(record, name) for name, column in ADDRESS_COLUMNS.items()}
+    if any(address.values()):
+        address['type'] = address['type'] or 'home'
+        problems += [f'{name} is required for an address' for name in ('street', 'city') if address[name] is None]
+        problems += [f'{name} is too long' for name, value in address.items() if _too_long(Address, name, value)]
+    else:
+        address = None
+
+    return _Row(line, values, address, _clean(record, 'manager_email')), problems
+
+
+def _existing_employees(emails) -> dict:
+    """
+    {lowercased email: id} for the given emails that already belong to an employee, compared
+    case-insensitively, BATCH_SIZE per query.
+    """
+    emails, found = list({email.lower() for email in emails}), {}
+    for i in range(0, len(emails), BATCH_SIZE):
+        found.update(db.session.execute(
+            db.select(db.func.lower(Employee.email), Employee.id)
+            .where(db.func.lower(Employee.email).in_(emails[i:i + BATCH_SIZE]))
+        ).all())
+    return found
+
+
+def _levels(rows: list, in_file: dict, errors: dict) -> list:
+    """
+    Group rows so every row comes after the file row that manages it: level 0 reports to an
+    existing employee (or nobody), level n to a row of level n - 1. Rows in a reporting cycle
+    (or under one) get an error instead.
+    """
+    depth = {}
+
+    def resolve(row):
+        # walk up through file managers until a row of known depth, the top, or a repeat
+        chain, seen = [], set()
+        while row.line not in depth:
+            if row.line in seen:
+                for below in chain:
+                    depth[below.line] = None
+                return None
+            chain.append(row)
+            seen.add(row.line)
+            manager = in_file.get((row.manager_email or '').lower())
+            if manager is None:
+                depth[row.line] = 0
+                chain.pop()
+                break
+            row = manager
+        level = depth[row.line]
+        for below in reversed(chain):
+            level = depth[below.line] = None if level is None else level + 1
+        return depth[chain[0].line] if chain else level
+
+    levels = []
+    for row in rows:
+        level = resolve(row)
+        if level is None:
+            errors.setdefault(row.line, []).append(f'manager_email {row.manager_email!r} is part of a reporting cycle')
+            continue
+        while len(levels) <= level:
+            levels.append([])
+        levels[level].append(row)
+    return levels
+
+
+def _insert_level(rows: list, ids: dict) -> int:
+    """Insert one level's employees and addresses in batches; records the new ids in ``ids``."""
+    addresses = 0
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i:i + BATCH_SIZE]
+        params = [{**row.values, 'manager_id': ids.get((row.manager_email or '').lower())} for row in batch]
+        db.session.execute(db.insert(Employee), params)
+        # read the ids back by (unique, lower()-indexed) email: unlike INSERT ... RETURNING in
+        # parameter order, a plain executemany stays batched on every dialect
+        new_ids = _existing_employees(row.values['email'] for row in batch)
+        ids.update(new_ids)
+        address_rows = [{**row.address, 'employee_id': new_ids[row.values['email'].lower()]}
+                        for row in batch if row.address]
+        if address_rows:
+            db.session.execute(db.insert(Address), address_rows)
+            addresses += len(address_rows)
+    return addresses
+
+
+def import_employees(records: Iterable[dict], dry_run: bool = False) -> ImportReport:
+    """
+    Validate every record (csv.DictReader rows, COLUMNS) before writing any: required fields,
+    emails (well formed, unique in the file and not taken), department names, and managers
+    given by manager_email, either an existing employee or another row of the same file.
+    If nothing is wrong (and not ``dry_run``), employees and their addresses are inserted in
+    batches, managers before their reports; otherwise nothing is written.
+    Runs in the caller's transaction; call session.commit() externally.
+    """
+    departments = {name.lower(): id for id, name in db.session.execute(db.select(Department.id, Department.name))}
+    rows, errors = [], {}
+    for line, record in enumerate(records, start=2):
+        row, problems = _parse_row(line, record, departments)
+        rows.append(row)
+        if problems:
+            errors[line] = problems
+
+    in_file = {}
+    for row in rows:
+        email = (row.values['email'] or '').lower()
+        if not email:
+            continue
+        if email in in_file:
+            errors.setdefault(row.line, []).append(f'email also on line {in_file[email].line}')
+        else:
+            in_file[email] = row
+    existing = _existing_employees(
+        {row.values['email'] for row in rows if row.values['email']} | {row.manager_email for row in rows if row.manager_email}
+    )
+    # the same rule as the create form: once anyone is on file, everyone needs a manager
+    manager_required = bool(existing) or db.session.scalar(db.select(Employee.id).limit(1)) is not None
+    for row in rows:
+        email, manager = (row.values['email'] or '').lower(), (row.manager_email or '').lower()
+        if email in existing:
+            errors.setdefault(row.line, []).append(f"email {row.values['email']!r} already belongs to an employee")
+        if not manager:
+            if manager_required:
+                errors.setdefault(row.line, []).append('manager_email is required')
+        elif manager == email:
+            errors.setdefault(row.line, []).append('an employee cannot be their own manager')
+        elif manager not in existing and manager not in in_file:
+            errors.setdefault(row.line, []).append(f'unknown manager_email {row.manager_email!r}')
+    # a manager_email already on file means that employee, not a file row reusing the email
+    file_managers = {email: row for email, row in in_file.items() if email not in existing}
+    levels = _levels([row for row in rows if row.line not in errors], file_managers, errors)
+
+    report = ImportReport(rows=len(rows), errors=[(line, '; '.join(errors[line])) for line in sorted(errors)])
+    if not report.ok or dry_run:
+        return report
+
+    ids = dict(existing)
+    for level in levels:
+        report.addresses += _insert_level(level, ids)
+    report.created = len(rows)
+    adjust_counter(Employee.__tablename__, report.created)  # bulk rows bypass the ORM counter events
+    return report
+
+
+@employees_cli.command('import')
+@click.argument('csv_file', type=click.File('r', encoding='utf-8-sig'))
+@click.option('--dry-run', is_flag=True, help='Validate the file without writing anything.')
+def import_command(csv_file, dry_run):
+    """
+    Create employees (and addresses) from a CSV with columns first_name, last_name, email
+    and optionally phone, position, role, hire_date, salary, emergency_contact,
+    emergency_phone, department (name), manager_email and address_type, street, city,
+    state, postal_code, country. The whole file is checked first; any error imports nothing.
+    """
+    reader = csv.DictReader(csv_file)
+    try:
+        check_columns(reader.fieldnames)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    report = import_employees(reader, dry_run=dry_run)
+    for line, message in report.errors:
+        click.echo(f'line {line}: {message}', err=True)
+    if not report.ok:
+        db.session.rollback()
+        raise click.ClickException(f'{len(report.errors)} of {report.rows} rows have errors; nothing imported.')
+    if dry_run:
+        click.echo(f'Dry run: all {report.rows} rows are valid.')
+        return
+    db.session.commit()
+    click.echo(f'Imported {report.created} employees and {report.addresses} addresses.')
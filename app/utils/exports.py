@@ -0,0 +1,216 @@
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Iterator, Optional
+from app import db
+from app.models.attendance import Attendance
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.models.paystub import Paystub
+from app.models.time_entry import TimeEntry
+from app.models.user import User
+from app.utils.hierarchy import is_report_of, report_employee_ids_query
+
+FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+# Rows fetched per round trip from the server-side cursor; each batch goes out as one chunk
+FETCH_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """
+    One exportable dataset: ``columns`` are (header, expression) pairs selected from
+    ``source()``; ``date_column`` is what start/end filter on and ``employee_column``
+    what the department/manager filters (and a manager's scope) apply to.
+    """
+    title: str
+    columns: tuple
+    source: Callable[[], Any]  # returns the SELECT ... FROM/JOIN part, without columns
+    date_column: Any
+    employee_column: Any
+    order_by: Any
+    roles: tuple = (Role.ADMIN, Role.MANAGER)
+
+
+def _by_user(model):
+    return lambda: (db.select().select_from(model)
+                    .join(User, User.id == model.user_id)
+                    .outerjoin(Employee, Employee.id == User.employee_id))
+
+
+_manager = db.aliased(Employee, name='manager')
+
+EXPORTS = {
+    'employees': ExportSpec(
+        title='Employees',
+        columns=(('id', Employee.id), ('first_name', Employee.first_name), ('last_name', Employee.last_name),
+                 ('email', Employee.email), ('position', Employee.position), ('role', Employee.role),
+                 ('department', Department.name), ('manager_id', Employee.manager_id),
+                 ('manager', _manager.first_name + ' ' + _manager.last_name),
+                 ('hire_date', Employee.hire_date)),
+        source=lambda: (db.select().select_from(Employee)
+                        .outerjoin(Department, Department.id == Employee.department_id)
+                        .outerjoin(_manager, _manager.id == Employee.manager_id)),
+        date_column=Employee.hire_date,
+        employee_column=Employee.id,
+        order_by=Employee.id,
+    ),
+    'attendance': ExportSpec(
+        title='Attendance',
+        columns=(('id', Attendance.id), ('user_id', Attendance.user_id), ('username', User.username),
+                 ('employee_id', Employee.id), ('date', Attendance.date), ('status', Attendance.status),
+                 ('note', Attendance.note)),
+        source=_by_user(Attendance),
+        date_column=Attendance.date,
+        employee_column=Employee.id,
+        order_by=Attendance.id,
+    ),
+    'time_entries': ExportSpec(
+        title='Time entries',
+        columns=(('id', TimeEntry.id), ('user_id', TimeEntry.user_id), ('username', User.username),
+                 ('employee_id', Employee.id), ('clock_in', TimeEntry.clock_in), ('clock_out', TimeEntry.clock_out)),
+        source=_by_user(TimeEntry),
+        date_column=TimeEntry.clock_in,
+        employee_column=Employee.id,
+        order_by=TimeEntry.id,
+    ),
+    'paystubs': ExportSpec(
+        title='Paystubs',
+        columns=(('id', Paystub.id), ('employee_id', Paystub.employee_id), ('first_name', Employee.first_name),
+                 ('last_name', Employee.last_name), ('department', Department.name),
+                 ('pay_period_start', Paystub.pay_period_start), ('pay_period_end', Paystub.pay_period_end),
+                 ('gross_pay', Paystub.gross_pay), ('taxes', Paystub.taxes), ('deductions', Paystub.deductions),
+                 ('net_pay', Paystub.net_pay), ('issued_at', Paystub.issued_at), ('payroll_run_id', Paystub.payroll_run_id)),
+        source=lambda: (db.select().select_from(Paystub)
+                        .join(Employee, Employee.id == Paystub.employee_id)
+                        .outerjoin(Department, Department.id == Employee.department_id)),
+        date_column=Paystub.pay_period_end,
+        employee_column=Paystub.employee_id,
+        order_by=Paystub.id,
+        roles=(Role.ADMIN,),
+    ),
+}
+
+
+@dataclass
+class ExportFilters:
+    start: Optional[date] = None
+    end: Optional[date] = None
+    department_id: Optional[int] = None
+    manager_id: Optional[int] = None  # employee id: restrict to everyone below them
+
+
+def build_export_query(spec: ExportSpec, filters: ExportFilters, scope_manager_id: Optional[int] = None):
+    """
+    SELECT for ``spec`` with ``filters`` applied, in primary-key order. ``scope_manager_id``
+    (an employee id) confines the rows to that manager's reports whatever the filters say.
+    """
+    query = spec.source().add_columns(*(column.label(header) for header, column in spec.columns))
+    if filters.start:
+        query = query.where(spec.date_column >= filters.start)
+    if filters.end:
+        # inclusive: for timestamp columns, anything before the next day
+        if isinstance(spec.date_column.type, db.DateTime):
+            query = query.where(spec.date_column < datetime.combine(filters.end + timedelta(days=1), datetime.min.time()))
+        else:
+            query = query.where(spec.date_column <= filters.end)
+    if filters.department_id is not None:
+        query = query.where(Employee.department_id == filters.department_id)
+    manager_id = filters.manager_id if filters.manager_id is not None else scope_manager_id
+    if scope_manager_id is not None and manager_id != scope_manager_id and not is_report_of(manager_id, scope_manager_id):
+        # a subtree outside the caller's own has nothing they may see
+        query = query.where(db.false())
+    elif manager_id is not None:
+        # a subtree inside the scope is a subset of it, so one filter covers both
+        query = query.where(spec.employee_column.in_(report_employee_ids_query(manager_id)))
+    return query.order_by(spec.order_by)
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _enum_value(value):
+    return value.value
+
+
+def row_converters(columns) -> list:
+    """
+    Per (header, expression) column, what makes its values CSV/JSON-ready (None: nothing),
+    picked once from the column types.
+    """
+    converters = []
+    for _, column in columns:
+        kind = column.type
+        if isinstance(kind, (db.Date, db.DateTime)):
+            converters.append(_isoformat)
+        elif isinstance(kind, db.Enum):
+            converters.append(_enum_value)
+        elif isinstance(kind, db.Numeric) and not isinstance(kind, db.Float):
+            converters.append(str)  # Decimal: keep every digit, JSON has no decimal type
+        else:
+            converters.append(None)
+    return converters
+
+
+def convert_rows(batch, converters) -> list:
+    columns = [(i, convert) for i, convert in enumerate(converters) if convert is not None]
+    if not columns:
+        return batch
+    rows = [list(row) for row in batch]
+    for i, convert in columns:
+        for row in rows:
+            if row[i] is not None:
+                row[i] = convert(row[i])
+    return rows
+
+
+def iter_csv(headers, batches) -> Iterator[str]:
+    """The header line, then one chunk of lines per batch of rows (NULL as an empty field)."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take():
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text
+
+    writer.writerow(headers)
+    yield take()
+    for batch in batches:
+        writer.writerows(batch)
+        yield take()
+
+
+def iter_ndjson(headers, batches) -> Iterator[str]:
+    """One JSON object per line, one chunk per batch of rows."""
+    encode = json.JSONEncoder(separators=(',', ':')).encode
+    for batch in batches:
+        yield ''.join([encode(dict(zip(headers, row))) + '\n' for row in batch])
+
+
+def stream_export(spec: ExportSpec, fmt: str, filters: ExportFilters, scope_manager_id: Optional[int] = None) -> Iterator[str]:
+    """
+    Text chunks of the export, produced while rows are read: the query runs with yield_per
+    (stream_results), so PostgreSQL uses a server-side cursor, rows arrive FETCH_SIZE at a
+    time and memory stays flat however many match. CSV sends its header before the query
+    even runs.
+    """
+    headers = [header for header, _ in spec.columns]
+    converters = row_converters(spec.columns)
+    query = build_export_query(spec, filters, scope_manager_id)
+    writer = (iter_csv if fmt == 'csv' else iter_ndjson)
+
+    def batches():
+        result = db.session.execute(query.execution_options(yield_per=FETCH_SIZE))
+        try:
+            for batch in result.partitions():
+                yield convert_rows(batch, converters)
+        finally:
+            result.close()
+
+    yield from writer(headers, batches())
@@ -0,0 +1,69 @@
+from dataclasses import dataclass, field
+from typing import Optional
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.team import Team
+from app.models.user import User
+
+
+@dataclass
+class GroupCounts:
+    employees: int = 0
+    users: int = 0
+    teams: int = 0
+
+
+@dataclass
+class Headcounts:
+    """
+    Employee/user/team counts overall and per department, plus per-team headcount.
+
+    ``departments`` is keyed by department id; the ``None`` key collects rows that
+    have no department (and users without an employee record). Teams have no
+    membership table, so a team's headcount is its lead plus the lead's direct reports.
+    """
+    total: GroupCounts = field(default_factory=GroupCounts)
+    department_count: int = 0
+    departments: dict = field(default_factory=dict)
+    teams: dict = field(default_factory=dict)
+
+    def for_department(self, department_id: Optional[int]) -> GroupCounts:
+        return self.departments.get(department_id) or GroupCounts()
+
+    def for_team(self, team_id: int) -> int:
+        return self.teams.get(team_id, 0)
+
+
+def _branch(kind: str, key, count):
+    return db.select(db.literal(kind).label('kind'), key.label('key'), count.label('n'))
+
+
+def get_headcounts() -> Headcounts:
+    """Collect every count in one UNION ALL of grouped SELECTs."""
+    team_members = db.func.count(Employee.id) + db.case((Team.lead_id.is_not(None), 1), else_=0)
+    statement = db.union_all(
+        _branch('employees', Employee.department_id, db.func.count(Employee.id))
+        .group_by(Employee.department_id),
+        _branch('users', Employee.department_id, db.func.count(User.id))
+        .select_from(User).outerjoin(Employee, User.employee_id == Employee.id)
+        .group_by(Employee.department_id),
+        _branch('teams', Team.department_id, db.func.count(Team.id))
+        .group_by(Team.department_id),
+        _branch('team', Team.id, team_members)
+        .select_from(Team).outerjoin(Employee, Employee.manager_id == Team.lead_id)
+        .group_by(Team.id, Team.lead_id),
+        _branch('departments', db.literal(None, db.Integer), db.func.count(Department.id)),
+    )
+
+    result = Headcounts()
+    for kind, key, n in db.session.execute(statement):
+        if kind == 'team':
+            result.teams[key] = n
+        elif kind == 'departments':
+            result.department_count = n
+        else:
+            group = result.departments.setdefault(key, GroupCounts())
+            setattr(group, kind, n)
+            setattr(result.total, kind, getattr(result.total, kind) + n)
+    return result
@@ -0,0 +1,88 @@
+from typing import Optional
+from app import db
+from app.models.employees import Employee
+from app.models.user import User
+
+# Guards the recursion against a cycle that slipped past would_create_cycle
+MAX_DEPTH = 64
+
+
+def _reports_cte(manager_employee_id: int, transitive: bool = True):
+    """CTE of (id, depth) for the employees reporting to ``manager_employee_id``."""
+    direct = db.select(Employee.id, db.literal(1).label('depth')).where(Employee.manager_id == manager_employee_id)
+    if not transitive:
+        return direct.cte('reports')
+    reports = direct.cte('reports', recursive=True)
+    child = db.aliased(Employee)
+    return reports.union_all(
+        db.select(child.id, reports.c.depth + 1)
+        .join(reports, child.manager_id == reports.c.id)
+        .where(reports.c.depth < MAX_DEPTH)
+    )
+
+
+def report_employee_ids_query(manager_employee_id: int, transitive: bool = True):
+    """SELECT of report employee ids; usable directly inside ``.in_()``."""
+    reports = _reports_cte(manager_employee_id, transitive)
+    return db.select(reports.c.id)
+
+
+def report_user_ids_query(manager_employee_id: int, transitive: bool = True):
+    """SELECT of the user ids linked to reports; usable directly inside ``.in_()``."""
+    reports = _reports_cte(manager_employee_id, transitive)
+    return db.select(User.id).join(reports, User.employee_id == reports.c.id)
+
+
+def visible_user_ids_query(user):
+    """SELECT of the user ids whose team data ``user`` may see: everyone for admins, else their reports."""
+    if user.is_admin:
+        return db.select(User.id)
+    return report_user_ids_query(user.employee.id)
+
+
+def report_user_ids(manager_employee_id: int, transitive: bool = True) -> list[int]:
+    """User ids of direct (or all transitive) reports, in one query."""
+    return list(db.session.scalars(report_user_ids_query(manager_employee_id, transitive)))
+
+
+def is_report_of(employee_id: int, manager_employee_id: int) -> bool:
+    """True if ``employee_id`` reports to ``manager_employee_id`` at any depth."""
+    reports = _reports_cte(manager_employee_id)
+    return db.session.scalar(db.select(db.exists().where(reports.c.id == employee_id)))
+
+
+def manager_chain(employee_id: int) -> list[int]:
+    """Employee ids of everyone above ``employee_id``, nearest manager first."""
+    chain = (
+        db.select(Employee.manager_id.label('id'), db.literal(1).label('depth'))
+        .where(Employee.id == employee_id, Employee.manager_id.is_not(None))
+        .cte('chain', recursive=True)
+    )
+    parent = db.aliased(Employee)
+    chain = chain.union_all(
+        db.select(parent.manager_id, chain.c.depth + 1)
+        .join(chain, parent.id == chain.c.id)
+        .where(parent.manager_id.is_not(None), chain.c.depth < MAX_DEPTH)
+    )
+    return list(db.session.scalars(db.select(chain.c.id).order_by(chain.c.depth)))
+
+
+def would_create_cycle(employee_id: int, new_manager_id: Optional[int]) -> bool:
+    """True if making ``new_manager_id`` the manager of ``employee_id`` closes a loop."""
+    if new_manager_id is None:
+        return False
+    return new_manager_id == employee_id or is_report_of(new_manager_id, employee_id)
+
+
+def reassign_reports(employee: Employee) -> int:
+    """
+    Move the direct reports of ``employee`` up to its own manager, e.g. before deleting it.
+    Runs in the caller's transaction; returns the number of employees moved.
+    """
+    result = db.session.execute(
+        db.update(Employee)
+        .where(Employee.manager_id == employee.id)
+        .values(manager_id=employee.manager_id)
+        .execution_options(synchronize_session='fetch')
+    )
+    return result.rowcount
@@ -0,0 +1,120 @@
+import copy
+from itertools import chain
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import joinedload, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+# Per-process cache of user_id -> column snapshots of User, Employee and Department.
+# Snapshots (not ORM instances) are cached so nothing is shared between sessions.
+identity_cache = TTLCache()
+
+
+def init_app(app, db):
+    """Size the cache and drop cached identities whenever the ORM writes what they were built from."""
+    identity_cache.configure(
+        maxsize=app.config.get('IDENTITY_CACHE_SIZE', 1024),
+        ttl=app.config.get('IDENTITY_CACHE_TTL', 60),
+    )
+    if not event.contains(db.session, 'after_flush', _evict_flushed):
+        event.listen(db.session, 'after_flush', _evict_flushed)
+        event.listen(db.session, 'after_commit', _evict_committed)
+
+
+def _evict_flushed(session, flush_context):
+    # new/dirty/deleted still hold the pre-flush state here. Evict now, so this session's next
+    # load sees the change, and again after commit, in case another request re-cached the old
+    # committed rows in between.
+    user_ids, employee_ids, departments = set(), set(), False
+    for obj in chain(session.dirty, session.deleted):
+        identity = inspect(obj).identity
+        if identity is None or (obj in session.dirty and not session.is_modified(obj)):
+            continue
+        if isinstance(obj, User):
+            user_ids.add(identity[0])
+        elif isinstance(obj, Employee):
+            employee_ids.add(identity[0])
+        elif isinstance(obj, Department):
+            departments = True
+    if employee_ids:
+        user_ids.update(session.connection().scalars(db.select(User.id).where(User.employee_id.in_(employee_ids))))
+    if not (user_ids or departments):
+        return
+    pending = session.info.setdefault('evicted_identities', set())
+    pending.update(user_ids)
+    if departments:
+        # a department name is copied into every member's identity; renames are rare
+        session.info['evict_all_identities'] = True
+        identity_cache.clear()
+    else:
+        evict_identity(*user_ids)
+
+
+def _evict_committed(session):
+    user_ids = session.info.pop('evicted_identities', None)
+    if session.info.pop('evict_all_identities', False):
+        identity_cache.clear()
+    elif user_ids:
+        evict_identity(*user_ids)
+
+
+def _snapshot(obj):
+    if obj is None:
+        return None
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _restore(model, values):
+    obj = model()
+    for key, value in values.items():
+        setattr(obj, key, copy.copy(value) if isinstance(value, (dict, list)) else value)
+    make_transient_to_detached(obj)
+    return obj
+
+
+def _rebuild(snapshot):
+    """Turn a cached snapshot into a session-bound User without emitting SQL."""
+    user_values, employee_values, department_values = snapshot
+    user = _restore(User, user_values)
+    employee = _restore(Employee, employee_values) if employee_values else None
+    if employee is not None:
+        department = _restore(Department, department_values) if department_values else None
+        set_committed_value(employee, 'department', department)
+    set_committed_value(user, 'employee', employee)
+    return db.session.merge(user, load=False)
+
+
+def load_identity(user_id: int):
+    """
+    Return the User for ``user_id`` with its employee and department already loaded.
+
+    Cache hits cost no queries; misses fetch all three rows in one joined SELECT.
+    """
+    snapshot = identity_cache.get(user_id)
+    if snapshot is not None:
+        return _rebuild(snapshot)
+
+    user = db.session.execute(
+        db.select(User)
+        .options(joinedload(User.employee).joinedload(Employee.department))
+        .filter_by(id=user_id)
+    ).unique().scalar_one_or_none()
+    if user is not None:
+        employee = user.employee
+        identity_cache.set(user_id, (
+            _snapshot(user),
+            _snapshot(employee),
+            _snapshot(employee.department) if employee else None,
+        ))
+    return user
+
+
+def evict_identity(*user_ids) -> None:
+    """Drop cached identities; ORM writes do this themselves, call it after Core/bulk updates."""
+    for user_id in user_ids:
+        if user_id is not None:
+            identity_cache.pop(user_id)
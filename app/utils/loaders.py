@@ -0,0 +1,72 @@
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.message import Message
+from app.models.task import Task
+from app.models.team import Team
+from app.models.timeoff import TimeOff
+from app.models.user import User
+
+# Named eager-loading option sets, one per list view. A view applies its profile with
+# ``with_profile(query, name)`` so the page runs a fixed number of queries however many
+# rows it renders. Add or change a profile here when a template starts (or stops)
+# dereferencing a relationship.
+#
+# joinedload suits many-to-one links rendered on every row; selectinload suits targets
+# shared by many rows (one IN query with distinct keys) and self-referential links.
+LOADER_PROFILES = {}
+
+
+def register_profile(name: str, *options) -> None:
+    if name in LOADER_PROFILES:
+        raise ValueError(f"Loader profile {name!r} is already registered")
+    LOADER_PROFILES[name] = options
+
+
+def loader_options(name: str) -> tuple:
+    """Return the options registered under ``name`` (KeyError if unknown)."""
+    return LOADER_PROFILES[name]
+
+
+def with_profile(query, *names: str):
+    """Apply one or more named loader profiles to a query."""
+    return query.options(*(option for name in names for option in loader_options(name)))
+
+
+_username = (User.id, User.username)
+_employee_name = (Employee.id, Employee.first_name, Employee.last_name)
+
+register_profile(
+    'employee.list',
+    joinedload(Employee.department).load_only(Department.id, Department.name),
+    selectinload(Employee.manager).load_only(*_employee_name),
+)
+register_profile(
+    'employee.with_user',
+    joinedload(Employee.user).load_only(*_username),
+)
+register_profile(
+    'user.list',
+    joinedload(User.employee).load_only(*_employee_name, Employee.role),
+)
+register_profile(
+    'team.list',
+    joinedload(Team.department).load_only(Department.id, Department.name),
+    joinedload(Team.lead).load_only(*_employee_name),
+)
+register_profile(
+    'message.inbox',
+    selectinload(Message.sender).load_only(*_username),
+)
+register_profile(
+    'message.sent',
+    selectinload(Message.recipient).load_only(*_username),
+)
+register_profile(
+    'task.assigned',
+    selectinload(Task.assigned_to).load_only(*_username),
+)
+register_profile(
+    'timeoff.review',
+    selectinload(TimeOff.user).load_only(*_username),
+)
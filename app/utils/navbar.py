@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import NamedTuple, Optional
+from flask import g
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.models.time_entry import TimeEntry
+from app.models.user import User
+
+
+class ActiveTimeEntry(NamedTuple):
+    id: int
+    clock_in: datetime
+
+
+class NavbarState(NamedTuple):
+    unread_count: int = 0
+    active_time_entry: Optional[ActiveTimeEntry] = None
+    is_hr: bool = False
+
+
+def _load_navbar_state(user_id: int) -> NavbarState:
+    """Fetch the unread count, open time entry and HR flag in one SQL statement."""
+    unread_count = db.select(User.unread_count).where(User.id == user_id).scalar_subquery()
+    open_entry = (
+        db.select(TimeEntry.id, TimeEntry.clock_in)
+        .where(TimeEntry.user_id == user_id, TimeEntry.clock_out.is_(None))
+        .order_by(TimeEntry.clock_in.desc())
+        .limit(1)
+        .subquery()
+    )
+    is_hr = (
+        db.select(db.func.count(Employee.id))
+        .join(User, User.employee_id == Employee.id)
+        .join(Department, Department.id == Employee.department_id)
+        .where(
+            User.id == user_id,
+            db.func.lower(Department.name) == 'human resources',
+            Employee.role.in_([Role.ADMIN, Role.MANAGER]),
+        )
+        .scalar_subquery()
+    )
+    row = db.session.execute(
+        db.select(
+            unread_count.label('unread_count'),
+            db.select(open_entry.c.id).scalar_subquery().label('entry_id'),
+            db.select(open_entry.c.clock_in).scalar_subquery().label('entry_clock_in'),
+            is_hr.label('is_hr'),
+        )
+    ).one()
+    active = ActiveTimeEntry(row.entry_id, row.entry_clock_in) if row.entry_id else None
+    return NavbarState(row.unread_count or 0, active, bool(row.is_hr))
+
+
+def get_navbar_state(user) -> NavbarState:
+    """Return the navbar state for ``user``, computed at most once per request."""
+    state = g.get('navbar_state')
+    if state is None:
+        state = g.navbar_state = _load_navbar_state(user.id)
+    return state
@@ -0,0 +1,208 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+from flask import abort, current_app, request, url_for
+from app import db
+
+
+class SortKey(NamedTuple):
+    column: Any
+    descending: bool = False
+
+
+def asc(column) -> SortKey:
+    return SortKey(column, False)
+
+
+def desc(column) -> SortKey:
+    return SortKey(column, True)
+
+
+class Page:
+    """
+    One page of a keyset-paginated query.
+
+    ``next_cursor`` / ``prev_cursor`` are opaque strings (None at either end);
+    ``next_url`` / ``prev_url`` rebuild the current URL with the cursor swapped in.
+    """
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    @property
+    def next_url(self) -> Optional[str]:
+        return self._url(self.next_cursor) if self.has_next else None
+
+    @property
+    def prev_url(self) -> Optional[str]:
+        return self._url(self.prev_cursor) if self.has_prev else None
+
+    def _url(self, cursor: str) -> str:
+        args = {**request.view_args, **request.args.to_dict(), 'cursor': cursor}
+        return url_for(request.endpoint, **args)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        raise ValueError('unknown cursor value')
+    return value
+
+
+def _coerce(value, column):
+    """``value`` as the Python type of ``column``; raises ValueError if it cannot be one."""
+    try:
+        expected = column.type.python_type
+    except NotImplementedError:
+        expected = None
+    if value is None or isinstance(value, (list, dict)):
+        raise ValueError('bad cursor value')
+    if expected is None:
+        return value
+    if expected is datetime or expected is date:
+        # the date/datetime subclass relation makes isinstance() too lenient
+        if type(value) is not expected:
+            raise ValueError('bad cursor value')
+        return value
+    if expected is int:
+        if type(value) is not int:
+            raise ValueError('bad cursor value')
+        return value
+    if expected is float:
+        if type(value) not in (int, float):
+            raise ValueError('bad cursor value')
+        return float(value)
+    if expected is Decimal:
+        if type(value) not in (int, float, str):
+            raise ValueError('bad cursor value')
+        try:
+            return Decimal(str(value))
+        except InvalidOperation as e:
+            raise ValueError('bad cursor value') from e
+    if isinstance(expected, type) and issubclass(expected, Enum):
+        return expected(value)
+    if not isinstance(value, expected):
+        raise ValueError('bad cursor value')
+    return value
+
+
+def encode_cursor(values, backwards: bool = False) -> str:
+    payload = {'k': [_encode_value(v) for v in values]}
+    if backwards:
+        payload['b'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, keys):
+    """
+    Return (values, backwards) for a listing ordered by ``keys``; raises ValueError on
+    anything malformed, including values that are not of their sort column's type.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(v) for v in payload['k']]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError('malformed cursor') from e
+    if len(values) != len(keys):
+        raise ValueError('cursor does not match this listing')
+    return [_coerce(value, key.column) for value, key in zip(values, keys)], bool(payload.get('b'))
+
+
+def _after(keys, values, backwards: bool):
+    """Rows strictly after ``values`` in the ordering given by ``keys`` (before, if backwards)."""
+    if len({key.descending for key in keys}) == 1:
+        columns = db.tuple_(*(key.column for key in keys))
+        bound = db.tuple_(*(db.literal(v, key.column.type) for key, v in zip(keys, values)))
+        return columns < bound if keys[0].descending != backwards else columns > bound
+
+    # mixed directions can't use a row comparison: expand to
+    # (a > x) OR (a = x AND b > y) OR ...
+    clauses = []
+    for i, key in enumerate(keys):
+        value = values[i]
+        step = key.column < value if key.descending != backwards else key.column > value
+        equal = [keys[j].column == values[j] for j in range(i)]
+        clauses.append(db.and_(*equal, step))
+    return db.or_(*clauses)
+
+
+def keyset_paginate(query, *order_by: SortKey, cursor: Optional[str] = None, per_page: int = 50) -> Page:
+    """
+    Fetch one page of ``query`` ordered by ``order_by``.
+
+    The last sort key must be unique (normally the primary key) and none of the keys
+    may be NULL, so every row has a distinct position. Pages are located with a WHERE
+    on the sort keys rather than OFFSET, so the cost of a page does not grow with its
+    depth as long as an index covers the ordering.
+    """
+    keys = list(order_by)
+    backwards = False
+    if cursor:
+        values, backwards = decode_cursor(cursor, keys)
+        query = query.filter(_after(keys, values, backwards))
+
+    ordering = [key.column.desc() if key.descending != backwards else key.column.asc() for key in keys]
+    rows = query.order_by(None).order_by(*ordering).limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def position(row):
+        return [getattr(row, key.column.key) for key in keys]
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(position(rows[-1]))
+        if (has_more and backwards) or (cursor and not backwards):
+            prev_cursor = encode_cursor(position(rows[0]), backwards=True)
+    return Page(rows, per_page, next_cursor, prev_cursor)
+
+
+def paginate(query, *order_by: SortKey) -> Page:
+    """`keyset_paginate` driven by the ``cursor`` and ``per_page`` request args."""
+    max_per_page = current_app.config.get('PAGE_SIZE_MAX', 200)
+    per_page = request.args.get('per_page', current_app.config.get('PAGE_SIZE', 50), type=int)
+    per_page = min(max(per_page, 1), max_per_page)
+    try:
+        return keyset_paginate(query, *order_by, cursor=request.args.get('cursor'), per_page=per_page)
+    except ValueError:
+        abort(400)
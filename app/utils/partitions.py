@@ -0,0 +1,247 @@
+import re
+from datetime import date
+from typing import NamedTuple
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app import db
+
+partitions_cli = AppGroup('partitions', help='Manage monthly partitions (PostgreSQL).')
+
+
+class PartitionSpec(NamedTuple):
+    column: str  # range partition key, one partition per calendar month
+    # per-partition index DDL, for unique indexes that cannot live on the parent
+    # because they do not include the partition key; formatted with {index} and {partition}
+    local_indexes: tuple = ()
+
+
+PARTITIONED = {
+    'attendances': PartitionSpec('date'),
+    'time_entries': PartitionSpec('clock_in', local_indexes=(
+        # one open entry per user within a partition; TimeEntry.clock_in_user covers older months
+        ('open_user', 'CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {partition} (user_id) WHERE clock_out IS NULL'),
+    )),
+}
+
+_MONTH_SUFFIX = re.compile(r'_(\d{4})_(\d{2})$')
+
+
+def init_app(app):
+    app.cli.add_command(partitions_cli)
+
+
+def month_floor(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def is_partitioned(connection, table: str) -> bool:
+    if connection.dialect.name != 'postgresql':
+        return False
+    return connection.execute(
+        db.text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"),
+        {'table': table},
+    ).scalar()
+
+
+def list_partitions(connection, table: str) -> dict:
+    """{first day of month: partition name} for the monthly partitions attached to ``table``."""
+    names = connection.execute(
+        db.text("SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:table)"),
+        {'table': table},
+    ).scalars()
+    months = {}
+    for name in names:
+        match = _MONTH_SUFFIX.search(name)
+        if match:
+            months[date(int(match[1]), int(match[2]), 1)] = name
+    return months
+
+
+def _create_local_indexes(connection, table: str, partition: str) -> None:
+    for suffix, ddl in PARTITIONED[table].local_indexes:
+        connection.execute(db.text(ddl.format(index=f'{partition}_{suffix}', partition=partition)))
+
+
+def create_partition(connection, table: str, month: date) -> str:
+    """
+    Add the partition for ``month``, moving any rows for that month out of the default
+    partition first (PostgreSQL refuses to attach a range the default partition holds).
+    """
+    column = PARTITIONED[table].column
+    partition = partition_name(table, month)
+    bounds = {'start': month, 'end': add_months(month, 1)}
+    connection.execute(db.text(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    connection.execute(db.text(
+        f"WITH moved AS (DELETE FROM {table}_default WHERE {column} >= :start AND {column} < :end RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved"
+    ), bounds)
+    connection.execute(db.text(
+        f"ALTER TABLE {table} ATTACH PARTITION {partition} FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+    _create_local_indexes(connection, table, partition)
+    return partition
+
+
+def archive_partition(connection, table: str, partition: str, schema: str) -> None:
+    """Detach ``partition`` and, if ``schema`` is set, move it there; its rows are kept as-is."""
+    connection.execute(db.text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+    # an archive is a frozen snapshot: don't let it hold on to the live table's sequence
+    # or block deleting the users it mentions
+    connection.execute(db.text(f"ALTER TABLE {partition} ALTER COLUMN id DROP DEFAULT"))
+    foreign_keys = connection.execute(db.text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:table) AND contype = 'f'"
+    ), {'table': partition}).scalars().all()
+    for name in foreign_keys:
+        connection.execute(db.text(f"ALTER TABLE {partition} DROP CONSTRAINT {name}"))
+    if schema:
+        connection.execute(db.text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+        connection.execute(db.text(f"ALTER TABLE {partition} SET SCHEMA {schema}"))
+
+
+def _definitions(connection, table: str):
+    """Constraints (other than NOT NULL / CHECK, which LIKE copies) and standalone indexes of ``table``."""
+    constraints = connection.execute(db.text(
+        "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(:table) AND contype IN ('p', 'u', 'f') ORDER BY contype"
+    ), {'table': table}).all()
+    indexes = connection.execute(db.text(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = to_regclass(:table) "
+        "AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)"
+    ), {'table': table}).all()
+    return constraints, indexes
+
+
+def _rebuild(connection, source: str, table: str, constraints, indexes, primary_key: str, skip_index) -> None:
+    """Copy rows from ``source`` into ``table``, hand over the id sequence, drop ``source`` and recreate its definitions."""
+    connection.execute(db.text(f"INSERT INTO {table} SELECT * FROM {source}"))
+    sequence = connection.execute(db.text("SELECT pg_get_serial_sequence(:table, 'id')"), {'table': source}).scalar()
+    if sequence:
+        connection.execute(db.text(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id"))
+    connection.execute(db.text(f"DROP TABLE {source}"))
+
+    for name, kind, definition in constraints:
+        if kind == 'p':
+            definition = primary_key
+        connection.execute(db.text(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"))
+    # definitions were read before the rename, so they already name ``table``
+    for name, definition in indexes:
+        if not skip_index(definition):
+            connection.execute(db.text(definition))
+
+
+def partition_table(connection, table: str, months_ahead: int = 3) -> list[str]:
+    """
+    Convert ``table`` into a monthly range-partitioned table with the same columns, keys and
+    indexes, one partition per month from its oldest row to ``months_ahead`` past today, plus
+    a default partition. The primary key becomes (id, <partition column>), as PostgreSQL
+    requires; unique indexes without the partition column become per-partition indexes
+    (PartitionSpec.local_indexes). Takes an exclusive lock and rewrites the whole table.
+    """
+    column = PARTITIONED[table].column
+    source = f'{table}_unpartitioned'
+    constraints, indexes = _definitions(connection, table)
+    oldest = connection.execute(db.text(f"SELECT min({column}) FROM {table}")).scalar()
+
+    connection.execute(db.text(f"ALTER TABLE {table} RENAME TO {source}"))
+    connection.execute(db.text(
+        f"CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) PARTITION BY RANGE ({column})"
+    ))
+    connection.execute(db.text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+    month = month_floor(oldest or date.today())
+    last = add_months(month_floor(date.today()), months_ahead)
+    created = []
+    while month <= last:
+        created.append(create_partition(connection, table, month))
+        month = add_months(month, 1)
+
+    _rebuild(connection, source, table, constraints, indexes,
+             primary_key=f"PRIMARY KEY (id, {column})",
+             skip_index=lambda definition: 'UNIQUE' in definition and f'({column}' not in definition
+             and f', {column}' not in definition)
+    return created
+
+
+def unpartition_table(connection, table: str, restore_indexes=()) -> None:
+    """
+    Reverse of partition_table: fold every attached partition back into a plain table.
+    ``restore_indexes`` are extra CREATE INDEX statements for what lived per partition.
+    Detached (archived) partitions are left where they are.
+    """
+    source = f'{table}_partitioned'
+    constraints, indexes = _definitions(connection, table)
+    connection.execute(db.text(f"ALTER TABLE {table} RENAME TO {source}"))
+    connection.execute(db.text(f"CREATE TABLE {table} (LIKE {source} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    _rebuild(connection, source, table, constraints, indexes, primary_key="PRIMARY KEY (id)",
+             skip_index=lambda definition: False)
+    for ddl in restore_indexes:
+        connection.execute(db.text(ddl))
+
+
+def maintain_partitions(connection, today: date, months_ahead: int, retention_months: int,
+                        archive_schema: str, dry_run: bool = False) -> list[str]:
+    """
+    Make sure every partitioned table has partitions through ``months_ahead`` months past
+    ``today``, and archive partitions older than ``retention_months`` (0 keeps everything).
+    Returns a line per action taken (or, with ``dry_run``, that would be taken).
+    """
+    actions = []
+    current = month_floor(today)
+    for table in PARTITIONED:
+        if not is_partitioned(connection, table):
+            continue
+        existing = list_partitions(connection, table)
+        for n in range(months_ahead + 1):
+            month = add_months(current, n)
+            if month not in existing:
+                actions.append(f"create {partition_name(table, month)}")
+                if not dry_run:
+                    create_partition(connection, table, month)
+        if retention_months > 0:
+            cutoff = add_months(current, -retention_months)
+            for month, partition in sorted(existing.items()):
+                if month < cutoff:
+                    target = f"{archive_schema}.{partition}" if archive_schema else 'detached'
+                    actions.append(f"archive {partition} -> {target}")
+                    if not dry_run:
+                        archive_partition(connection, table, partition, archive_schema)
+    return actions
+
+
+@partitions_cli.command('maintain')
+@click.option('--months-ahead', type=int, default=None, help='Future months to pre-create (default: PARTITION_MONTHS_AHEAD).')
+@click.option('--retention', type=int, default=None,
+              help='Months of partitions to keep attached; older ones are archived (default: PARTITION_RETENTION_MONTHS, 0 = keep all).')
+@click.option('--dry-run', is_flag=True, help='Print what would change without changing it.')
+def maintain_command(months_ahead, retention, dry_run):
+    """Pre-create upcoming monthly partitions and archive expired ones."""
+    config = current_app.config
+    connection = db.session.connection()
+    if not any(is_partitioned(connection, table) for table in PARTITIONED):
+        click.echo('No partitioned tables (set PARTITION_TABLES before running the migrations).')
+        return
+    actions = maintain_partitions(
+        connection, date.today(),
+        months_ahead=config.get('PARTITION_MONTHS_AHEAD', 3) if months_ahead is None else months_ahead,
+        retention_months=config.get('PARTITION_RETENTION_MONTHS', 0) if retention is None else retention,
+        archive_schema=config.get('PARTITION_ARCHIVE_SCHEMA', 'archive'),
+        dry_run=dry_run,
+    )
+    if dry_run:
+        db.session.rollback()
+    else:
+        db.session.commit()
+    for action in actions:
+        click.echo(action)
+    click.echo(f"{len(actions)} change(s){' planned' if dry_run else ''}.")
@@ -0,0 +1,78 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasher:
+    """
+    Runs werkzeug password hashing in a bounded process pool.
+
+    - PASSWORD_HASH_METHOD: werkzeug method string, e.g. "pbkdf2:sha256:600000"
+      (None keeps werkzeug's default)
+    - PASSWORD_HASH_POOL_SIZE: worker processes; 0 hashes inline in the caller
+    - PASSWORD_HASH_MAX_CONCURRENCY: hashes allowed in flight at once; extra
+      callers wait instead of piling more CPU work onto the pool
+    """
+
+    def __init__(self, method: str | None = None, pool_size: int = 0, max_concurrency: int = 0):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self.configure(method, pool_size, max_concurrency)
+
+    def init_app(self, app):
+        self.configure(
+            method=app.config.get('PASSWORD_HASH_METHOD'),
+            pool_size=app.config.get('PASSWORD_HASH_POOL_SIZE', 0),
+            max_concurrency=app.config.get('PASSWORD_HASH_MAX_CONCURRENCY', 0),
+        )
+
+    def configure(self, method: str | None = None, pool_size: int = 0, max_concurrency: int = 0) -> None:
+        self.shutdown()
+        self.method = method or None
+        self.pool_size = max(int(pool_size or 0), 0)
+        limit = int(max_concurrency or 0) or max(self.pool_size, 1) * 2
+        self._slots = threading.BoundedSemaphore(limit)
+        self._prefix = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # a forked web worker must not reuse its parent's pool
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.pool_size)
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, fn, *args):
+        with self._slots:
+            if not self.pool_size:
+                return fn(*args)
+            return self._get_executor().submit(fn, *args).result()
+
+    def hash(self, raw: str) -> str:
+        """Hash a plaintext password with the configured method."""
+        if self.method:
+            return self._run(generate_password_hash, raw, self.method)
+        return self._run(generate_password_hash, raw)
+
+    def verify(self, pwhash: str, raw: str) -> bool:
+        """Check a plaintext password against a stored hash."""
+        return self._run(check_password_hash, pwhash, raw)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """True when ``pwhash`` was made with a method/cost other than the configured one."""
+        if self._prefix is None:
+            # canonical "<method>:<params>" prefix, e.g. werkzeug fills in default iterations
+            self._prefix = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._prefix
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None and self._executor_pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._executor_pid = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,186 @@
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+from flask import current_app
+from app import db
+from app.models.daily_hours import DailyHours
+from app.models.employees import Employee
+from app.models.payroll_run import PayrollRun
+from app.models.payroll_summary import PayrollSummary
+from app.models.paystub import Paystub
+from app.models.user import User
+from app.utils.sql import upsert_insert
+
+BASES = ('salary', 'hours')
+CENT = Decimal('0.01')
+
+
+@dataclass(frozen=True)
+class PayrollRates:
+    tax_rate: Decimal
+    deduction_rate: Decimal
+    annual_hours: int
+
+    @classmethod
+    def from_config(cls) -> 'PayrollRates':
+        config = current_app.config
+        return cls(Decimal(str(config.get('PAYROLL_TAX_RATE', 0.20))),
+                   Decimal(str(config.get('PAYROLL_DEDUCTION_RATE', 0.05))),
+                   config.get('PAYROLL_ANNUAL_HOURS', 2080))
+
+
+def _money(value) -> Decimal:
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def compute_pay(gross: Decimal, rates: PayrollRates) -> tuple:
+    """(gross, taxes, deductions, net), each rounded to cents."""
+    gross = _money(gross)
+    taxes = _money(gross * rates.tax_rate)
+    deductions = _money(gross * rates.deduction_rate)
+    return gross, taxes, deductions, gross - taxes - deductions
+
+
+def _employee_batches(period_start: date, period_end: date, department_id: Optional[int], chunk_size: int):
+    """
+    (employee_id, salary, already_paid) in id order, ``chunk_size`` rows per query.
+    Keyset on the primary key, so each batch costs the same however far in.
+    """
+    already_paid = (
+        db.select(Paystub.id)
+        .where(Paystub.employee_id == Employee.id, Paystub.pay_period_start == period_start,
+               Paystub.pay_period_end == period_end)
+        .exists()
+    )
+    query = db.select(Employee.id, Employee.salary, already_paid).order_by(Employee.id).limit(chunk_size)
+    if department_id is not None:
+        query = query.where(Employee.department_id == department_id)
+    last_id = 0
+    while True:
+        batch = db.session.execute(query.where(Employee.id > last_id)).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1][0]
+
+
+def _hours_by_employee(employee_ids, period_start: date, period_end: date) -> dict:
+    """{employee_id: seconds worked in the period}, from the daily hours rollup in one grouped query."""
+    rows = db.session.execute(
+        db.select(User.employee_id, db.func.sum(DailyHours.seconds))
+        .join(DailyHours, DailyHours.user_id == User.id)
+        .where(User.employee_id.in_(employee_ids), DailyHours.day.between(period_start, period_end))
+        .group_by(User.employee_id)
+    )
+    return {employee_id: int(seconds) for employee_id, seconds in rows}
+
+
+def _insert_paystubs(rows: list) -> set:
+    """
+    Insert a batch of run-issued paystubs and return the employee ids actually paid.
+    A concurrent run that already paid an employee for the period wins: the unique index on
+    run-issued stubs turns the duplicate into ON CONFLICT DO NOTHING (or, on dialects without
+    it, an IntegrityError that fails this run).
+    """
+    insert = upsert_insert(Paystub)
+    if insert is None:
+        db.session.execute(db.insert(Paystub), rows)
+        return {row['employee_id'] for row in rows}
+    statement = (
+        insert.on_conflict_do_nothing(
+            index_elements=[Paystub.employee_id, Paystub.pay_period_start, Paystub.pay_period_end],
+            index_where=Paystub.payroll_run_id.isnot(None),
+        )
+        .returning(Paystub.employee_id)
+    )
+    return set(db.session.scalars(statement, rows))
+
+
+def run_payroll(period_start: date, period_end: date, department_id: Optional[int] = None,
+                basis: str = 'salary', created_by_id: Optional[int] = None,
+                chunk_size: Optional[int] = None) -> PayrollRun:
+    """
+    Issue paystubs for every employee (or one department) for the period and record the run.
+
+    Employees are read in batches of ``chunk_size`` (default PAYROLL_CHUNK_SIZE) and their
+    paystubs written with one bulk INSERT per batch, all in a single transaction that this
+    function commits. Bulk inserts skip the flush events behind payroll summaries, so the run's
+    stubs are added to them afterwards with one grouped INSERT ... SELECT. Employees with nothing
+    to pay, or already paid for exactly this period (even by a concurrent run), are skipped.
+    If anything fails the transaction is rolled back, a 'failed' run is recorded in its place,
+    and the exception is re-raised.
+    """
+    if basis not in BASES:
+        raise ValueError(f"basis must be one of {', '.join(BASES)}")
+    if period_start > period_end:
+        raise ValueError("period start must be before or equal to period end")
+    chunk_size = chunk_size or current_app.config.get('PAYROLL_CHUNK_SIZE', 1000)
+    rates = PayrollRates.from_config()
+    period_days = Decimal((period_end - period_start).days + 1)
+
+    started = time.perf_counter()
+    run = PayrollRun(period_start=period_start, period_end=period_end, department_id=department_id,
+                     basis=basis, created_by_id=created_by_id, status='running')
+    db.session.add(run)
+    try:
+        db.session.flush()
+        now = datetime.now(timezone.utc)
+        totals = [Decimal('0.00')] * 4
+        employees = issued = skipped = batches = 0
+        for batch in _employee_batches(period_start, period_end, department_id, chunk_size):
+            hours = _hours_by_employee([row[0] for row in batch], period_start, period_end) if basis == 'hours' else {}
+            rows = []
+            for employee_id, salary, already_paid in batch:
+                annual = Decimal(str(salary or 0))
+                if basis == 'salary':
+                    gross = annual * period_days / 365
+                else:
+                    gross = annual / rates.annual_hours * hours.get(employee_id, 0) / 3600
+                if already_paid or gross <= 0:
+                    skipped += 1
+                    continue
+                pay = compute_pay(gross, rates)
+                rows.append({
+                    'employee_id': employee_id, 'payroll_run_id': run.id,
+                    'pay_period_start': period_start, 'pay_period_end': period_end,
+                    'gross_pay': pay[0], 'taxes': pay[1], 'deductions': pay[2], 'net_pay': pay[3],
+                    'issued_at': now, 'created_at': now, 'updated_at': now,
+                })
+            paid = _insert_paystubs(rows) if rows else set()
+            for row in rows:
+                if row['employee_id'] in paid:
+                    pay = (row['gross_pay'], row['taxes'], row['deductions'], row['net_pay'])
+                    totals = [total + amount for total, amount in zip(totals, pay)]
+            employees += len(batch)
+            issued += len(paid)
+            skipped += len(rows) - len(paid)
+            batches += 1
+
+        if issued:
+            PayrollSummary.apply_select(db.session.connection(), (
+                db.select(Paystub.employee_id, db.literal(period_end.year),
+                          *(db.func.sum(column) for column in (Paystub.gross_pay, Paystub.taxes,
+                                                               Paystub.deductions, Paystub.net_pay)),
+                          db.func.count())
+                .where(Paystub.payroll_run_id == run.id)
+                .group_by(Paystub.employee_id)
+            ))
+
+        run.employee_count, run.paystub_count, run.skipped_count, run.batch_count = employees, issued, skipped, batches
+        run.total_gross, run.total_taxes, run.total_deductions, run.total_net = totals
+        run.status = 'completed'
+        run.finished_at = datetime.now(timezone.utc)
+        run.duration_ms = round((time.perf_counter() - started) * 1000)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        db.session.add(PayrollRun(
+            period_start=period_start, period_end=period_end, department_id=department_id, basis=basis,
+            created_by_id=created_by_id, status='failed', error=str(e),
+            finished_at=datetime.now(timezone.utc), duration_ms=round((time.perf_counter() - started) * 1000),
+        ))
+        db.session.commit()
+        raise
+    return run
@@ -0,0 +1,121 @@
+from typing import Optional
+from sqlalchemy import event, inspect
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.payroll_summary import AMOUNTS, PayrollSummary
+from app.models.paystub import Paystub
+
+# Paystub attributes that feed the summary, in PayrollSummary.add_delta order
+_KEY = ('employee_id', 'pay_period_end')
+_MONEY = ('gross_pay', 'taxes', 'deductions', 'net_pay')
+
+
+def init_app(app, db):
+    """Keep payroll summaries in step with ORM paystub writes."""
+    if not event.contains(db.session, 'before_flush', _apply_flush_deltas):
+        event.listen(db.session, 'before_flush', _apply_flush_deltas)
+
+
+def _tracked_changes(paystub) -> bool:
+    state = inspect(paystub)
+    return any(state.attrs[name].history.has_changes() for name in _KEY + _MONEY)
+
+
+def _apply_flush_deltas(session, flush_context, instances):
+    # before the flush, so the table still holds what changed/deleted stubs contributed: read
+    # that back in one query rather than trusting attribute history, which has no old value
+    # for attributes that were expired (e.g. by a commit) when they were overwritten
+    deltas = {}
+
+    def add(values, sign):
+        employee_id, period_end = values[:2]
+        PayrollSummary.add_delta(deltas, employee_id, period_end.year, values[2:], sign)
+
+    def current(paystub):
+        return [getattr(paystub, name) for name in _KEY + _MONEY]
+
+    for paystub in session.new:
+        if isinstance(paystub, Paystub):
+            add(current(paystub), 1)
+    changed = [paystub for paystub in session.dirty if isinstance(paystub, Paystub) and _tracked_changes(paystub)]
+    deleted = [paystub for paystub in session.deleted if isinstance(paystub, Paystub)]
+    if changed or deleted:
+        connection = session.connection()
+        ids = [inspect(paystub).identity[0] for paystub in changed + deleted]
+        stored = connection.execute(
+            db.select(*(getattr(Paystub, name) for name in _KEY + _MONEY)).where(Paystub.id.in_(ids))
+        )
+        for values in stored:
+            add(values, -1)
+        for paystub in changed:
+            add(current(paystub), 1)
+
+    if deltas:
+        PayrollSummary.apply(session.connection(), deltas)
+
+
+def get_summaries(employee_id: Optional[int]) -> list:
+    """All of an employee's yearly totals, newest year first; one primary-key range read."""
+    if employee_id is None:
+        return []
+    return db.session.scalars(
+        db.select(PayrollSummary).where(PayrollSummary.employee_id == employee_id).order_by(PayrollSummary.year.desc())
+    ).all()
+
+
+def _sums():
+    return [db.func.coalesce(db.func.sum(getattr(PayrollSummary, name)), 0).label(name) for name in AMOUNTS + ('stub_count',)]
+
+
+def department_register(year: int) -> list:
+    """Per-department totals for ``year`` (employees paid, stubs, money columns), summed in SQL."""
+    return db.session.execute(
+        db.select(Department.id, db.func.coalesce(Department.name, 'No department').label('name'),
+                  db.func.count(PayrollSummary.employee_id).label('employees'), *_sums())
+        .join(Employee, Employee.id == PayrollSummary.employee_id)
+        .outerjoin(Department, Department.id == Employee.department_id)
+        .where(PayrollSummary.year == year)
+        .group_by(Department.id, Department.name)
+        .order_by(Department.name)
+    ).all()
+
+
+def register_totals(year: int):
+    """Company-wide totals for ``year``, one row."""
+    return db.session.execute(
+        db.select(db.func.count(PayrollSummary.employee_id).label('employees'), *_sums())
+        .where(PayrollSummary.year == year)
+    ).one()
+
+
+def employee_register_query(year: int, department_id: Optional[int]):
+    """Per-employee totals for ``year`` in one department (None: employees without one), for paginate()."""
+    department = Employee.department_id.is_(None) if department_id is None else Employee.department_id == department_id
+    return (
+        db.session.query(Employee.id, Employee.first_name, Employee.last_name, PayrollSummary.gross,
+                         PayrollSummary.taxes, PayrollSummary.deductions, PayrollSummary.net, PayrollSummary.stub_count)
+        .join(PayrollSummary, PayrollSummary.employee_id == Employee.id)
+        .filter(PayrollSummary.year == year, department)
+    )
+
+
+def rebuild_summaries(year: Optional[int] = None) -> int:
+    """
+    Recompute summaries from paystubs with one INSERT ... SELECT ... GROUP BY, for every
+    year or just ``year``. Runs in the caller's transaction; returns the rows written.
+    """
+    paystub_year = db.cast(db.extract('year', Paystub.pay_period_end), db.Integer)
+    deleted = db.delete(PayrollSummary)
+    totals = (
+        db.select(Paystub.employee_id, paystub_year,
+                  *(db.func.sum(getattr(Paystub, name)) for name in _MONEY), db.func.count(),
+                  db.func.current_timestamp())
+        .group_by(Paystub.employee_id, paystub_year)
+    )
+    if year is not None:
+        deleted = deleted.where(PayrollSummary.year == year)
+        totals = totals.where(paystub_year == year)
+    db.session.execute(deleted)
+    columns = ['employee_id', 'year', *AMOUNTS, 'stub_count', 'updated_at']
+    return db.session.execute(db.insert(PayrollSummary).from_select(columns, totals)).rowcount
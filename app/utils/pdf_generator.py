@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import tempfile
+import textwrap
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterator, Optional
+from app import db
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.paystub import Paystub
+
+# Bump when the layout changes: it is part of every key, so all stubs re-render once.
+RENDER_VERSION = 1
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter, points
+MARGIN = 56
+
+
+def stub_data(row, company: str) -> dict:
+    """Everything printed on a stub, as plain JSON-able values. ``row`` comes from paystub_rows()."""
+    return {
+        'company': company,
+        'paystub_id': row.id,
+        'employee_id': row.employee_id,
+        'employee': f"{row.first_name} {row.last_name}",
+        'position': row.position or '',
+        'department': row.department or '',
+        'period_start': row.pay_period_start.isoformat(),
+        'period_end': row.pay_period_end.isoformat(),
+        'issued': row.issued_at.date().isoformat() if row.issued_at else '',
+        'gross_pay': f"{row.gross_pay:.2f}",
+        'taxes': f"{row.taxes:.2f}",
+        'deductions': f"{row.deductions:.2f}",
+        'net_pay': f"{row.net_pay:.2f}",
+        'notes': row.notes or '',
+    }
+
+
+def content_key(data: dict) -> str:
+    """Hex SHA-256 of the stub's data and the renderer version; same data, same key, same file."""
+    payload = json.dumps([RENDER_VERSION, data], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _escape(text: str) -> str:
+    # core fonts use WinAnsi; anything outside Latin-1 is replaced rather than dropped
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _text(x: float, y: float, text: str, font: str = 'F1', size: int = 10, align: str = 'left') -> str:
+    if align == 'right':
+        # Helvetica digits are all 0.556 em wide, close enough for amounts
+        x -= len(text) * size * 0.556
+    return f"BT /{font} {size} Tf {x:.1f} {y:.1f} Td ({_escape(text)}) Tj ET\n"
+
+
+def _content(data: dict) -> str:
+    left, right = MARGIN, PAGE_WIDTH - MARGIN
+    y = PAGE_HEIGHT - MARGIN
+    out = [_text(left, y, data['company'], 'F2', 16), _text(right, y, 'PAY STATEMENT', 'F2', 12, 'right')]
+    y -= 16
+    out.append(f"{left} {y} m {right} {y} l S\n")
+    y -= 22
+    details = (
+        ('Employee', f"{data['employee']} (#{data['employee_id']})"),
+        ('Position', data['position']),
+        ('Department', data['department']),
+        ('Pay period', f"{data['period_start']} to {data['period_end']}"),
+        ('Issued', data['issued']),
+        ('Stub', f"#{data['paystub_id']}"),
+    )
+    for label, value in details:
+        out += [_text(left, y, label, 'F2'), _text(left + 90, y, value)]
+        y -= 15
+
+    y -= 15
+    out += [_text(left, y, 'Description', 'F2'), _text(right, y, 'Amount', 'F2', align='right')]
+    y -= 6
+    out.append(f"{left} {y} m {right} {y} l S\n")
+    y -= 16
+    for label, key, sign in (('Gross pay', 'gross_pay', ''), ('Taxes', 'taxes', '-'), ('Deductions', 'deductions', '-')):
+        out += [_text(left, y, label), _text(right, y, f"{sign}{data[key]}", align='right')]
+        y -= 15
+    out.append(f"{left} {y + 9} m {right} {y + 9} l S\n")
+    y -= 6
+    out += [_text(left, y, 'Net pay', 'F2', 12), _text(right, y, data['net_pay'], 'F2', 12, 'right')]
+
+    if data['notes']:
+        y -= 36
+        out.append(_text(left, y, 'Notes', 'F2'))
+        for line in textwrap.wrap(data['notes'], 95)[:20]:
+            y -= 13
+            out.append(_text(left, y, line, size=9))
+    return ''.join(out)
+
+
+def render_paystub_pdf(data: dict) -> bytes:
+    """
+    A one-page PDF for ``data`` (see stub_data()), written directly: core Helvetica fonts,
+    one compressed content stream, no dates or IDs, so the output is byte-for-byte stable.
+    """
+    stream = zlib.compress(_content(data).encode('latin-1'))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+         f"/Resources << /Font << /F1 4 0 R /F2 5 0 R >> >> /Contents 6 0 R >>").encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode() + stream + b"\nendstream",
+    ]
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b''.join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+class PaystubStore:
+    """
+    Content-addressed PDF files under ``root``: key ``abcd...`` lives at ``ab/abcd....pdf``.
+    Files are never modified once written, only added; a changed stub gets a new key.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], f"{key}.pdf")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def write(self, key: str, content: bytes) -> None:
+        # write-then-rename, so a reader never sees a partial file
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def _render_to_store(root: str, key: str, data: dict, force: bool = False) -> None:
+    # module-level so the process pool can pickle it; touches the filesystem only, never the DB.
+    # With ``force`` an existing file is replaced (atomically, like any write).
+    store = PaystubStore(root)
+    if force or not store.exists(key):
+        store.write(key, render_paystub_pdf(data))
+
+
+def paystub_rows(period_start: date, period_end: date, chunk_size: int) -> Iterator[list]:
+    """Batches of paystubs whose period ends within [period_start, period_end], with the employee fields printed on them."""
+    query = (
+        db.select(Paystub.id, Paystub.employee_id, Paystub.pay_period_start, Paystub.pay_period_end,
+                  Paystub.gross_pay, Paystub.taxes, Paystub.deductions, Paystub.net_pay, Paystub.issued_at,
+                  Paystub.notes, Paystub.file_path, Employee.first_name, Employee.last_name, Employee.position,
+                  Department.name.label('department'))
+        .join(Employee, Employee.id == Paystub.employee_id)
+        .outerjoin(Department, Department.id == Employee.department_id)
+        .where(Paystub.pay_period_end.between(period_start, period_end))
+        .order_by(Paystub.id)
+        .limit(chunk_size)
+    )
+    last_id = 0
+    while True:
+        batch = db.session.execute(query.where(Paystub.id > last_id)).all()
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def render_paystubs(store: PaystubStore, period_start: date, period_end: date, company: str,
+                    workers: int = 0, chunk_size: int = 1000, force: bool = False) -> dict:
+    """
+    Render the period's paystubs into ``store`` and point each ``file_path`` at its key.
+
+    Stubs whose ``file_path`` already matches their current data (and whose file exists) are
+    skipped unless ``force``, which re-renders and overwrites every stored file.
+    PDFs are produced by ``workers`` processes (0 = inline); the ``file_path`` updates are
+    written here, one executemany per batch.
+    Runs in the caller's transaction; call session.commit() externally.
+    Returns counts: {'checked', 'rendered', 'unchanged'}.
+    """
+    counts = {'checked': 0, 'rendered': 0, 'unchanged': 0}
+    executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+    try:
+        for batch in paystub_rows(period_start, period_end, chunk_size):
+            jobs, updates = [], []
+            for row in batch:
+                data = stub_data(row, company)
+                key = content_key(data)
+                if not force and row.file_path == key and store.exists(key):
+                    counts['unchanged'] += 1
+                    continue
+                jobs.append((key, data))
+                if row.file_path != key:
+                    updates.append({'id': row.id, 'file_path': key})
+            if executor and jobs:
+                keys, datas = zip(*jobs)
+                # consume the iterator so worker exceptions surface here
+                list(executor.map(_render_to_store, [store.root] * len(jobs), keys, datas, [force] * len(jobs),
+                                  chunksize=max(len(jobs) // (workers * 4), 1)))
+            else:
+                for key, data in jobs:
+                    _render_to_store(store.root, key, data, force)
+            if updates:
+                db.session.execute(db.update(Paystub), updates)
+            counts['checked'] += len(batch)
+            counts['rendered'] += len(jobs)
+    finally:
+        if executor:
+            executor.shutdown()
+    return counts
+
+
+def get_store(app) -> PaystubStore:
+    return PaystubStore(app.config.get('PAYSTUB_STORE_DIR') or os.path.join(app.instance_path, 'paystubs'))
+
+
+def stored_path(app, key: Optional[str]) -> Optional[str]:
+    """Filesystem path of a rendered stub, or None if it has not been rendered (yet)."""
+    if not key:
+        return None
+    path = get_store(app).path(key)
+    return path if os.path.exists(path) else None
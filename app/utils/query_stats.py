@@ -0,0 +1,99 @@
+import logging
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# "IN (?, ?, ?)" / "IN (%(p_1)s, %(p_2)s)" -> "IN (?)" so batches of different size share a shape
+_PARAM_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a SQL statement so repeated executions of the same shape compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PARAM_LIST.sub("(?)", shape)
+    return _NUMBER.sub("N", shape)
+
+
+class RequestQueryStats:
+    """Queries issued while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes = Counter()
+        self.statements = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = fingerprint(statement)
+        self.count += 1
+        self.total_time += duration
+        self.shapes[shape] += 1
+        self.statements.setdefault(shape, statement)
+
+    def repeated(self, threshold: int):
+        """(count, statement) for every shape that ran more than ``threshold`` times."""
+        return [(n, self.statements[shape]) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+def _current_stats():
+    if has_request_context():
+        return g.get('query_stats')
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['query_started_at'].pop()
+    stats = _current_stats()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute: drop its start time here so the
+    # stack on the (pooled) connection stays balanced, and still count the attempt
+    conn = context.connection
+    started_at = conn.info.get('query_started_at') if conn is not None else None
+    if not started_at:
+        return
+    started = started_at.pop()
+    stats = _current_stats()
+    if stats is not None and context.statement is not None:
+        stats.record(context.statement, time.perf_counter() - started)
+
+
+def init_app(app, db):
+    """Hook the engine and request lifecycle to collect per-request query stats."""
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(db.engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(db.engine, 'handle_error', _handle_error)
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = RequestQueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.pop('query_stats', None)
+        if stats is None:
+            return response
+
+        threshold = current_app.config.get('SQL_N_PLUS_ONE_THRESHOLD', 10)
+        for count, statement in stats.repeated(threshold):
+            logger.warning("Possible N+1 in %s: statement ran %d times: %s",
+                           request.endpoint, count, _WHITESPACE.sub(" ", statement))
+
+        if current_app.config.get('SQL_DEBUG_HEADERS') or current_app.debug or current_app.testing:
+            response.headers['X-DB-Queries'] = str(stats.count)
+            response.headers['X-DB-Time-ms'] = f"{stats.total_time * 1000:.2f}"
+        return response
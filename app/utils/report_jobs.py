@@ -0,0 +1,346 @@
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Optional
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app import db
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.daily_hours import DailyHours
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.message import Message
+from app.models.report import Report
+from app.models.task import Task
+from app.models.user import User
+from app.utils.exports import FETCH_SIZE, convert_rows, iter_csv, row_converters
+
+reports_cli = AppGroup('reports', help='Run queued report jobs.')
+
+# Longest period a report may cover
+MAX_RANGE_DAYS = 366
+
+
+def init_app(app):
+    app.cli.add_command(reports_cli)
+
+
+@dataclass(frozen=True)
+class ReportKind:
+    title: str
+    description: str
+    # params -> (((header, expression), ...), SELECT ... FROM/WHERE without columns)
+    build: Callable[[dict], tuple]
+
+
+def _period(params: dict):
+    """(first day, day after the last day) of the report period: a half-open range for date columns."""
+    start, end = date.fromisoformat(params['start']), date.fromisoformat(params['end'])
+    return start, end + timedelta(days=1)
+
+
+def _moments(params: dict):
+    """The same range as _period(), as midnights, for timestamp columns."""
+    return tuple(datetime.combine(day, datetime.min.time()) for day in _period(params))
+
+
+def _users(params: dict):
+    """Every user with their employee and department; one department only if the params say so."""
+    query = (db.select().select_from(User)
+             .outerjoin(Employee, Employee.id == User.employee_id)
+             .outerjoin(Department, Department.id == Employee.department_id))
+    if params.get('department_id') is not None:
+        query = query.where(Employee.department_id == params['department_id'])
+    return query
+
+
+def _identity_columns():
+    return (('username', User.username), ('name', Employee.first_name + ' ' + Employee.last_name),
+            ('department', Department.name))
+
+
+def _per_user(column, *values, where=()):
+    """Subquery of ``values`` grouped by ``column`` (a user id column), for an outer join onto users."""
+    return db.select(column.label('user_id'), *values).where(*where).group_by(column).subquery()
+
+
+def _zero(column):
+    return db.func.coalesce(column, 0)
+
+
+def _attendance_totals(start, stop):
+    return _per_user(
+        Attendance.user_id,
+        *(db.func.sum(db.case((Attendance.status == status, 1), else_=0)).label(status.value.lower())
+          for status in AttendanceStatus),
+        db.func.count().label('marked'),
+        where=(Attendance.date >= start, Attendance.date < stop),
+    )
+
+
+def _attendance_report(params: dict):
+    start, stop = _period(params)
+    totals = _attendance_totals(start, stop)
+    present, late, marked = (_zero(totals.c[name]) for name in ('present', 'late', 'marked'))
+    columns = (
+        *_identity_columns(),
+        *((status.value.lower(), _zero(totals.c[status.value.lower()])) for status in AttendanceStatus),
+        ('marked', marked),
+        ('attendance_rate', db.case((marked > 0, db.cast(100.0 * (present + late) / marked, db.Numeric(5, 1))), else_=None)),
+    )
+    query = _users(params).outerjoin(totals, totals.c.user_id == User.id).order_by(User.username)
+    return columns, query
+
+
+def _activity_report(params: dict):
+    start, stop = _period(params)
+    since, until = _moments(params)
+    attendance = _attendance_totals(start, stop)
+    hours = _per_user(DailyHours.user_id, db.func.sum(DailyHours.seconds).label('seconds'),
+                      where=(DailyHours.day >= start, DailyHours.day < stop))
+    tasks = _per_user(Task.assigned_to_id, db.func.count().label('completed'),
+                      where=(Task.completed_at >= since, Task.completed_at < until))
+    messages = _per_user(Message.sender_id, db.func.count().label('sent'),
+                         where=(Message.created_at >= since, Message.created_at < until))
+    columns = (
+        *_identity_columns(),
+        ('last_login', User.last_login),
+        ('days_present', _zero(attendance.c.present) + _zero(attendance.c.late)),
+        ('hours_worked', db.cast(_zero(hours.c.seconds) / 3600.0, db.Numeric(10, 2))),
+        ('tasks_completed', _zero(tasks.c.completed)),
+        ('messages_sent', _zero(messages.c.sent)),
+    )
+    query = _users(params)
+    for subquery in (attendance, hours, tasks, messages):
+        query = query.outerjoin(subquery, subquery.c.user_id == User.id)
+    return columns, query.order_by(User.username)
+
+
+def _login_report(params: dict):
+    since, until = _moments(params)
+    columns = (
+        *_identity_columns(),
+        ('role', Employee.role),
+        ('last_login', User.last_login),
+        ('logged_in_during_period', db.case(
+            (db.and_(User.last_login >= since, User.last_login < until), 'yes'), else_='no')),
+    )
+    return columns, _users(params).order_by(User.last_login.desc().nulls_last(), User.username)
+
+
+KINDS = {
+    'user_activity': ReportKind('User activity', 'Days present, hours worked, tasks completed and messages sent per user.',
+                                _activity_report),
+    'logins': ReportKind('Logins', 'Each user\'s last login and whether it falls in the period.', _login_report),
+    'attendance': ReportKind('Attendance', 'Days per attendance status and attendance rate per user.', _attendance_report),
+}
+
+
+def normalize_params(kind: str, start: Optional[date] = None, end: Optional[date] = None,
+                     department_id: Optional[int] = None) -> dict:
+    """
+    Canonical params for a report request: the period defaults to the 30 days up to today, so
+    a request without dates still names a fixed period (and a stable cache key).
+    Raises ValueError for an unknown kind or a bad period.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown report kind: {kind}")
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise ValueError("start must be on or before end")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"a report may cover at most {MAX_RANGE_DAYS} days")
+    return {'start': start.isoformat(), 'end': end.isoformat(), 'department_id': department_id}
+
+
+def get_store_dir(app) -> str:
+    return app.config.get('REPORT_STORE_DIR') or os.path.join(app.instance_path, 'reports')
+
+
+def result_path(app, report: Report) -> Optional[str]:
+    """Filesystem path of a completed report's result, or None if there is none (any more)."""
+    if report.status != 'completed' or not report.file_path:
+        return None
+    path = os.path.join(get_store_dir(app), report.file_path)
+    return path if os.path.exists(path) else None
+
+
+def request_report(kind: str, params: dict, requested_by_id: Optional[int] = None) -> tuple:
+    """
+    Queue a report, or hand back an identical one: still queued/running, or completed within
+    REPORT_FRESHNESS_SECONDS with its file still on disk. Returns (report, reused).
+    Runs in the caller's transaction; call session.commit() externally.
+    """
+    key = Report.make_key(kind, params)
+    fresh_since = datetime.now(timezone.utc) - timedelta(seconds=current_app.config.get('REPORT_FRESHNESS_SECONDS', 900))
+    candidates = db.session.scalars(
+        db.select(Report)
+        .where(Report.params_key == key, db.or_(
+            Report.status.in_(('queued', 'running')),
+            db.and_(Report.status == 'completed', Report.finished_at >= fresh_since),
+        ))
+        .order_by(Report.created_at.desc())
+    )
+    for report in candidates:
+        if report.status != 'completed' or result_path(current_app, report):
+            return report, True
+
+    report = Report(kind=kind, params=params, params_key=key, status='queued', requested_by_id=requested_by_id)
+    db.session.add(report)
+    db.session.flush()
+    return report, False
+
+
+def claim_reports(limit: int) -> list[int]:
+    """
+    Move up to ``limit`` of the oldest queued reports to 'running' and return their ids.
+    Each claim is an UPDATE guarded on status = 'queued', so several workers can poll the
+    same table without running a report twice. Commits.
+    """
+    ids = db.session.scalars(
+        db.select(Report.id).where(Report.status == 'queued').order_by(Report.created_at, Report.id).limit(limit)
+    ).all()
+    claimed = []
+    now = datetime.now(timezone.utc)
+    for report_id in ids:
+        result = db.session.execute(
+            db.update(Report).where(Report.id == report_id, Report.status == 'queued')
+            .values(status='running', started_at=now, heartbeat_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            claimed.append(report_id)
+    db.session.commit()
+    return claimed
+
+
+def heartbeat(report_ids) -> None:
+    """Mark reports this worker is still running as alive, so requeue_stale() leaves them be. Commits."""
+    if report_ids:
+        db.session.execute(
+            db.update(Report).where(Report.id.in_(report_ids), Report.status == 'running')
+            .values(heartbeat_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+    db.session.commit()
+
+
+def requeue_stale(timeout_seconds: int, exclude=()) -> int:
+    """
+    Put reports 'running' with no heartbeat (or start) for ``timeout_seconds`` back in the
+    queue: their worker died. ``exclude`` is what the calling worker is running itself. Commits.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=timeout_seconds)
+    stale = db.update(Report).where(
+        Report.status == 'running', db.func.coalesce(Report.heartbeat_at, Report.started_at) < cutoff
+    )
+    if exclude:
+        stale = stale.where(Report.id.notin_(exclude))
+    result = db.session.execute(
+        stale.values(status='queued', started_at=None, heartbeat_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
+
+
+def write_report(report: Report, directory: str) -> int:
+    """Run ``report``'s query and write it as CSV to ``directory``/<id>.csv; returns the row count."""
+    if report.kind not in KINDS:
+        raise ValueError(f"unknown report kind: {report.kind}")
+    columns, query = KINDS[report.kind].build(report.params)
+    query = query.add_columns(*(expression.label(header) for header, expression in columns))
+    converters = row_converters(columns)
+    count = 0
+
+    def batches():
+        nonlocal count
+        result = db.session.execute(query.execution_options(yield_per=FETCH_SIZE))
+        try:
+            for batch in result.partitions():
+                count += len(batch)
+                yield convert_rows(batch, converters)
+        finally:
+            result.close()
+
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            for chunk in iter_csv([header for header, _ in columns], batches()):
+                f.write(chunk)
+        os.replace(tmp, os.path.join(directory, f"{report.id}.csv"))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return count
+
+
+def execute_report(app, report_id: int) -> None:
+    """Run one claimed report in its own app context (and so its own session), recording the outcome."""
+    with app.app_context():
+        report = db.session.get(Report, report_id)
+        started = time.perf_counter()
+        try:
+            report.row_count = write_report(report, get_store_dir(app))
+            report.file_path = f"{report.id}.csv"
+            report.status = 'completed'
+        except Exception as e:
+            app.logger.exception("report %s failed", report_id)
+            db.session.rollback()
+            report = db.session.get(Report, report_id)
+            report.status, report.error = 'failed', str(e)
+        report.finished_at = datetime.now(timezone.utc)
+        report.duration_ms = round((time.perf_counter() - started) * 1000)
+        db.session.commit()
+
+
+def run_worker(app, threads: int, poll_interval: float, once: bool = False, stale_after: int = 300) -> int:
+    """
+    Claim queued reports and run them, ``threads`` at a time, until stopped (or, with ``once``,
+    until the queue is empty). The aggregations run in the database, so threads are enough;
+    each has its own connection. Returns how many reports were run.
+    """
+    run = 0
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='report') as pool:
+        in_flight = {}  # future -> report id
+        while True:
+            heartbeat(list(in_flight.values()))
+            requeue_stale(stale_after, exclude=list(in_flight.values()))
+            claimed = claim_reports(threads - len(in_flight))
+            in_flight.update((pool.submit(execute_report, app, report_id), report_id) for report_id in claimed)
+            run += len(claimed)
+            if not in_flight:
+                if once:
+                    return run
+                time.sleep(poll_interval)
+                continue
+            # bounded, so free slots pick up new reports while a long one is still running
+            done, _ = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in done:
+                del in_flight[future]
+                future.result()
+
+
+@reports_cli.command('worker')
+@click.option('--threads', type=int, default=None, help='Reports run at once (default: REPORT_WORKER_THREADS).')
+@click.option('--poll', type=float, default=None, help='Seconds between queue checks when idle (default: REPORT_POLL_SECONDS).')
+@click.option('--once', is_flag=True, help='Exit when the queue is empty instead of waiting for more.')
+def worker_command(threads, poll, once):
+    """Run queued reports, writing results to REPORT_STORE_DIR."""
+    app = current_app._get_current_object()
+    config = app.config
+    threads = max(threads or config.get('REPORT_WORKER_THREADS', 2), 1)
+    click.echo(f"Report worker: {threads} thread(s), results in {get_store_dir(app)}")
+    try:
+        run = run_worker(app, threads, poll or config.get('REPORT_POLL_SECONDS', 2.0), once=once,
+                         stale_after=config.get('REPORT_STALE_SECONDS', 300))
+    except KeyboardInterrupt:
+        click.echo("Stopped.")
+        return
+    click.echo(f"Ran {run} report(s).")
@@ -0,0 +1,17 @@
+from typing import Optional
+from app import db
+
+
+def upsert_insert(model, bind=None) -> Optional[object]:
+    """
+    ``insert(model)`` from the dialect of ``bind`` (default: the session's) when it
+    supports ON CONFLICT (PostgreSQL, SQLite); None elsewhere, so callers can fall back.
+    """
+    dialect = (bind or db.session.get_bind()).dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from app import db
+from app.models.task import Task
+from app.models.user import User
+from app.utils.cache import TTLCache
+from app.utils.hierarchy import manager_chain, report_user_ids_query
+
+# Per-process cache of ('user', user_id) / ('team', manager_employee_id, transitive) -> stats.
+# Entries are dropped by invalidate_task_stats() whenever a task is created or changes status;
+# the TTL only bounds staleness from writes that bypass the task routes.
+task_stats_cache = TTLCache()
+
+
+def init_app(app):
+    task_stats_cache.configure(
+        maxsize=app.config.get('TASK_STATS_CACHE_SIZE', 1024),
+        ttl=app.config.get('TASK_STATS_CACHE_TTL', 30),
+    )
+
+
+@dataclass(frozen=True)
+class TaskCounts:
+    pending: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    overdue: int = 0  # not completed and past due
+
+    @property
+    def open(self) -> int:
+        return self.pending + self.in_progress
+
+    def __add__(self, other: 'TaskCounts') -> 'TaskCounts':
+        return TaskCounts(self.pending + other.pending, self.in_progress + other.in_progress,
+                          self.completed + other.completed, self.overdue + other.overdue)
+
+
+@dataclass(frozen=True)
+class TeamTaskStats:
+    total: TaskCounts = field(default_factory=TaskCounts)
+    by_assignee: dict = field(default_factory=dict)  # user_id -> TaskCounts
+
+
+def _counts_by_assignee(assignee_filter) -> dict:
+    """One grouped query: status and overdue counts per assignee matching ``assignee_filter``."""
+    def tally(condition):
+        return db.func.coalesce(db.func.sum(db.case((condition, 1), else_=0)), 0)
+
+    statement = (
+        db.select(
+            Task.assigned_to_id,
+            tally(Task.status == 'pending'),
+            tally(Task.status == 'in_progress'),
+            tally(Task.status == 'completed'),
+            tally(db.and_(Task.status != 'completed', Task.due_date < datetime.utcnow())),
+        )
+        .where(assignee_filter)
+        .group_by(Task.assigned_to_id)
+    )
+    return {row[0]: TaskCounts(*row[1:]) for row in db.session.execute(statement)}
+
+
+def get_user_task_stats(user_id: int) -> TaskCounts:
+    """Task counts for one assignee."""
+    key = ('user', user_id)
+    stats = task_stats_cache.get(key)
+    if stats is None:
+        stats = _counts_by_assignee(Task.assigned_to_id == user_id).get(user_id, TaskCounts())
+        task_stats_cache.set(key, stats)
+    return stats
+
+
+def get_team_task_stats(manager_employee_id: int, transitive: bool = False) -> TeamTaskStats:
+    """Task counts per report of a manager (direct, or the whole reporting line) and in total."""
+    key = ('team', manager_employee_id, transitive)
+    stats = task_stats_cache.get(key)
+    if stats is None:
+        by_assignee = _counts_by_assignee(
+            Task.assigned_to_id.in_(report_user_ids_query(manager_employee_id, transitive))
+        )
+        stats = TeamTaskStats(sum(by_assignee.values(), TaskCounts()), by_assignee)
+        task_stats_cache.set(key, stats)
+    return stats
+
+
+def invalidate_task_stats(*user_ids: int) -> None:
+    """Drop cached stats for these assignees and for every team they are counted in."""
+    for user_id in set(filter(None, user_ids)):
+        task_stats_cache.pop(('user', user_id))
+        employee_id = db.session.scalar(db.select(User.employee_id).where(User.id == user_id))
+        if employee_id is None:
+            continue
+        for depth, manager_id in enumerate(manager_chain(employee_id)):
+            task_stats_cache.pop(('team', manager_id, True))
+            if depth == 0:
+                task_stats_cache.pop(('team', manager_id, False))
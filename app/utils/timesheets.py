@@ -0,0 +1,123 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Optional
+import click
+from flask.cli import AppGroup
+from app import db
+from app.models.daily_hours import DailyHours
+from app.models.time_entry import TimeEntry
+
+timesheets_cli = AppGroup('timesheets', help='Maintain the daily hours rollup.')
+
+# Rows per INSERT when rebuilding the rollup
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def init_app(app):
+    app.cli.add_command(timesheets_cli)
+
+
+def week_start(day: date) -> date:
+    """Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+@dataclass
+class Timesheet:
+    """Seconds worked on each of the seven days from ``start`` (a Monday)."""
+    start: date
+    seconds: list = field(default_factory=lambda: [0] * 7)
+
+    @property
+    def days(self) -> list:
+        return [self.start + timedelta(days=i) for i in range(7)]
+
+    @property
+    def total(self) -> int:
+        return sum(self.seconds)
+
+    def add(self, day: date, seconds: int) -> None:
+        self.seconds[(day - self.start).days] += seconds
+
+
+def _week_rows(user_filter, start: date):
+    return (
+        db.select(DailyHours.user_id, DailyHours.day, DailyHours.seconds)
+        .where(user_filter, DailyHours.day.between(start, start + timedelta(days=6)))
+    )
+
+
+def get_timesheets(user_ids, start: date) -> dict:
+    """{user_id: Timesheet} for the week from ``start``; users without hours get an empty one."""
+    sheets = {user_id: Timesheet(start) for user_id in user_ids}
+    for user_id, day, seconds in db.session.execute(_week_rows(DailyHours.user_id.in_(user_ids), start)):
+        sheets[user_id].add(day, seconds)
+    return sheets
+
+
+def get_timesheet(user_id: int, start: date) -> Timesheet:
+    return get_timesheets([user_id], start)[user_id]
+
+
+def get_team_totals(user_ids, start: date) -> Timesheet:
+    """Per-day sums over everyone in ``user_ids`` (a list or a SELECT), in one grouped query."""
+    totals = Timesheet(start)
+    rows = db.session.execute(
+        db.select(DailyHours.day, db.func.sum(DailyHours.seconds))
+        .where(DailyHours.user_id.in_(user_ids), DailyHours.day.between(start, start + timedelta(days=6)))
+        .group_by(DailyHours.day)
+    )
+    for day, seconds in rows:
+        totals.add(day, int(seconds))
+    return totals
+
+
+def backfill_hours(since: Optional[date] = None) -> int:
+    """
+    Rebuild the rollup from closed time entries, for every day or for days from ``since``.
+    Entries are streamed in user order so only one user's days are held at a time.
+    Runs in the caller's transaction; returns the number of rollup rows written.
+    """
+    deleted = db.delete(DailyHours)
+    entries = (
+        db.select(TimeEntry.user_id, TimeEntry.clock_in, TimeEntry.clock_out)
+        .where(TimeEntry.clock_out.is_not(None))
+        .order_by(TimeEntry.user_id)
+    )
+    if since is not None:
+        deleted = deleted.where(DailyHours.day >= since)
+        entries = entries.where(TimeEntry.clock_out >= since)
+    db.session.execute(deleted)
+
+    written, batch = 0, []
+
+    def flush():
+        nonlocal written, batch
+        if batch:
+            db.session.execute(db.insert(DailyHours), batch)
+            written += len(batch)
+            batch = []
+
+    rows = db.session.execute(entries.execution_options(yield_per=5000))
+    for user_id, user_entries in groupby(rows, key=lambda row: row.user_id):
+        days = {}
+        for _, clock_in, clock_out in user_entries:
+            for day, seconds in DailyHours.split_by_day(clock_in, clock_out):
+                if since is None or day >= since:
+                    days[day] = days.get(day, 0) + seconds
+        batch.extend({'user_id': user_id, 'day': day, 'seconds': seconds} for day, seconds in days.items())
+        if len(batch) >= BACKFILL_CHUNK_SIZE:
+            flush()
+    flush()
+    return written
+
+
+@timesheets_cli.command('backfill')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Only rebuild days from this date (YYYY-MM-DD); default rebuilds everything.')
+def backfill_command(since):
+    """Recompute daily hours from closed time entries."""
+    written = backfill_hours(since.date() if since else None)
+    db.session.commit()
+    click.echo(f"Wrote {written} daily hours rows.")
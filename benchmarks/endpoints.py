@@ -0,0 +1,189 @@
+"""
+Endpoint benchmark suite over a synthetic large organisation.
+
+Builds (or reuses) a database populated by app.seeds.bulk (`flask seed`), drives each
+blueprint endpoint through the Flask test client and reports p50/p95 latency,
+query count, DB time and peak Python memory per endpoint. Results are written
+as JSON so runs can be compared with --compare.
+
+Usage:
+    python -m benchmarks.endpoints --employees 10000 --history-days 90 --output bench.json
+    python -m benchmarks.endpoints --reuse --database-url sqlite:////tmp/bench.db --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import url_for  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.seeds.bulk import DEFAULT_PASSWORD, SeedSize, seed  # noqa: E402
+
+# cheap hashes keep the benchmark logins from dominating setup time
+PASSWORD_METHOD = 'pbkdf2:sha256:1'
+
+# (endpoint, role of the user issuing the request)
+ENDPOINTS = [
+    ('admin.admin_dashboard', 'admin'),
+    ('admin.list_employees', 'admin'),
+    ('admin.list_users', 'admin'),
+    ('admin.list_departments', 'admin'),
+    ('admin.list_teams', 'admin'),
+    ('attendance.team_attendance', 'admin'),
+    ('timeoff.review_team_requests', 'admin'),
+    ('timeoff.hr_queue', 'admin'),
+    ('tasks.assigned_tasks', 'admin'),
+    ('messages.inbox', 'admin'),
+    ('messages.sent', 'admin'),
+    ('manager.manager_dashboard', 'manager'),
+    ('manager.view_team', 'manager'),
+    ('attendance.team_attendance', 'manager'),
+    ('timeoff.review_team_requests', 'manager'),
+    ('employee.employee_dashboard', 'employee'),
+    ('tasks.my_tasks', 'employee'),
+    ('attendance.view_or_mark_attendance', 'employee'),
+    ('timeoff.my_timeoff', 'employee'),
+    ('time_tracking.log', 'employee'),
+    ('messages.inbox', 'employee'),
+    ('paystubs.my_paystubs', 'employee'),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def make_app(database_url):
+    return create_app({
+        'TESTING': True,
+        'WTF_CSRF_ENABLED': False,
+        'SQLALCHEMY_DATABASE_URI': database_url,
+        'PASSWORD_HASH_METHOD': PASSWORD_METHOD,
+        'PASSWORD_HASH_POOL_SIZE': 0,
+        'SQL_N_PLUS_ONE_THRESHOLD': 10 ** 9,
+    })
+
+
+def measure(client, url, samples):
+    client.get(url)  # warm caches (identity, templates)
+    latencies, queries, db_time, status = [], 0, 0.0, None
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = client.get(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+        status = response.status_code
+        queries = int(response.headers.get('X-DB-Queries', 0))
+        db_time += float(response.headers.get('X-DB-Time-ms', 0))
+
+    tracemalloc.start()
+    client.get(url)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'status': status,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'queries': queries,
+        'db_time_ms': round(db_time / samples, 2),
+        'peak_memory_kib': round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)['endpoints']
+    print(f"\n{'endpoint':45} {'p50 Δ%':>8} {'p95 Δ%':>8} {'queries':>10}")
+    for key, current in results.items():
+        before = baseline.get(key)
+        if not before:
+            continue
+        p50 = (current['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+        p95 = (current['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100 if before['p95_ms'] else 0
+        print(f"{key:45} {p50:>+8.1f} {p95:>+8.1f} {before['queries']:>4} -> {current['queries']:<4}")
+
+
+def main(argv=None):
+    defaults = SeedSize()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--database-url', help='defaults to a temporary SQLite file')
+    parser.add_argument('--reuse', action='store_true', help='benchmark an already populated database')
+    parser.add_argument('--employees', type=int, default=defaults.employees)
+    parser.add_argument('--departments', type=int, default=defaults.departments)
+    parser.add_argument('--branching', type=int, default=defaults.branching)
+    parser.add_argument('--history-days', type=int, default=defaults.history_days)
+    parser.add_argument('--messages-per-user', type=int, default=defaults.messages_per_user)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--samples', type=int, default=20)
+    parser.add_argument('--only', nargs='*', help='endpoint names to run')
+    parser.add_argument('--output', help='write JSON results to this file')
+    parser.add_argument('--compare', help='baseline JSON to diff against')
+    args = parser.parse_args(argv)
+
+    database_url = args.database_url
+    if not database_url:
+        fd, path = tempfile.mkstemp(prefix='bench_', suffix='.sqlite')
+        os.close(fd)
+        database_url = f'sqlite:///{path}'
+
+    size = SeedSize(employees=args.employees, departments=args.departments, branching=args.branching,
+                   history_days=args.history_days, messages_per_user=args.messages_per_user)
+    app = make_app(database_url)
+    with app.app_context():
+        if args.reuse:
+            users = {'admin': 'user1', 'manager': 'user2', 'employee': f'user{size.employees}'}
+        else:
+            db.create_all()
+            started = time.perf_counter()
+            users = seed(size, seed=args.seed)
+            print(f"Built synthetic org in {time.perf_counter() - started:.1f}s ({database_url})")
+
+    clients = {}
+    for role in ('admin', 'manager', 'employee'):
+        username = users[role]
+        client = app.test_client()
+        response = client.post('/auth/login', data={'username': username, 'password': DEFAULT_PASSWORD})
+        if response.status_code != 302:
+            raise SystemExit(f"Could not log in as {username}")
+        clients[role] = client
+
+    results = {}
+    with app.test_request_context():
+        urls = [(endpoint, role, url_for(endpoint)) for endpoint, role in ENDPOINTS
+                if not args.only or endpoint in args.only]
+    for endpoint, role, url in urls:
+        key = f'{endpoint} [{role}]'
+        results[key] = dict(measure(clients[role], url, args.samples), url=url)
+        r = results[key]
+        print(f"{key:45} {r['status']} p50={r['p50_ms']:>8}ms p95={r['p95_ms']:>8}ms "
+              f"queries={r['queries']:<4} peak={r['peak_memory_kib']}KiB")
+
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump({
+                'meta': {
+                    'timestamp': datetime.now(timezone.utc).isoformat(),
+                    'database': database_url.split(':', 1)[0],
+                    'python': platform.python_version(),
+                    'size': vars(size),
+                    'seed': args.seed,
+                    'samples': args.samples,
+                },
+                'endpoints': results,
+            }, fh, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
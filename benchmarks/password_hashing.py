@@ -0,0 +1,66 @@
+"""
+Login throughput benchmark for the password hashing pool.
+
+Simulates a burst of logins (one password check each) issued by a number of
+request threads and reports logins/second for each pool size.
+
+Usage:
+    python -m benchmarks.password_hashing --pool-sizes 0 1 2 4 --logins 200 --threads 16
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.passwords import PasswordHasher  # noqa: E402
+
+
+def run(pool_size: int, logins: int, threads: int, method: str | None, max_concurrency: int) -> dict:
+    hasher = PasswordHasher(method=method, pool_size=pool_size, max_concurrency=max_concurrency)
+    stored = hasher.hash('correct horse battery staple')
+    hasher.verify(stored, 'warm up the pool')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as requests:
+        results = list(requests.map(lambda _: hasher.verify(stored, 'correct horse battery staple'), range(logins)))
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    assert all(results)
+    return {
+        'pool_size': pool_size,
+        'logins': logins,
+        'threads': threads,
+        'seconds': round(elapsed, 3),
+        'logins_per_second': round(logins / elapsed, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pool-sizes', type=int, nargs='+', default=[0, 1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--logins', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=16, help='concurrent request threads')
+    parser.add_argument('--method', default=os.getenv('PASSWORD_HASH_METHOD'), help='werkzeug hash method')
+    parser.add_argument('--max-concurrency', type=int, default=0, help='0 = twice the pool size')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    args = parser.parse_args(argv)
+
+    results = []
+    for pool_size in args.pool_sizes:
+        result = run(pool_size, args.logins, args.threads, args.method, args.max_concurrency)
+        results.append(result)
+        print(f"pool_size={result['pool_size']:<3} {result['logins_per_second']:>8} logins/s "
+              f"({result['logins']} logins in {result['seconds']}s)")
+
+    if args.json_path:
+        with open(args.json_path, 'w') as fh:
+            json.dump({'method': args.method, 'results': results}, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()
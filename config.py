@@ -14,6 +14,65 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Per-process cache used by the login user loader (entries, seconds)
+    IDENTITY_CACHE_SIZE = int(os.getenv('IDENTITY_CACHE_SIZE', 1024))
+    IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', 60))
+
+    # Per-process cache of dashboard task counts (entries, seconds); task writes evict eagerly
+    TASK_STATS_CACHE_SIZE = int(os.getenv('TASK_STATS_CACHE_SIZE', 1024))
+    TASK_STATS_CACHE_TTL = int(os.getenv('TASK_STATS_CACHE_TTL', 30))
+
+    # Dashboard totals come from the counters table; on PostgreSQL, COUNTERS_ESTIMATE reads
+    # planner estimates (pg_class.reltuples) instead, for tables too large to keep exact
+    COUNTERS_ESTIMATE = os.getenv('COUNTERS_ESTIMATE', 'False').lower() in ['true', '1', 't']
+
+    # Password hashing: werkzeug method string (e.g. "pbkdf2:sha256:600000"; unset keeps
+    # werkzeug's default), worker processes (0 = inline) and max hashes in flight
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD')
+    PASSWORD_HASH_POOL_SIZE = int(os.getenv('PASSWORD_HASH_POOL_SIZE', 2))
+    PASSWORD_HASH_MAX_CONCURRENCY = int(os.getenv('PASSWORD_HASH_MAX_CONCURRENCY', 4))
+
+    # SQL instrumentation: log statements repeated more than this many times in one
+    # request, and add X-DB-Queries / X-DB-Time-ms headers (always on in debug/testing)
+    SQL_N_PLUS_ONE_THRESHOLD = int(os.getenv('SQL_N_PLUS_ONE_THRESHOLD', 10))
+    SQL_DEBUG_HEADERS = os.getenv('SQL_DEBUG_HEADERS', 'False').lower() in ['true', '1', 't']
+
+    # Keyset-paginated list views: default rows per page and the most a ?per_page= may ask for
+    PAGE_SIZE = int(os.getenv('PAGE_SIZE', 50))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 200))
+
+    # Monthly range partitioning of attendances/time_entries (PostgreSQL). PARTITION_TABLES is
+    # read by the migration; `flask partitions maintain` keeps PARTITION_MONTHS_AHEAD future
+    # months and archives partitions older than PARTITION_RETENTION_MONTHS (0 = keep all)
+    # into PARTITION_ARCHIVE_SCHEMA (empty = just detach)
+    PARTITION_TABLES = os.getenv('PARTITION_TABLES', 'False').lower() in ['true', '1', 't']
+    PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+    PARTITION_RETENTION_MONTHS = int(os.getenv('PARTITION_RETENTION_MONTHS', 0))
+    PARTITION_ARCHIVE_SCHEMA = os.getenv('PARTITION_ARCHIVE_SCHEMA', 'archive')
+
+    # Payroll runs: flat tax and deduction rates applied to gross pay, working hours per year
+    # (hourly rate = salary / PAYROLL_ANNUAL_HOURS for hours-based runs) and employees per batch
+    PAYROLL_TAX_RATE = float(os.getenv('PAYROLL_TAX_RATE', 0.20))
+    PAYROLL_DEDUCTION_RATE = float(os.getenv('PAYROLL_DEDUCTION_RATE', 0.05))
+    PAYROLL_ANNUAL_HOURS = int(os.getenv('PAYROLL_ANNUAL_HOURS', 2080))
+    PAYROLL_CHUNK_SIZE = int(os.getenv('PAYROLL_CHUNK_SIZE', 1000))
+
+    # Paystub PDFs: content-addressed store (empty = <instance>/paystubs), render processes for
+    # `flask paystubs render` (0 = inline) and the company name printed on each stub
+    PAYSTUB_STORE_DIR = os.getenv('PAYSTUB_STORE_DIR')
+    PAYSTUB_RENDER_WORKERS = int(os.getenv('PAYSTUB_RENDER_WORKERS', os.cpu_count() or 1))
+    PAYSTUB_COMPANY_NAME = os.getenv('PAYSTUB_COMPANY_NAME', 'Team Manager')
+
+    # Report jobs run by `flask reports worker`: result store (empty = <instance>/reports),
+    # reports run at once, idle poll interval, how long an identical request reuses a finished
+    # result, and how long a 'running' report may go without a worker heartbeat before it is
+    # assumed abandoned and queued again
+    REPORT_STORE_DIR = os.getenv('REPORT_STORE_DIR')
+    REPORT_WORKER_THREADS = int(os.getenv('REPORT_WORKER_THREADS', 2))
+    REPORT_POLL_SECONDS = float(os.getenv('REPORT_POLL_SECONDS', 2))
+    REPORT_FRESHNESS_SECONDS = int(os.getenv('REPORT_FRESHNESS_SECONDS', 900))
+    REPORT_STALE_SECONDS = int(os.getenv('REPORT_STALE_SECONDS', 300))
+
     # Optional Mail configuration
     MAIL_SERVER = os.getenv('MAIL_SERVER')
     MAIL_PORT = int(os.getenv('MAIL_PORT', 587))
@@ -0,0 +1,33 @@
+"""user unread_count counter.
+
+Revision ID: 3c1d2e4f5a6b
+Revises: 9b0e2e1c1a2f
+Create Date: 2025-11-24 10:12:31.482113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1d2e4f5a6b'
+down_revision = '9b0e2e1c1a2f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # backfill from existing messages
+    op.execute(
+        'UPDATE "user" SET unread_count = ('
+        'SELECT COUNT(*) FROM messages '
+        'WHERE messages.recipient_id = "user".id AND messages.is_read = false)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('unread_count')
@@ -0,0 +1,26 @@
+"""index employees.manager_id for hierarchy queries.
+
+Revision ID: 7a2d9e5c4b13
+Revises: 3c1d2e4f5a6b
+Create Date: 2025-11-26 09:41:07.215630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2d9e5c4b13'
+down_revision = '3c1d2e4f5a6b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_employees_manager_id'), ['manager_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('employees', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_employees_manager_id'))
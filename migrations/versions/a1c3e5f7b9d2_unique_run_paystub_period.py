@@ -0,0 +1,58 @@
+"""pay each employee at most once per period across payroll runs.
+
+Revision ID: a1c3e5f7b9d2
+Revises: f4a6c8e0b2d3
+Create Date: 2025-12-22 14:26:51.630418
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f7b9d2'
+down_revision = 'f4a6c8e0b2d3'
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger('alembic.runtime.migration')
+
+RUN_ISSUED = 'payroll_run_id IS NOT NULL'
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    # stubs double-issued by overlapping runs are kept, but detached from their run like a
+    # hand-made stub, so only the first one per employee and period stays under the index
+    detached = op.get_bind().execute(sa.text(
+        'UPDATE paystubs SET payroll_run_id = NULL WHERE payroll_run_id IS NOT NULL AND EXISTS ('
+        ' SELECT 1 FROM paystubs earlier WHERE earlier.payroll_run_id IS NOT NULL'
+        ' AND earlier.employee_id = paystubs.employee_id'
+        ' AND earlier.pay_period_start = paystubs.pay_period_start'
+        ' AND earlier.pay_period_end = paystubs.pay_period_end AND earlier.id < paystubs.id)'
+    )).rowcount
+    if detached:
+        log.warning('Detached %d duplicate run-issued paystub(s) from their payroll runs', detached)
+
+    columns = ['employee_id', 'pay_period_start', 'pay_period_end']
+    if _is_postgresql():
+        # autocommit_block commits the cleanup above before building the index
+        with op.get_context().autocommit_block():
+            op.create_index('uix_paystubs_run_period', 'paystubs', columns, unique=True, if_not_exists=True,
+                            postgresql_concurrently=True, postgresql_where=sa.text(RUN_ISSUED))
+    else:
+        op.create_index('uix_paystubs_run_period', 'paystubs', columns, unique=True,
+                        sqlite_where=sa.text(RUN_ISSUED))
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.drop_index('uix_paystubs_run_period', table_name='paystubs', if_exists=True,
+                          postgresql_concurrently=True)
+    else:
+        op.drop_index('uix_paystubs_run_period', table_name='paystubs')
@@ -0,0 +1,34 @@
+"""daily_hours rollup of time entries.
+
+Filled as users clock out; run `flask timesheets backfill` once after
+upgrading to load the existing time entries.
+
+Revision ID: a7c3e9b1d5f4
+Revises: f2a8c4d6b1e3
+Create Date: 2025-12-09 15:37:12.640918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c3e9b1d5f4'
+down_revision = 'f2a8c4d6b1e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_hours',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('seconds', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'day')
+    )
+
+
+def downgrade():
+    op.drop_table('daily_hours')
@@ -0,0 +1,38 @@
+"""index employees on lower(email) for case-insensitive lookups.
+
+Revision ID: b2d4f6a8c0e1
+Revises: a1c3e5f7b9d2
+Create Date: 2025-12-23 09:18:44.027561
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a8c0e1'
+down_revision = 'a1c3e5f7b9d2'
+branch_labels = None
+depends_on = None
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.create_index('ix_employees_email_lower', 'employees', [sa.text('lower(email)')], if_not_exists=True,
+                            postgresql_concurrently=True)
+    else:
+        op.create_index('ix_employees_email_lower', 'employees', [sa.text('lower(email)')])
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.drop_index('ix_employees_email_lower', table_name='employees', if_exists=True,
+                          postgresql_concurrently=True)
+    else:
+        op.drop_index('ix_employees_email_lower', table_name='employees')
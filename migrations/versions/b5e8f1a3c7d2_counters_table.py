@@ -0,0 +1,36 @@
+"""counters table for cached row counts.
+
+Revision ID: b5e8f1a3c7d2
+Revises: 7a2d9e5c4b13
+Create Date: 2025-11-27 14:05:52.903114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e8f1a3c7d2'
+down_revision = '7a2d9e5c4b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('counters',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # seed from the current tables
+    for table in ('employees', 'user', 'departments', 'team'):
+        op.execute(
+            f"INSERT INTO counters (name, value, updated_at) "
+            f"SELECT '{table}', COUNT(*), CURRENT_TIMESTAMP FROM \"{table}\""
+        )
+
+
+def downgrade():
+    op.drop_table('counters')
@@ -0,0 +1,88 @@
+"""payroll runs and paystubs.payroll_run_id.
+
+Revision ID: c8d2f4a6e0b7
+Revises: a7c3e9b1d5f4
+Create Date: 2025-12-12 11:02:37.415260
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+
+log = logging.getLogger('alembic.runtime.migration')
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8d2f4a6e0b7'
+down_revision = 'a7c3e9b1d5f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # paystubs.employee_id used to hold the user id of the employee paid (the old create form
+    # was the only writer), while the app now reads it as an employee id: remap legacy rows
+    # first, dropping those whose user has no employee to remap to
+    bind = op.get_bind()
+    orphans = bind.execute(sa.text(
+        'DELETE FROM paystubs WHERE employee_id NOT IN'
+        ' (SELECT id FROM "user" WHERE employee_id IS NOT NULL)'
+    )).rowcount
+    if orphans:
+        log.warning('Deleted %d paystub(s) whose user has no employee record', orphans)
+    op.execute(
+        'UPDATE paystubs SET employee_id ='
+        ' (SELECT employee_id FROM "user" WHERE "user".id = paystubs.employee_id)'
+    )
+
+    op.create_table('payroll_runs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('basis', sa.String(length=16), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('employee_count', sa.Integer(), nullable=False),
+    sa.Column('paystub_count', sa.Integer(), nullable=False),
+    sa.Column('skipped_count', sa.Integer(), nullable=False),
+    sa.Column('batch_count', sa.Integer(), nullable=False),
+    sa.Column('total_gross', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_taxes', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_deductions', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('total_net', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_by_id', sa.Integer(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_id'], ['user.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('paystubs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('payroll_run_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_paystubs_payroll_run_id'), ['payroll_run_id'], unique=False)
+        batch_op.create_foreign_key('fk_paystubs_payroll_run_id', 'payroll_runs', ['payroll_run_id'], ['id'],
+                                    ondelete='SET NULL')
+
+
+def downgrade():
+    with op.batch_alter_table('paystubs', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_paystubs_payroll_run_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_paystubs_payroll_run_id'))
+        batch_op.drop_column('payroll_run_id')
+
+    op.drop_table('payroll_runs')
+
+    # back to user ids, as the old paystub pages expect; stubs of employees without a user
+    # could not be shown to anyone there
+    orphans = op.get_bind().execute(sa.text(
+        'DELETE FROM paystubs WHERE employee_id NOT IN'
+        ' (SELECT employee_id FROM "user" WHERE employee_id IS NOT NULL)'
+    )).rowcount
+    if orphans:
+        log.warning('Deleted %d paystub(s) whose employee has no user account', orphans)
+    op.execute(
+        'UPDATE paystubs SET employee_id ='
+        ' (SELECT MIN(id) FROM "user" WHERE "user".employee_id = paystubs.employee_id)'
+    )
@@ -0,0 +1,56 @@
+"""composite and partial indexes for hot query patterns.
+
+Revision ID: d4c7a9e2f610
+Revises: b5e8f1a3c7d2
+Create Date: 2025-11-28 10:22:40.118407
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4c7a9e2f610'
+down_revision = 'b5e8f1a3c7d2'
+branch_labels = None
+depends_on = None
+
+# employees(manager_id) was added with the hierarchy queries (7a2d9e5c4b13)
+INDEXES = [
+    ('ix_messages_recipient_unread_created', 'messages', ['recipient_id', 'is_read', 'created_at'], None),
+    ('ix_tasks_assignee_status_due', 'tasks', ['assigned_to_id', 'status', 'due_date'], None),
+    ('ix_tasks_creator_created', 'tasks', ['created_by_id', 'created_at'], None),
+    ('ix_timeoffs_user_created', 'timeoffs', ['user_id', 'created_at'], None),
+    ('ix_timeoffs_status_created', 'timeoffs', ['status', 'created_at'], None),
+    ('ix_attendances_date', 'attendances', ['date'], None),
+    ('ix_time_entries_open', 'time_entries', ['user_id'], 'clock_out IS NULL'),
+]
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if _is_postgresql():
+        # CREATE INDEX CONCURRENTLY can't run inside a transaction. If one fails it leaves an
+        # INVALID index behind; drop it and re-run the upgrade (if_not_exists skips the rest).
+        with op.get_context().autocommit_block():
+            for name, table, columns, where in INDEXES:
+                op.create_index(name, table, columns, unique=False, if_not_exists=True,
+                                postgresql_concurrently=True,
+                                postgresql_where=sa.text(where) if where else None)
+    else:
+        for name, table, columns, where in INDEXES:
+            op.create_index(name, table, columns, unique=False,
+                            sqlite_where=sa.text(where) if where else None)
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            for name, table, _, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
+    else:
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,55 @@
+"""payroll summaries per employee per year.
+
+Revision ID: d9e1a5c7f3b8
+Revises: c8d2f4a6e0b7
+Create Date: 2025-12-15 09:41:18.206733
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd9e1a5c7f3b8'
+down_revision = 'c8d2f4a6e0b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    summaries = op.create_table('payroll_summaries',
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('gross', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('taxes', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('deductions', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('net', sa.Numeric(precision=14, scale=2), server_default='0', nullable=False),
+    sa.Column('stub_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('employee_id', 'year')
+    )
+    with op.batch_alter_table('payroll_summaries', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_payroll_summaries_year'), ['year'], unique=False)
+
+    # fill from existing paystubs (same as `flask paystubs rebuild-summary`); employee_id holds
+    # employee ids from c8d2f4a6e0b7 on, but skip any stub that points at no employee
+    employees = sa.table('employees', sa.column('id'))
+    paystubs = sa.table('paystubs', sa.column('employee_id'), sa.column('pay_period_end'), sa.column('gross_pay'),
+                        sa.column('taxes'), sa.column('deductions'), sa.column('net_pay'))
+    year = sa.cast(sa.extract('year', paystubs.c.pay_period_end), sa.Integer)
+    op.execute(summaries.insert().from_select(
+        ['employee_id', 'year', 'gross', 'taxes', 'deductions', 'net', 'stub_count', 'updated_at'],
+        sa.select(paystubs.c.employee_id, year, sa.func.sum(paystubs.c.gross_pay), sa.func.sum(paystubs.c.taxes),
+                  sa.func.sum(paystubs.c.deductions), sa.func.sum(paystubs.c.net_pay), sa.func.count(),
+                  sa.func.current_timestamp())
+        .where(paystubs.c.employee_id.in_(sa.select(employees.c.id)))
+        .group_by(paystubs.c.employee_id, year)
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('payroll_summaries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_payroll_summaries_year'))
+
+    op.drop_table('payroll_summaries')
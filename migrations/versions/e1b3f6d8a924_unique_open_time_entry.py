@@ -0,0 +1,63 @@
+"""enforce at most one open time entry per user.
+
+Revision ID: e1b3f6d8a924
+Revises: d4c7a9e2f610
+Create Date: 2025-11-29 16:48:03.551276
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1b3f6d8a924'
+down_revision = 'd4c7a9e2f610'
+branch_labels = None
+depends_on = None
+
+OPEN = 'clock_out IS NULL'
+
+
+def _is_postgresql():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    # close duplicate open entries first: each one ends when the user's next open entry began
+    op.execute(
+        "UPDATE time_entries SET clock_out = ("
+        " SELECT MIN(newer.clock_in) FROM time_entries newer"
+        " WHERE newer.user_id = time_entries.user_id AND newer.clock_out IS NULL"
+        " AND (newer.clock_in > time_entries.clock_in"
+        "  OR (newer.clock_in = time_entries.clock_in AND newer.id > time_entries.id))"
+        ") WHERE clock_out IS NULL AND EXISTS ("
+        " SELECT 1 FROM time_entries newer"
+        " WHERE newer.user_id = time_entries.user_id AND newer.clock_out IS NULL"
+        " AND (newer.clock_in > time_entries.clock_in"
+        "  OR (newer.clock_in = time_entries.clock_in AND newer.id > time_entries.id)))"
+    )
+
+    if _is_postgresql():
+        # autocommit_block commits the cleanup above before building the index
+        with op.get_context().autocommit_block():
+            op.create_index('uix_time_entries_open_user', 'time_entries', ['user_id'], unique=True,
+                            if_not_exists=True, postgresql_concurrently=True, postgresql_where=sa.text(OPEN))
+            op.drop_index('ix_time_entries_open', table_name='time_entries', if_exists=True,
+                          postgresql_concurrently=True)
+    else:
+        op.create_index('uix_time_entries_open_user', 'time_entries', ['user_id'], unique=True,
+                        sqlite_where=sa.text(OPEN))
+        op.drop_index('ix_time_entries_open', table_name='time_entries')
+
+
+def downgrade():
+    if _is_postgresql():
+        with op.get_context().autocommit_block():
+            op.create_index('ix_time_entries_open', 'time_entries', ['user_id'], unique=False,
+                            if_not_exists=True, postgresql_concurrently=True, postgresql_where=sa.text(OPEN))
+            op.drop_index('uix_time_entries_open_user', table_name='time_entries', if_exists=True,
+                          postgresql_concurrently=True)
+    else:
+        op.create_index('ix_time_entries_open', 'time_entries', ['user_id'], unique=False,
+                        sqlite_where=sa.text(OPEN))
+        op.drop_index('uix_time_entries_open_user', table_name='time_entries')
@@ -0,0 +1,49 @@
+"""report jobs queued for the report worker.
+
+Revision ID: e3f5b7d9a1c2
+Revises: d9e1a5c7f3b8
+Create Date: 2025-12-18 14:06:52.518407
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f5b7d9a1c2'
+down_revision = 'd9e1a5c7f3b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('reports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('params', sa.JSON(), nullable=False),
+    sa.Column('params_key', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('row_count', sa.Integer(), nullable=True),
+    sa.Column('file_path', sa.String(length=255), nullable=True),
+    sa.Column('requested_by_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('duration_ms', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by_id'], ['user.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.create_index('ix_reports_status_created_at', ['status', 'created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reports_params_key'), ['params_key'], unique=False)
+        batch_op.create_index(batch_op.f('ix_reports_requested_by_id'), ['requested_by_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_reports_requested_by_id'))
+        batch_op.drop_index(batch_op.f('ix_reports_params_key'))
+        batch_op.drop_index('ix_reports_status_created_at')
+
+    op.drop_table('reports')
@@ -0,0 +1,45 @@
+"""optionally partition attendances and time_entries by month (PostgreSQL).
+
+Only runs when PARTITION_TABLES is enabled; rewrites both tables under an
+exclusive lock. Afterwards run `flask partitions maintain` periodically
+(e.g. daily from cron) to keep future months available.
+
+Revision ID: f2a8c4d6b1e3
+Revises: e1b3f6d8a924
+Create Date: 2025-12-06 10:21:44.180342
+
+"""
+from alembic import op
+from flask import current_app
+
+from app.utils.partitions import PARTITIONED, is_partitioned, partition_table, unpartition_table
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8c4d6b1e3'
+down_revision = 'e1b3f6d8a924'
+branch_labels = None
+depends_on = None
+
+# per-partition indexes on the partitioned table; restored as one global index on downgrade
+RESTORE_INDEXES = {
+    'time_entries': (
+        'CREATE UNIQUE INDEX uix_time_entries_open_user ON time_entries (user_id) WHERE clock_out IS NULL',
+    ),
+}
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not current_app.config.get('PARTITION_TABLES'):
+        return
+    for table in PARTITIONED:
+        if not is_partitioned(bind, table):
+            partition_table(bind, table, months_ahead=current_app.config.get('PARTITION_MONTHS_AHEAD', 3))
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table in PARTITIONED:
+        if is_partitioned(bind, table):
+            unpartition_table(bind, table, restore_indexes=RESTORE_INDEXES.get(table, ()))
@@ -0,0 +1,26 @@
+"""worker heartbeat on reports.
+
+Revision ID: f4a6c8e0b2d3
+Revises: e3f5b7d9a1c2
+Create Date: 2025-12-19 10:12:37.904215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a6c8e0b2d3'
+down_revision = 'e3f5b7d9a1c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('reports', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,52 @@
+import pytest
+from flask import g
+from app import create_app, db as _db
+
+
+@pytest.fixture
+def app(tmp_path):
+    """
+    Flask application on a fresh file-backed SQLite database, with an app context pushed.
+    CSRF is off and password hashing is cheap and inline so tests can log in quickly.
+    """
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'test.db'}",
+        'WTF_CSRF_ENABLED': False,
+        'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:1',
+        'PASSWORD_HASH_POOL_SIZE': 0,
+    })
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+
+
+@pytest.fixture
+def db(app):
+    return _db
+
+
+@pytest.fixture
+def client(app):
+    """Test client for making HTTP requests to the app."""
+    return app.test_client()
+
+
+@pytest.fixture
+def runner(app):
+    """Click runner for invoking CLI commands registered on the app."""
+    return app.test_cli_runner()
+
+
+@pytest.fixture
+def login(client):
+    """Log ``client`` in as ``username``; returns the login response."""
+    def login(username, password='pw'):
+        # requests share the fixture's app context, so forget the previous request's user
+        g.pop('_login_user', None)
+        response = client.post('/auth/login', data={'username': username, 'password': password})
+        g.pop('_login_user', None)
+        return response
+    return login
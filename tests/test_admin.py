@@ -0,0 +1,47 @@
+import pytest
+from app.models.employees import Employee
+from app.models.user import User
+from app.seeds.bulk import seed, SeedSize
+
+
+@pytest.fixture
+def org(app):
+    return seed(SeedSize(employees=6, branching=2, history_days=0, messages_per_user=0, tasks_per_user=0,
+                         timeoffs_per_user=0, paystubs_per_employee=0), password='pw')
+
+
+def _employee_of(db, username):
+    return db.session.scalar(db.select(Employee).join(User, User.employee_id == Employee.id)
+                             .where(User.username == username))
+
+
+def _edit(client, employee, manager_id):
+    return client.post(f'/admin/employees/{employee.id}/edit', data={
+        'first_name': employee.first_name, 'last_name': employee.last_name, 'email': employee.email,
+        'manager_id': manager_id,
+    })
+
+
+@pytest.mark.parametrize('manager_id', ['', 'abc', '1.5'])
+def test_edit_employee_requires_a_numeric_manager(db, client, login, org, manager_id):
+    employee = _employee_of(db, org['employee'])
+    before = employee.manager_id
+    login(org['admin'])
+
+    response = _edit(client, employee, manager_id)
+
+    assert response.status_code == 302 and response.location.endswith(f'/admin/employees/{employee.id}/edit')
+    db.session.expire_all()
+    assert db.session.get(Employee, employee.id).manager_id == before
+
+
+def test_edit_employee_rejects_a_reporting_cycle(db, client, login, org):
+    employee = _employee_of(db, org['employee'])
+    manager = db.session.get(Employee, employee.manager_id)
+    login(org['admin'])
+
+    response = _edit(client, manager, str(employee.id))
+
+    assert response.status_code == 302
+    db.session.expire_all()
+    assert db.session.get(Employee, manager.id).manager_id != employee.id
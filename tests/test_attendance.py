@@ -0,0 +1,47 @@
+from datetime import date
+import pytest
+from app.forms.attendance_forms import NOTE_MAX_LENGTH
+from app.models.attendance import Attendance, AttendanceStatus
+from app.models.user import User
+from app.seeds.bulk import seed, SeedSize
+
+
+@pytest.fixture
+def user(db):
+    user = User(username='ann', email='ann@example.com', password='pw')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_import_command_rejects_over_long_notes(db, user, runner, tmp_path):
+    csv_file = tmp_path / 'attendance.csv'
+    csv_file.write_text('username,date,status,note\n'
+                        f"ann,2030-01-02,present,{'x' * (NOTE_MAX_LENGTH + 1)}\n"
+                        f"ann,2030-01-03,late,{'x' * NOTE_MAX_LENGTH}\n"
+                        'ann,2030-01-04,weird,\n')
+
+    result = runner.invoke(args=['attendance', 'import', str(csv_file)])
+
+    assert result.exit_code == 0
+    assert f'line 2: note longer than {NOTE_MAX_LENGTH} characters' in result.output
+    assert "line 4: bad status 'weird'" in result.output
+    assert 'Imported 1 attendance records (2 rows skipped).' in result.output
+    rows = db.session.execute(db.select(Attendance.date, Attendance.status)).all()
+    assert rows == [(date(2030, 1, 3), AttendanceStatus.LATE)]
+
+
+def test_team_grid_is_not_revalidated_over_pending_flashes(db, client, login):
+    org = seed(SeedSize(employees=6, branching=2, history_days=0, messages_per_user=0, tasks_per_user=0,
+                        timeoffs_per_user=0, paystubs_per_employee=0), password='pw')
+    login(org['manager'])
+    etag = client.get('/attendance/team').headers['ETag']
+    assert client.get('/attendance/team', headers={'If-None-Match': etag}).status_code == 304
+
+    with client.session_transaction() as session:
+        session['_flashes'] = [('success', 'Attendance saved for 2 team members.')]
+    response = client.get('/attendance/team', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert b'Attendance saved for 2 team members.' in response.data
+    assert client.get('/attendance/team', headers={'If-None-Match': etag}).status_code == 304
@@ -0,0 +1,83 @@
+import pytest
+from app.models.counter import Counter
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.team import Team
+from app.seeds.bulk import seed, SeedSize
+from app.utils.counters import TRACKED, adjust_counter, get_counts, reconcile_counters
+
+
+@pytest.fixture
+def counters(db):
+    reconcile_counters()
+    db.session.commit()
+
+
+def _exact(db, *names):
+    return {name: db.session.scalar(db.select(db.func.count()).select_from(TRACKED[name])) for name in names}
+
+
+def test_orm_inserts_and_deletes_update_the_counters(db, counters):
+    employee = Employee(first_name='Ada', last_name='Lovelace', email='ada@example.com')
+    first, second = Team(name='Core'), Team(name='Web')
+    db.session.add_all([employee, first, second, Department(name='R&D')])
+    db.session.commit()
+    assert get_counts('employees', 'team', 'departments') == {'employees': 1, 'team': 2, 'departments': 1}
+
+    db.session.delete(employee)
+    db.session.delete(first)
+    db.session.commit()
+    assert get_counts('employees', 'team', 'departments') == {'employees': 0, 'team': 1, 'departments': 1}
+
+
+def test_rolled_back_inserts_leave_the_counters_alone(db, counters):
+    db.session.add(Team(name='Core'))
+    db.session.flush()
+    db.session.rollback()
+    assert get_counts('team') == {'team': 0}
+
+
+def test_bulk_seed_leaves_the_counters_exact(db):
+    seed(SeedSize(employees=20, history_days=0, messages_per_user=0, paystubs_per_employee=0), password='pw')
+    assert get_counts() == _exact(db, *TRACKED)
+
+
+def test_adjust_counter_accounts_for_core_inserts(db, counters):
+    db.session.execute(db.insert(Team), [{'name': f'T{i}'} for i in range(5)])
+    adjust_counter('team', 5)
+    db.session.commit()
+    assert get_counts('team') == {'team': 5}
+
+
+def test_reconcile_repairs_drift(db, counters):
+    # Core inserts skip the ORM flush events, so the counter falls behind
+    db.session.execute(db.insert(Team), [{'name': f'T{i}'} for i in range(3)])
+    db.session.execute(db.update(Counter).where(Counter.name == 'departments').values(value=42))
+    db.session.commit()
+    assert get_counts('team', 'departments') == {'team': 0, 'departments': 42}
+
+    result = reconcile_counters()
+    db.session.commit()
+    assert result['team'] == (0, 3) and result['departments'] == (42, 0) and result['employees'] == (0, 0)
+    assert get_counts() == _exact(db, *TRACKED)
+
+
+def test_missing_counters_fall_back_to_exact_counts_until_reconciled(db):
+    db.session.add(Team(name='Core'))
+    db.session.commit()
+    assert db.session.scalar(db.select(db.func.count()).select_from(Counter)) == 0
+    assert get_counts('team') == {'team': 1}
+
+    assert reconcile_counters('team') == {'team': (None, 1)}
+    db.session.commit()
+    assert db.session.get(Counter, 'team').value == 1
+
+
+def test_reconcile_command_reports_what_it_fixed(db, counters, runner):
+    db.session.execute(db.insert(Team), [{'name': 'Core'}])
+    db.session.commit()
+
+    result = runner.invoke(args=['counters', 'reconcile'])
+    assert result.exit_code == 0
+    assert '(was 0)' in next(line for line in result.output.splitlines() if line.startswith('team'))
+    assert get_counts('team') == {'team': 1}
@@ -0,0 +1,152 @@
+import pytest
+from app.models.address import Address
+from app.models.department import Department
+from app.models.employees import Employee, Role
+from app.utils.counters import get_counts, reconcile_counters
+from app.utils.employee_import import check_columns, import_employees
+
+
+@pytest.fixture
+def boss(db):
+    db.session.add(Department(name='Ops'))
+    boss = Employee(first_name='Bo', last_name='Boss', email='boss@example.com', role=Role.MANAGER)
+    db.session.add(boss)
+    reconcile_counters()
+    db.session.commit()
+    return boss
+
+
+def _row(email, manager_email='', **values):
+    return {'first_name': email.split('@')[0].title(), 'last_name': 'X', 'email': email,
+            'manager_email': manager_email, **values}
+
+
+def _count(db, model=Employee):
+    return db.session.scalar(db.select(db.func.count()).select_from(model))
+
+
+def _manager_of(db, email):
+    employee = db.session.scalar(db.select(Employee).where(Employee.email == email))
+    return employee.manager.email if employee.manager else None
+
+
+def test_in_file_manager_chain_in_any_order(db, boss):
+    # reports come before their managers in the file
+    records = [
+        _row('ann@example.com', 'mid@example.com', street='1 Main', city='Town'),
+        _row('mid@example.com', 'top@example.com', role='manager', department='ops'),
+        _row('top@example.com', 'boss@example.com', role='Manager', salary='90000'),
+    ]
+    report = import_employees(records)
+    db.session.commit()
+
+    assert report.ok and (report.rows, report.created, report.addresses) == (3, 3, 1)
+    assert _manager_of(db, 'ann@example.com') == 'mid@example.com'
+    assert _manager_of(db, 'mid@example.com') == 'top@example.com'
+    assert _manager_of(db, 'top@example.com') == 'boss@example.com'
+    mid = db.session.scalar(db.select(Employee).where(Employee.email == 'mid@example.com'))
+    assert mid.role is Role.MANAGER and mid.department.name == 'Ops'
+    assert _count(db, Address) == 1
+    assert get_counts('employees') == {'employees': 4}
+
+
+def test_dry_run_writes_nothing(db, boss):
+    report = import_employees([_row('ann@example.com', 'boss@example.com')], dry_run=True)
+    assert report.ok and report.created == 0
+    assert _count(db) == 1
+
+
+def _errors(report):
+    return dict(report.errors)
+
+
+def test_reporting_cycle_is_rejected(db, boss):
+    report = import_employees([
+        _row('ok@example.com', 'boss@example.com'),
+        _row('cy1@example.com', 'cy2@example.com'),
+        _row('cy2@example.com', 'cy1@example.com'),
+        _row('under@example.com', 'cy1@example.com'),
+        _row('self@example.com', 'self@example.com'),
+    ])
+
+    errors = _errors(report)
+    assert sorted(errors) == [3, 4, 5, 6]
+    assert all('reporting cycle' in errors[line] for line in (3, 4, 5))
+    assert 'cannot be their own manager' in errors[6]
+    assert _count(db) == 1
+
+
+def test_unknown_manager_is_rejected(db, boss):
+    report = import_employees([_row('ann@example.com', 'ghost@example.com'), _row('bob@example.com')])
+    assert _errors(report) == {2: "unknown manager_email 'ghost@example.com'", 3: 'manager_email is required'}
+    assert _count(db) == 1
+
+
+def test_first_import_into_an_empty_table_needs_no_manager(db):
+    report = import_employees([_row('top@example.com'), _row('ann@example.com', 'top@example.com')])
+    assert report.ok and report.created == 2
+
+
+def test_duplicate_emails_are_rejected(db, boss):
+    report = import_employees([
+        _row('ann@example.com', 'boss@example.com'),
+        _row('ANN@example.com', 'boss@example.com'),
+        _row('boss@example.com', 'ann@example.com'),
+    ])
+    errors = _errors(report)
+    assert errors[3] == 'email also on line 2'
+    assert "already belongs to an employee" in errors[4]
+    assert 2 not in errors
+    assert _count(db) == 1
+
+
+def test_one_bad_row_imports_nothing(db, boss):
+    records = [_row(f'e{i}@example.com', 'boss@example.com') for i in range(10)]
+    records.append(_row('bad@example.com', 'boss@example.com', hire_date='2025-13-01', salary='-1', department='Nowhere'))
+    report = import_employees(records)
+
+    assert not report.ok and report.created == 0
+    assert [line for line, _ in report.errors] == [12]
+    message = report.errors[0][1]
+    assert 'bad hire_date' in message and 'salary cannot be negative' in message and 'unknown department' in message
+    assert _count(db) == 1
+    assert get_counts('employees') == {'employees': 1}
+
+
+def test_missing_required_column():
+    check_columns(['first_name', 'last_name', 'email', 'extra'])
+    with pytest.raises(ValueError, match='last_name, email'):
+        check_columns(['first_name'])
+
+
+def test_import_command(db, boss, runner, tmp_path):
+    good, bad = tmp_path / 'good.csv', tmp_path / 'bad.csv'
+    good.write_text('first_name,last_name,email,manager_email\n'
+                    'Ann,X,ann@example.com,mid@example.com\n'
+                    'Mid,X,mid@example.com,boss@example.com\n')
+    bad.write_text('first_name,last_name,email,manager_email\n'
+                   'Cy,X,cy@example.com,ghost@example.com\n'
+                   'Dee,X,dee@example.com,boss@example.com\n')
+
+    result = runner.invoke(args=['employees', 'import', str(bad)])
+    assert result.exit_code == 1
+    assert "line 2: unknown manager_email 'ghost@example.com'" in result.output
+    assert '1 of 2 rows have errors; nothing imported.' in result.output
+    assert _count(db) == 1
+
+    result = runner.invoke(args=['employees', 'import', str(good)])
+    assert result.exit_code == 0 and 'Imported 2 employees' in result.output
+    assert _manager_of(db, 'ann@example.com') == 'mid@example.com'
+
+
+def test_emails_match_existing_employees_regardless_of_case(db, boss):
+    report = import_employees([
+        _row('ann@example.com', 'Boss@Example.COM', street='1 Main', city='Town'),
+        _row('BOSS@example.com', 'ann@example.com'),
+    ])
+    assert _errors(report) == {3: "email 'BOSS@example.com' already belongs to an employee"}
+
+    report = import_employees([_row('ann@example.com', 'Boss@Example.COM', street='1 Main', city='Town')])
+    db.session.commit()
+    assert report.ok and report.addresses == 1
+    assert _manager_of(db, 'ann@example.com') == 'boss@example.com'
@@ -0,0 +1,62 @@
+import pytest
+from app.models.message import Message
+from app.models.user import User
+
+
+@pytest.fixture
+def users(db):
+    alice = User(username='alice', email='alice@example.com', password='pw')
+    bob = User(username='bob', email='bob@example.com', password='pw')
+    db.session.add_all([alice, bob])
+    db.session.commit()
+    return alice.id, bob.id
+
+
+def _unread(db, user_id):
+    return db.session.scalar(db.select(User.unread_count).where(User.id == user_id))
+
+
+def _compose(client, recipient_id, subject='Hi'):
+    return client.post('/messages/compose', data={'recipient_id': recipient_id, 'subject': subject, 'body': 'Hello'})
+
+
+def test_compose_increments_the_recipients_unread_count(db, client, login, users):
+    alice, bob = users
+    login('alice')
+    assert _compose(client, bob).status_code == 302
+    assert _compose(client, bob, 'Again').status_code == 302
+
+    assert _unread(db, bob) == 2
+    assert _unread(db, alice) == 0
+
+
+def test_first_view_decrements_once(db, client, login, users):
+    alice, bob = users
+    login('alice')
+    _compose(client, bob)
+    _compose(client, bob, 'Again')
+    message_id = db.session.scalar(db.select(Message.id).where(Message.subject == 'Hi'))
+
+    # the sender opening their own message doesn't mark it read
+    assert client.get(f'/messages/{message_id}').status_code == 200
+    assert _unread(db, bob) == 2
+
+    login('bob')
+    assert client.get(f'/messages/{message_id}').status_code == 200
+    assert _unread(db, bob) == 1
+    assert client.get(f'/messages/{message_id}').status_code == 200
+    assert _unread(db, bob) == 1
+    assert db.session.get(Message, message_id).is_read
+
+
+def test_mark_read_only_counts_the_first_time(db, users):
+    alice, bob = users
+    message = Message(subject='Hi', body='Hello', sender_id=alice, recipient_id=bob)
+    db.session.add(message)
+    User.adjust_unread_count(bob, 1)
+    db.session.commit()
+
+    assert message.mark_read() is True
+    assert message.mark_read() is False
+    db.session.commit()
+    assert _unread(db, bob) == 0
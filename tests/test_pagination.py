@@ -0,0 +1,95 @@
+import pytest
+from app.models.employees import Employee
+from app.seeds.bulk import seed, SeedSize
+from app.utils.pagination import asc, desc, encode_cursor, keyset_paginate
+
+
+@pytest.fixture
+def employees(db):
+    # three surnames shared by 23 employees, so most pages split a run of equal sort keys
+    rows = [Employee(first_name=f'E{i}', last_name=('Adams', 'Baker', 'Clark')[i % 3], email=f'e{i}@example.com')
+            for i in range(23)]
+    db.session.add_all(rows)
+    db.session.commit()
+    return rows
+
+
+def _walk_forward(*order_by, per_page):
+    pages, cursor = [], None
+    while True:
+        page = keyset_paginate(Employee.query, *order_by, cursor=cursor, per_page=per_page)
+        pages.append(page)
+        if not page.has_next:
+            return pages
+        cursor = page.next_cursor
+
+
+def _ids(pages):
+    return [[employee.id for employee in page] for page in pages]
+
+
+@pytest.mark.parametrize('order_by, key', [
+    ((asc(Employee.last_name), asc(Employee.id)), lambda e: (e.last_name, e.id)),
+    ((desc(Employee.last_name), desc(Employee.id)), lambda e: (e.last_name, e.id)),
+    ((desc(Employee.last_name), asc(Employee.id)), lambda e: (e.last_name, -e.id)),
+])
+def test_forward_pages_cover_every_row_once_in_order(employees, order_by, key):
+    pages = _walk_forward(*order_by, per_page=4)
+
+    expected = sorted(employees, key=key, reverse=order_by[0].descending)
+    assert [employee_id for page in _ids(pages) for employee_id in page] == [e.id for e in expected]
+    assert [len(page) for page in pages] == [4, 4, 4, 4, 4, 3]
+    assert not pages[0].has_prev
+    assert all(page.has_prev for page in pages[1:])
+
+
+def test_backward_pages_retrace_the_forward_ones(employees):
+    order_by = (asc(Employee.last_name), asc(Employee.id))
+    forward = _walk_forward(*order_by, per_page=5)
+
+    backward = [forward[-1]]
+    while backward[-1].has_prev:
+        backward.append(keyset_paginate(Employee.query, *order_by, cursor=backward[-1].prev_cursor, per_page=5))
+
+    assert _ids(reversed(backward)) == _ids(forward)
+    # a page reached backwards still links forward to the page after it
+    second = keyset_paginate(Employee.query, *order_by, cursor=backward[-2].next_cursor, per_page=5)
+    assert _ids([second]) == _ids([forward[2]])
+
+
+def test_ties_on_the_sort_key_are_broken_by_the_last_key(employees):
+    page = keyset_paginate(Employee.query, asc(Employee.last_name), asc(Employee.id), per_page=3)
+    assert {employee.last_name for employee in page} == {'Adams'}
+
+    rest = keyset_paginate(Employee.query, asc(Employee.last_name), asc(Employee.id), cursor=page.next_cursor, per_page=3)
+    adams = sorted(e.id for e in employees if e.last_name == 'Adams')
+    assert [employee.id for employee in (*page, *rest)] == adams[:6]
+
+
+def test_empty_listing_has_no_cursors(db):
+    page = keyset_paginate(Employee.query, asc(Employee.last_name), asc(Employee.id))
+    assert not page and not page.has_next and not page.has_prev
+
+
+@pytest.fixture
+def admin(app):
+    return seed(SeedSize(employees=5, history_days=0, messages_per_user=0, tasks_per_user=0, timeoffs_per_user=0,
+                         paystubs_per_employee=0), password='pw')['admin']
+
+
+def test_listing_follows_a_valid_cursor(client, login, admin):
+    login(admin)
+    assert client.get('/admin/employees', query_string={'cursor': encode_cursor(['A', 'B', 1])}).status_code == 200
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor!',
+    encode_cursor(['Adams', 1]),                      # wrong number of values
+    encode_cursor(['Adams', 'E1', '1']),              # id is not an int
+    encode_cursor([1, 'E1', 1]),                      # last_name is not a string
+    encode_cursor(['Adams', None, 1]),                # NULL sort key
+    encode_cursor([['Adams'], 'E1', 1]),              # nested value
+])
+def test_bad_cursor_is_a_400(client, login, admin, cursor):
+    login(admin)
+    assert client.get('/admin/employees', query_string={'cursor': cursor}).status_code == 400
@@ -0,0 +1,143 @@
+from datetime import date
+from decimal import Decimal
+import pytest
+from app.models.daily_hours import DailyHours
+from app.models.department import Department
+from app.models.employees import Employee
+from app.models.payroll_run import PayrollRun
+from app.models.payroll_summary import PayrollSummary
+from app.models.paystub import Paystub
+from app.models.user import User
+from app.utils import payroll
+from app.utils.payroll import PayrollRates, compute_pay, run_payroll
+
+# ten days, so a salary of 36 500 a year earns exactly 1 000.00
+START, END = date(2031, 1, 1), date(2031, 1, 10)
+
+
+@pytest.fixture
+def staff(db):
+    ops, sales = Department(name='Ops'), Department(name='Sales')
+    db.session.add_all([ops, sales])
+    db.session.flush()
+    staff = {
+        'ada': Employee(first_name='Ada', last_name='A', email='ada@example.com', salary=73000, department_id=ops.id),
+        'bob': Employee(first_name='Bob', last_name='B', email='bob@example.com', salary=36500, department_id=ops.id),
+        'cy': Employee(first_name='Cy', last_name='C', email='cy@example.com', salary=None, department_id=sales.id),
+        'di': Employee(first_name='Di', last_name='D', email='di@example.com', salary=52000, department_id=sales.id),
+    }
+    db.session.add_all(staff.values())
+    db.session.flush()
+    ada = User(username='ada', email='ada@example.com', employee_id=staff['ada'].id, password='pw')
+    di = User(username='di', email='di@example.com', employee_id=staff['di'].id, password='pw')
+    db.session.add_all([ada, di])
+    db.session.flush()
+    # 16 hours inside the period for Ada, plus a day outside it that must not count
+    db.session.add_all([DailyHours(user_id=ada.id, day=date(2031, 1, 2), seconds=8 * 3600),
+                        DailyHours(user_id=ada.id, day=date(2031, 1, 3), seconds=8 * 3600),
+                        DailyHours(user_id=ada.id, day=date(2031, 1, 11), seconds=8 * 3600)])
+    db.session.commit()
+    return staff
+
+
+def _gross_by_employee(db, run):
+    return dict(db.session.execute(
+        db.select(Paystub.employee_id, Paystub.gross_pay).where(Paystub.payroll_run_id == run.id)
+    ).all())
+
+
+def test_salary_run_pays_the_period_share_of_salary(db, staff):
+    run = run_payroll(START, END, chunk_size=3)
+
+    assert run.status == 'completed' and run.basis == 'salary'
+    assert (run.employee_count, run.paystub_count, run.skipped_count, run.batch_count) == (4, 3, 1, 2)
+    assert _gross_by_employee(db, run) == {staff['ada'].id: Decimal('2000.00'), staff['bob'].id: Decimal('1000.00'),
+                                           staff['di'].id: Decimal('1424.66')}
+    stubs = db.session.scalars(db.select(Paystub).where(Paystub.payroll_run_id == run.id)).all()
+    rates = PayrollRates.from_config()
+    for stub in stubs:
+        assert (stub.gross_pay, stub.taxes, stub.deductions, stub.net_pay) == compute_pay(stub.gross_pay, rates)
+    assert run.total_gross == sum(stub.gross_pay for stub in stubs)
+    assert run.total_net == sum(stub.net_pay for stub in stubs)
+
+
+def test_salary_run_updates_the_yearly_summaries(db, staff):
+    run_payroll(START, END)
+    run_payroll(date(2031, 1, 11), date(2031, 1, 20))
+
+    summary = db.session.get(PayrollSummary, (staff['bob'].id, 2031))
+    assert (summary.gross, summary.stub_count) == (Decimal('2000.00'), 2)
+    assert db.session.get(PayrollSummary, (staff['cy'].id, 2031)) is None
+
+
+def test_hours_run_pays_logged_hours_in_the_period(db, staff):
+    run = run_payroll(START, END, basis='hours')
+
+    # 73 000 / 2 080 an hour for 16 hours; no one else has hours (or a user to log them)
+    assert _gross_by_employee(db, run) == {staff['ada'].id: Decimal('561.54')}
+    assert (run.paystub_count, run.skipped_count) == (1, 3)
+
+
+def test_department_run_only_pays_that_department(db, staff):
+    run = run_payroll(START, END, department_id=staff['di'].department_id)
+    assert _gross_by_employee(db, run) == {staff['di'].id: Decimal('1424.66')}
+    assert (run.employee_count, run.skipped_count) == (2, 1)
+
+
+def test_repeating_a_period_skips_everyone_already_paid(db, staff):
+    first = run_payroll(START, END)
+    again = run_payroll(START, END)
+
+    assert (again.status, again.paystub_count, again.skipped_count) == ('completed', 0, 4)
+    assert again.total_gross == 0
+    assert db.session.scalar(db.select(db.func.count()).select_from(Paystub)) == first.paystub_count
+    # only the exact period counts as paid: an overlapping one is a new period
+    assert run_payroll(START, date(2031, 1, 11)).paystub_count == 3
+
+
+def test_repeating_a_department_period_pays_the_rest(db, staff):
+    run_payroll(START, END, department_id=staff['ada'].department_id)
+    rest = run_payroll(START, END)
+    assert _gross_by_employee(db, rest) == {staff['di'].id: Decimal('1424.66')}
+    assert rest.skipped_count == 3
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'period_start': END, 'period_end': START},
+    {'period_start': START, 'period_end': END, 'basis': 'weekly'},
+])
+def test_invalid_runs_are_rejected_without_a_record(db, staff, kwargs):
+    with pytest.raises(ValueError):
+        run_payroll(**kwargs)
+    assert db.session.scalar(db.select(db.func.count()).select_from(PayrollRun)) == 0
+
+
+def test_run_command(db, staff, runner):
+    result = runner.invoke(args=['paystubs', 'run', '--start', '2031-01-01', '--end', '2031-01-10', '--basis', 'hours'])
+    assert result.exit_code == 0, result.output
+    assert '1 paystubs for 4 employees (3 skipped)' in result.output
+
+
+def test_overlapping_runs_do_not_pay_twice(db, staff, monkeypatch):
+    first = run_payroll(START, END)
+
+    # a run that started before `first` committed: its already-paid check saw nothing
+    batches = payroll._employee_batches
+    monkeypatch.setattr(payroll, '_employee_batches', lambda *args: (
+        [(employee_id, salary, False) for employee_id, salary, _ in batch] for batch in batches(*args)
+    ))
+    second = run_payroll(START, END)
+
+    assert (second.status, second.paystub_count, second.skipped_count) == ('completed', 0, 4)
+    assert second.total_gross == 0
+    assert db.session.scalar(db.select(db.func.count()).select_from(Paystub)) == first.paystub_count
+    assert db.session.get(PayrollSummary, (staff['bob'].id, 2031)).stub_count == 1
+
+
+def test_hand_made_stubs_can_correct_a_paid_period(db, staff):
+    run_payroll(START, END)
+    db.session.add(Paystub(employee_id=staff['bob'].id, pay_period_start=START, pay_period_end=END,
+                           gross_pay=Decimal('50.00'), net_pay=Decimal('50.00')))
+    db.session.commit()
+    assert db.session.scalar(db.select(db.func.count()).select_from(Paystub)
+                             .where(Paystub.employee_id == staff['bob'].id)) == 2
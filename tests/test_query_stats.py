@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.utils.query_stats import fingerprint
+
+
+def test_failed_statements_do_not_leak_start_times(db):
+    with db.engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.exec_driver_sql('SELECT * FROM no_such_table')
+        conn.exec_driver_sql('SELECT 1')
+        assert conn.info['query_started_at'] == []
+
+
+def test_fingerprint_folds_literals_and_in_lists():
+    assert fingerprint('SELECT * FROM t WHERE id IN (?, ?, ?)  AND n = 10') == \
+        fingerprint('SELECT * FROM t WHERE id IN (?, ?) AND n = 3')